@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from urllib.parse import urlparse
+
+from podcast_archiver import compat, constants
+from podcast_archiver.logging import logger
+
+
+def get_host(url: str) -> str:
+    return urlparse(url).hostname or ""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if not retry_at.tzinfo:
+        retry_at = retry_at.replace(tzinfo=compat.UTC)
+    return max((retry_at - datetime.now(compat.UTC)).total_seconds(), 0.0)
+
+
+class HostBackoff:
+    _lock: Lock
+    _until: dict[str, float]
+    _strikes: dict[str, int]
+
+    __slots__ = ("_lock", "_until", "_strikes")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._until = {}
+        self._strikes = {}
+
+    def remaining(self, url: str) -> float:
+        with self._lock:
+            until = self._until.get(get_host(url), 0.0)
+        return max(until - time.monotonic(), 0.0)
+
+    def wait(self, url: str) -> None:
+        if delay := self.remaining(url):
+            logger.info("Waiting %.0f seconds before contacting %s again", delay, get_host(url))
+            time.sleep(delay)
+
+    def register(self, *urls: str, retry_after: str | None = None) -> float:
+        with self._lock:
+            delay = 0.0
+            for host in {get_host(url) for url in urls}:
+                strikes = self._strikes[host] = self._strikes.get(host, 0) + 1
+                host_delay = parse_retry_after(retry_after)
+                if host_delay is None:
+                    host_delay = constants.BACKOFF_BASE_SECONDS * 2 ** (strikes - 1)
+                host_delay = min(host_delay, constants.BACKOFF_MAX_SECONDS)
+                self._until[host] = max(self._until.get(host, 0.0), time.monotonic() + host_delay)
+                logger.debug("Backing off from %s for %.0f seconds", host, host_delay)
+                delay = max(delay, host_delay)
+            return delay
+
+    def clear(self, url: str) -> None:
+        with self._lock:
+            host = get_host(url)
+            if self._until.get(host, 0.0) <= time.monotonic():
+                self._strikes.pop(host, None)
+                self._until.pop(host, None)
+
+
+backoff = HostBackoff()
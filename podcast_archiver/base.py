@@ -2,12 +2,23 @@ from __future__ import annotations
 
 import signal
 import sys
+import time
 import xml.etree.ElementTree as etree
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Any
 
 from podcast_archiver.config import Settings
+from podcast_archiver.enums import ReportEvent, VerificationResult
+from podcast_archiver.importer import ArchiveImporter
 from podcast_archiver.logging import logger, rprint
+from podcast_archiver.metrics import metrics, metrics_server
 from podcast_archiver.processor import FeedProcessor
+from podcast_archiver.profiling import RunProfiler
+from podcast_archiver.report import run_report
+from podcast_archiver.timing import stage_timer
+from podcast_archiver.urls import registry
+from podcast_archiver.utils import handle_feed_request
+from podcast_archiver.verify import ArchiveVerifier
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -20,10 +31,21 @@ if TYPE_CHECKING:
 class PodcastArchiver:
     settings: Settings
     feeds: list[str]
-
-    def __init__(self, settings: Settings | None = None, database: BaseDatabase | None = None):
+    profiler: RunProfiler | None
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        database: BaseDatabase | None = None,
+        profile: Path | None = None,
+    ):
         self.settings = settings or Settings()
         self.processor = FeedProcessor(settings=self.settings, database=database)
+        self.profiler = RunProfiler(profile) if profile else None
+        if self.settings.report:
+            run_report.open(self.settings.report)
+        if self.settings.metrics_port:
+            metrics_server.start(self.settings.metrics_address, self.settings.metrics_port)
 
         logger.debug("Initializing with settings: %s", settings)
 
@@ -43,6 +65,8 @@ class PodcastArchiver:
 
         signal.signal(signal.SIGINT, _cleanup)
         signal.signal(signal.SIGTERM, _cleanup)
+        # Also restores process-wide state such as the DNS cache once the command completes.
+        ctx.call_on_close(self.processor.shutdown)
 
     def add_feed(self, feed: Path | str) -> None:
         new_feeds = [feed] if isinstance(feed, str) else feed.read_text().strip().splitlines()
@@ -60,10 +84,42 @@ class PodcastArchiver:
                 self.add_feed(url)
 
     def run(self, dry_run: bool = False) -> int:
-        failures = 0
-        for url in self.feeds:
-            result = self.processor.process(url, dry_run=dry_run)
-            failures += result.failures
-
+        stage_timer.reset()
+        start = time.monotonic()
+        run_report.emit(ReportEvent.RUN_STARTED, feeds=len(self.feeds), dry_run=dry_run)
+        with self.profiler.profile() if self.profiler else nullcontext():
+            failures = sum(result.failures for result in self.processor.process_many(self.feeds, dry_run=dry_run))
+
+        run_report.emit(ReportEvent.RUN_COMPLETED, failures=failures, duration=round(time.monotonic() - start, 3))
+        metrics.last_run.set(time.time())
+        stage_timer.log_summary()
+        if self.settings.timings:
+            rprint(stage_timer.render_summary(), end="\n\n")
         rprint("✔ All done", style="completed")
         return failures
+
+    def import_existing(self) -> int:
+        return ArchiveImporter(self.processor).import_feeds(self.feeds)
+
+    def verify(self, checksums: bool = False, repair: bool = False) -> int:
+        verifier = ArchiveVerifier(self.settings, database=self.processor.database, checksums=checksums)
+        broken = [problem for problem in verifier.verify() if problem.result in VerificationResult.broken()]
+        if not (repair and broken):
+            return len(broken)
+
+        if forgotten := verifier.repair(broken, feeds=self.configured_feeds()):
+            rprint(f"→ Re-archiving {len(forgotten)} broken episodes", style="title")
+            self.run()
+        # Episodes of feeds that are not configured, or that failed to download again, are still broken.
+        if unrepaired := len(broken) - verifier.count_restored(forgotten):
+            rprint(f"✘ {unrepaired} broken episodes could not be re-archived", style="error")
+        return unrepaired
+
+    def configured_feeds(self) -> set[str]:
+        # Episodes are recorded with the resolved feed URL, which may differ from the configured one.
+        feeds = set(self.feeds)
+        for url in self.feeds:
+            with handle_feed_request(url):
+                if resolved := registry.get_feed(url):
+                    feeds.add(resolved)
+        return feeds
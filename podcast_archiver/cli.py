@@ -11,9 +11,9 @@ import rich_click as click
 
 from podcast_archiver import __version__ as version
 from podcast_archiver import constants
-from podcast_archiver.base import PodcastArchiver
 from podcast_archiver.config import Settings, in_ci
 from podcast_archiver.console import console
+from podcast_archiver.enums import DownloadOrder, ProgressDisplay
 from podcast_archiver.exceptions import InvalidSettings
 from podcast_archiver.logging import configure_logging, rprint
 
@@ -46,15 +46,33 @@ click.rich_click.OPTION_GROUPS = {
                 "--filename-template",
                 "--write-info-json",
                 "--slugify",
+                "--timings",
+                "--progress-display",
+                "--report",
             ],
         },
         {
             "name": "Processing parameters",
             "options": [
                 "--sleep-seconds",
+                "--metrics-port",
+                "--metrics-address",
                 "--dry-run",
                 "--max-episodes",
                 "--ignore-database",
+                "--deduplicate",
+                "--probe-enclosures",
+                "--download-order",
+                "--feed-weight",
+            ],
+        },
+        {
+            "name": "Verification parameters",
+            "options": [
+                "--verify",
+                "--verify-checksums",
+                "--repair",
+                "--import-existing",
             ],
         },
     ]
@@ -118,6 +136,15 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     ctx.exit()
 
 
+def check_modes(ctx: click.RichContext, *, verify: bool, repair: bool, import_existing: bool, has_feeds: bool) -> None:
+    if repair and not verify:
+        raise click.UsageError("--repair requires --verify or --verify-checksums.", ctx=ctx)
+    if repair and not has_feeds:
+        raise click.UsageError("--repair requires feeds to archive broken episodes from again.", ctx=ctx)
+    if import_existing and verify:
+        raise click.UsageError("--import-existing cannot be combined with --verify.", ctx=ctx)
+
+
 @click.command(
     context_settings={"auto_envvar_prefix": constants.ENVVAR_PREFIX, "rich_console": console},
     help="Archive all of your favorite podcasts",
@@ -199,6 +226,41 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     show_envvar=True,
     help=Settings.model_fields["concurrency"].description,
 )
+@click.option(
+    "--adaptive-concurrency",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["adaptive_concurrency"].description,
+)
+@click.option(
+    "--http2",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["http2"].description,
+)
+@click.option(
+    "--dns-cache-ttl",
+    type=int,
+    default=constants.DNS_CACHE_TTL,
+    show_envvar=True,
+    help=Settings.model_fields["dns_cache_ttl"].description,
+)
+@click.option(
+    "--parse-processes",
+    type=int,
+    default=0,
+    show_envvar=True,
+    help=Settings.model_fields["parse_processes"].description,
+)
+@click.option(
+    "--warm-up",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["warm_up"].description,
+)
 @click.option(
     "-n",
     "--dry-run",
@@ -207,6 +269,50 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     show_envvar=True,
     help="Do not download any files, just print what would be done.",
 )
+@click.option(
+    "--verify",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=(
+        "Instead of archiving, check the files recorded in the database and report missing, truncated, and "
+        "orphaned files."
+    ),
+)
+@click.option(
+    "--verify-checksums",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help="Like --verify, but also compare the content checksum of every file. This reads the entire archive.",
+)
+@click.option(
+    "--repair",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help="Used with --verify: forget and delete broken files, then archive the affected episodes again.",
+)
+@click.option(
+    "--import-existing",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=(
+        "Instead of archiving, record episodes whose files already exist in the archive directory in the database, "
+        "so that later runs do not need to check the filesystem for them."
+    ),
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    metavar="FILE",
+    help=(
+        "Profile each run, including the download workers, write the profile to FILE in the format of Python's "
+        "pstats module (e.g. for snakeviz), and print the functions the most time was spent in."
+    ),
+)
 @click.option(
     "--debug-partial",
     type=bool,
@@ -231,6 +337,29 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     show_envvar=True,
     help=Settings.model_fields["slugify_paths"].description,
 )
+@click.option(
+    "--report",
+    type=str,
+    default=None,
+    metavar="FILE",
+    show_envvar=True,
+    help=Settings.model_fields["report"].description,
+)
+@click.option(
+    "--progress-display",
+    type=click.Choice([display.value for display in ProgressDisplay]),
+    default=ProgressDisplay.AUTO.value,
+    show_default=True,
+    show_envvar=True,
+    help=Settings.model_fields["progress_display"].description,
+)
+@click.option(
+    "--timings",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["timings"].description,
+)
 @click.option(
     "-m",
     "--max-episodes",
@@ -285,6 +414,36 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     show_envvar=True,
     help=Settings.model_fields["ignore_database"].description,
 )
+@click.option(
+    "--deduplicate",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["deduplicate"].description,
+)
+@click.option(
+    "--probe-enclosures",
+    type=bool,
+    is_flag=True,
+    show_envvar=True,
+    help=Settings.model_fields["probe_enclosures"].description,
+)
+@click.option(
+    "--download-order",
+    type=click.Choice([order.value for order in DownloadOrder]),
+    default=DownloadOrder.ROUND_ROBIN.value,
+    show_default=True,
+    show_envvar=True,
+    help=Settings.model_fields["download_order"].description,
+)
+@click.option(
+    "--feed-weight",
+    "feed_weights",
+    multiple=True,
+    metavar="URL=WEIGHT",
+    show_envvar=True,
+    help=Settings.model_fields["feed_weights"].description + " Use repeatedly for multiple feeds.",  # type: ignore[operator]
+)
 @click.option(
     "--sleep-seconds",
     type=int,
@@ -292,24 +451,56 @@ def generate_default_config(ctx: click.Context, param: click.Parameter, value: b
     show_envvar=True,
     help=Settings.model_fields["sleep_seconds"].description,
 )
+@click.option(
+    "--metrics-port",
+    type=int,
+    default=0,
+    show_envvar=True,
+    help=Settings.model_fields["metrics_port"].description,
+)
+@click.option(
+    "--metrics-address",
+    type=str,
+    default=constants.METRICS_ADDRESS,
+    show_envvar=True,
+    help=Settings.model_fields["metrics_address"].description,
+)
 @click.pass_context
 def main(
     ctx: click.RichContext,
     /,
     dry_run: bool,
+    verify: bool,
+    verify_checksums: bool,
+    repair: bool,
+    import_existing: bool,
+    profile: pathlib.Path | None,
     **kwargs: Any,
 ) -> int:
     configure_logging(kwargs["verbose"], kwargs["quiet"])
     try:
         settings = Settings.load_from_dict(kwargs)
+        verify = verify or verify_checksums
+        has_feeds = bool(settings.feeds or settings.opml_files)
+        check_modes(ctx, verify=verify, repair=repair, import_existing=import_existing, has_feeds=has_feeds)
 
         # Replicate click's `no_args_is_help` behavior but only when config file does not contain feeds/OPMLs
-        if not (settings.feeds or settings.opml_files):
+        if not (has_feeds or verify):
             click.echo(ctx.command.get_help(ctx))
             return 0
 
-        pa = PodcastArchiver(settings=settings)
+        from podcast_archiver.base import PodcastArchiver
+
+        pa = PodcastArchiver(settings=settings, profile=profile)
         pa.register_cleanup(ctx)
+        if verify:
+            if pa.verify(checksums=verify_checksums, repair=repair):
+                ctx.exit(1)
+            return 0
+        if import_existing:
+            pa.import_existing()
+            return 0
+
         pa.run(dry_run=dry_run)
         while settings.sleep_seconds > 0:
             rprint(f"Sleeping for {settings.sleep_seconds} seconds.")
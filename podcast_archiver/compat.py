@@ -6,3 +6,6 @@ else:  # pragma: no-cover-gte-311
     from datetime import timezone
 
     UTC = timezone.utc
+
+# Since Python 3.12, cProfile uses sys.monitoring and profiles all threads at once.
+PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+
+from podcast_archiver.logging import logger
+
+DECREASE_FACTOR = 0.5
+THROUGHPUT_DROP = 0.2
+LATENCY_TOLERANCE = 2.0
+ERROR_RATE_SMOOTHING = 0.2
+ERROR_RATE_THRESHOLD = 0.3
+
+
+class ConcurrencyController:
+    limit: int
+    min_limit: int
+    max_limit: int
+
+    _lock: Lock
+    _window_start: float
+    _window_bytes: int
+    _window_count: int
+    _window_latency: float
+    _best_throughput: float
+    _min_latency: float | None
+    _error_rates: dict[str, float]
+
+    __slots__ = (
+        "limit",
+        "min_limit",
+        "max_limit",
+        "_lock",
+        "_window_start",
+        "_window_bytes",
+        "_window_count",
+        "_window_latency",
+        "_best_throughput",
+        "_min_latency",
+        "_error_rates",
+    )
+
+    def __init__(self, max_limit: int, initial: int | None = None, min_limit: int = 1) -> None:
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = min(max(initial or self.max_limit, min_limit), self.max_limit)
+        self._lock = Lock()
+        self._best_throughput = 0.0
+        self._min_latency = None
+        self._error_rates = {}
+        self._reset_window()
+
+    def receive(self, nbytes: int) -> None:
+        # Bytes are sampled as they arrive, so that throughput reflects the transfer rate across all downloads
+        # during the window rather than the sizes of the files that happened to complete in it.
+        with self._lock:
+            self._window_bytes += nbytes
+
+    def record(self, host: str, *, latency: float | None, failed: bool, throttled: bool) -> int:
+        with self._lock:
+            error_rate = self._error_rates.get(host, 0.0)
+            error_rate += ERROR_RATE_SMOOTHING * (failed - error_rate)
+            self._error_rates[host] = error_rate
+
+            if throttled or (failed and error_rate > ERROR_RATE_THRESHOLD):
+                reason = "rate limited" if throttled else f"error rate {error_rate:.0%}"
+                self._set_limit(int(self.limit * DECREASE_FACTOR), reason=f"{host}: {reason}")
+                self._reset_window()
+                return self.limit
+
+            if failed:
+                return self.limit
+
+            self._window_count += 1
+            if latency is not None:
+                self._window_latency += latency
+                self._min_latency = min(self._min_latency or latency, latency)
+            if self._window_count >= self.limit:
+                self._adjust()
+            return self.limit
+
+    def _adjust(self) -> None:
+        # Additive increase once per round of completed downloads, multiplicative decrease on signs of congestion.
+        elapsed = max(monotonic() - self._window_start, 1e-6)
+        throughput = self._window_bytes / elapsed
+        latency = self._window_latency / self._window_count
+
+        if self._min_latency and latency > self._min_latency * LATENCY_TOLERANCE:
+            self._set_limit(int(self.limit * DECREASE_FACTOR), reason=f"latency {latency:.2f}s")
+        elif throughput < self._best_throughput * (1 - THROUGHPUT_DROP):
+            self._set_limit(int(self.limit * DECREASE_FACTOR), reason=f"throughput {throughput:.0f} B/s")
+        else:
+            self._set_limit(self.limit + 1, reason=f"throughput {throughput:.0f} B/s")
+
+        # Let the reference throughput decay so that a single fast round does not pin the limit down forever.
+        self._best_throughput = max(throughput, self._best_throughput * (1 - THROUGHPUT_DROP / 2))
+        self._reset_window()
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = min(max(limit, self.min_limit), self.max_limit)
+        if limit != self.limit:
+            logger.debug("Adjusting concurrency from %s to %s (%s)", self.limit, limit, reason)
+        self.limit = limit
+
+    def _reset_window(self) -> None:
+        self._window_start = monotonic()
+        self._window_bytes = 0
+        self._window_count = 0
+        self._window_latency = 0.0
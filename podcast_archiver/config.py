@@ -14,6 +14,8 @@ from pydantic import (
     Field,
     FilePath,
     NewPath,
+    PositiveInt,
+    field_serializer,
     model_validator,
 )
 from pydantic import ConfigDict as _ConfigDict
@@ -23,6 +25,7 @@ from yaml import YAMLError, safe_load
 
 from podcast_archiver import __version__ as version
 from podcast_archiver import constants
+from podcast_archiver.enums import DownloadOrder, ProgressDisplay
 from podcast_archiver.exceptions import InvalidSettings
 from podcast_archiver.logging import rprint
 from podcast_archiver.utils import get_field_titles
@@ -42,6 +45,21 @@ UserExpandedFile = Annotated[FilePath, BeforeValidator(expanduser)]
 UserExpandedPossibleFile = Annotated[FilePath | NewPath, BeforeValidator(expanduser)]
 
 
+def parse_feed_weights(v: Any) -> Any:
+    if not isinstance(v, (list, tuple)):
+        return v
+    weights = {}
+    for item in v:
+        url, sep, weight = str(item).rpartition("=")
+        if not sep or not url:
+            raise ValueError(f"Feed weight '{item}' must be given as URL=WEIGHT")
+        weights[url] = weight
+    return weights
+
+
+FeedWeights = Annotated[dict[str, PositiveInt], BeforeValidator(parse_feed_weights)]
+
+
 def in_ci() -> bool:
     val = getenv("CI", "").lower()
     return val.lower() in ("true", "1")
@@ -89,6 +107,32 @@ class Settings(BaseModel):
         ),
     )
 
+    timings: bool = Field(
+        default=False,
+        description=(
+            "Print a summary of the time spent resolving, fetching and parsing feeds, checking the database, and "
+            "downloading and writing episodes after each run, in total and for the slowest feeds."
+        ),
+    )
+
+    report: str | None = Field(
+        default=None,
+        description=(
+            "Write a report of processing events as JSON lines to the given file, or to standard output if '-'. "
+            "Events are emitted when feeds are loaded and completed, when episodes are queued, and when downloads "
+            "start, complete (with size and duration), or fail."
+        ),
+    )
+
+    progress_display: ProgressDisplay = Field(
+        default=ProgressDisplay.AUTO,
+        description=(
+            "Show a progress bar per download (episodes), or a single progress bar for all downloads (aggregate). "
+            f"With auto, downloads are aggregated if --concurrency is higher than "
+            f"{constants.AGGREGATE_PROGRESS_CONCURRENCY}."
+        ),
+    )
+
     slugify_paths: bool = Field(
         default=False,
         description="Format filenames in the most compatible way, replacing all special characters.",
@@ -115,6 +159,74 @@ class Settings(BaseModel):
         description="Maximum number of simultaneous downloads.",
     )
 
+    adaptive_concurrency: bool = Field(
+        default=False,
+        description=(
+            "Adjust the number of simultaneous downloads automatically, up to the value of --concurrency. Downloads "
+            "are added one at a time while the overall throughput holds up, and cut back when servers respond slower, "
+            "rate-limit, or fail repeatedly."
+        ),
+    )
+
+    http2: bool = Field(
+        default=False,
+        description=(
+            "Use HTTP/2 for HTTPS requests where servers support it, so that requests to the same host share a single "
+            "connection instead of opening one per download. Requires the 'http2' extra."
+        ),
+    )
+
+    dns_cache_ttl: int = Field(
+        default=constants.DNS_CACHE_TTL,
+        description=(
+            "Number of seconds to keep resolved host names in memory, e.g. 300. The cache is disabled by default, "
+            "as it replaces the host name resolution of the whole process."
+        ),
+    )
+
+    warm_up: bool = Field(
+        default=False,
+        description=(
+            "Before processing, resolve the host names of all feeds and open connections to them concurrently, "
+            "instead of paying for each lookup and handshake when the feed is fetched."
+        ),
+    )
+
+    parse_processes: int = Field(
+        default=0,
+        description=(
+            "Number of worker processes to parse feeds in, so that several feeds are parsed at once on multiple CPU "
+            "cores while they are being fetched. With 0, feeds are fetched and parsed one after another."
+        ),
+    )
+
+    probe_enclosures: bool = Field(
+        default=False,
+        description=(
+            "Before downloading, send lightweight HEAD requests for the enclosures of missing episodes to learn "
+            "their actual size and ETag. Episodes that were republished in the feed but are unchanged on the server "
+            "are not downloaded again."
+        ),
+    )
+
+    download_order: DownloadOrder = Field(
+        default=DownloadOrder.ROUND_ROBIN,
+        description=(
+            "Order in which to download missing episodes across all feeds: alternating between feeds (round-robin), "
+            "newest first, shortest/largest first, or in the order the feeds and their episodes were loaded. "
+            "Sizes are taken from the feed, or from the server if --probe-enclosures is set. Episodes are queued a few "
+            "at a time, so sorting applies to the episodes currently queued per feed, not to its entire backlog."
+        ),
+    )
+
+    feed_weights: FeedWeights = Field(
+        default_factory=dict,
+        description=(
+            "Relative share of download slots per feed URL when using the round-robin download order, given as "
+            "URL=WEIGHT. A feed with weight 3 gets three downloads for each download of feeds with the default weight 1."
+        ),
+    )
+
     debug_partial: bool = Field(
         default=False,
         description=f"Download only the first {constants.DEBUG_PARTIAL_SIZE} bytes of episodes for debugging purposes.",
@@ -135,6 +247,15 @@ class Settings(BaseModel):
         ),
     )
 
+    deduplicate: bool = Field(
+        default=False,
+        description=(
+            "Store identical media only once. Episodes whose enclosure has already been archived for another episode "
+            "(same URL and length, or same content checksum) are hardlinked to the existing file instead of being "
+            "stored again."
+        ),
+    )
+
     sleep_seconds: int = Field(
         default=0,
         description=(
@@ -143,11 +264,38 @@ class Settings(BaseModel):
         ),
     )
 
+    metrics_port: int = Field(
+        default=0,
+        description=(
+            "Serve metrics in the Prometheus text format on this port at /metrics, e.g. to monitor continuous mode: "
+            "downloaded bytes, download results, queued and active downloads, feed responses (including 304 Not "
+            "Modified), and the duration of fetching, parsing, database access, and downloads. Disabled if 0."
+        ),
+    )
+
+    metrics_address: str = Field(
+        default=constants.METRICS_ADDRESS,
+        description=(
+            "Address to serve metrics on. Only local connections are accepted by default, use 0.0.0.0 to serve "
+            "metrics to other hosts or containers."
+        ),
+    )
+
     config: FilePath | None = Field(
         default=None,
         exclude=True,
     )
 
+    @property
+    def aggregate_progress(self) -> bool:
+        if self.progress_display == ProgressDisplay.AUTO:
+            return self.concurrency > constants.AGGREGATE_PROGRESS_CONCURRENCY
+        return self.progress_display == ProgressDisplay.AGGREGATE
+
+    @field_serializer("feed_weights")
+    def serialize_feed_weights(self, value: dict[str, int]) -> list[str]:
+        return [f"{url}={weight}" for url, weight in value.items()]
+
     @classmethod
     def get_deprecated_options(cls) -> dict[str, tuple[str, FieldInfo]]:
         return {
@@ -8,17 +8,39 @@ USER_AGENT = f"{PROG_NAME}/{__version__} (https://github.com/janw/podcast-archiv
 ENVVAR_PREFIX = "PODCAST_ARCHIVER"
 
 REQUESTS_TIMEOUT = (5, 30)
+DNS_CACHE_TTL = 0
+MAX_CONNECTION_POOLS = 64
 
 SUPPORTED_LINK_TYPES_RE = re.compile(r"^(audio|video)/")
 DOWNLOAD_CHUNK_SIZE = 256 * 1024
 DEBUG_PARTIAL_SIZE = DOWNLOAD_CHUNK_SIZE * 4
+CHECKSUM_ALGORITHM = "sha256"
+PROBE_BATCH_SIZE = 16
+IMPORT_BATCH_SIZE = 500
+
+THROTTLING_STATUS_CODES = (429, 503)
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 600
+MAX_RATE_LIMITED_ATTEMPTS = 5
+
+RETRY_BACKOFF_BASE_SECONDS = 15 * 60
+RETRY_BACKOFF_MAX_SECONDS = 24 * 60 * 60
+MAX_RETRY_ATTEMPTS = 8
+RETRY_QUEUE_NAME = "retries"
 
 MAX_TITLE_LENGTH = 120
+TIMING_SUMMARY_FEEDS = 10
+PROFILE_SUMMARY_ENTRIES = 20
+
+METRICS_PREFIX = "podcast_archiver"
+METRICS_ADDRESS = "127.0.0.1"
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
 
 DEFAULT_DATETIME_FORMAT = "%Y-%m-%d"
 DEFAULT_ARCHIVE_DIRECTORY = pathlib.Path(".")
 DEFAULT_FILENAME_TEMPLATE = "{show.title}/{episode.published_time:%Y-%m-%d} - {episode.title}.{ext}"
 DEFAULT_CONCURRENCY = 4
+AGGREGATE_PROGRESS_CONCURRENCY = 16
 DEFAULT_DATABASE_FILENAME = "podcast-archiver.db"
 
 DEPRECATION_MESSAGE = "will be removed in the next major release"
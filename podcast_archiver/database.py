@@ -2,18 +2,20 @@ from __future__ import annotations
 
 import sqlite3
 from abc import abstractmethod
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from threading import Lock
-from typing import TYPE_CHECKING, Iterator, Literal
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
 
-from podcast_archiver import constants
+from podcast_archiver import compat, constants
 from podcast_archiver.logging import logger
 
 if TYPE_CHECKING:
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.models.episode import EpisodeRecord
+
+    EpisodeRow = tuple[str, str, int | None, datetime, str | None, str, Path | None, int | None, str | None, str | None]
 
 
 def adapt_datetime_iso(val: datetime) -> str:
@@ -24,14 +26,69 @@ def convert_datetime_iso(val: bytes) -> datetime:
     return datetime.fromisoformat(val.decode())
 
 
+def adapt_path(val: Path) -> str:
+    return str(val)
+
+
+def convert_path(val: bytes) -> Path:
+    return Path(val.decode())
+
+
 sqlite3.register_adapter(datetime, adapt_datetime_iso)
 sqlite3.register_converter("TIMESTAMP", convert_datetime_iso)
+sqlite3.register_adapter(type(Path()), adapt_path)
+sqlite3.register_converter("PATH", convert_path)
+
+
+EPISODE_COLUMNS = "guid, title, length, published_time, checksum, path, size, etag, feed"
+RETRY_COLUMNS = "guid, feed, target, episode, attempts, next_attempt"
+
+UPSERT_EPISODE = """\
+INSERT INTO episodes(guid, title, length, published_time, checksum, enclosure_url, path, size, etag, feed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(guid) DO UPDATE SET
+    title = excluded.title,
+    length = excluded.length,
+    published_time = excluded.published_time,
+    checksum = COALESCE(excluded.checksum, checksum),
+    enclosure_url = excluded.enclosure_url,
+    path = COALESCE(excluded.path, path),
+    size = COALESCE(excluded.size, size),
+    etag = COALESCE(excluded.etag, etag),
+    feed = COALESCE(excluded.feed, feed)
+"""
 
 
 @dataclass(frozen=True, slots=True)
 class EpisodeInDb:
+    guid: str | None = None
+    title: str | None = None
     length: int | None = None
     published_time: datetime | None = None
+    checksum: str | None = None
+    path: Path | None = None
+    size: int | None = None
+    etag: str | None = None
+    feed: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RetryInDb:
+    guid: str
+    feed: str
+    target: Path
+    episode: str
+    attempts: int
+    next_attempt: datetime
+
+    @property
+    def is_due(self) -> bool:
+        return self.next_attempt <= datetime.now(compat.UTC)
+
+
+def next_retry_delay(attempts: int) -> timedelta:
+    delay = constants.RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, constants.RETRY_BACKOFF_MAX_SECONDS))
 
 
 class BaseDatabase:
@@ -45,21 +102,86 @@ class BaseDatabase:
         self.ignore_existing = ignore_existing
 
     @abstractmethod
-    def add(self, episode: BaseEpisode) -> None:
+    def add(
+        self,
+        episode: EpisodeRecord,
+        *,
+        checksum: str | None = None,
+        path: Path | None = None,
+        etag: str | None = None,
+        feed: str | None = None,
+    ) -> None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_many(self, episodes: Iterable[tuple[EpisodeRecord, Path]], *, feed: str | None = None) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def exists(self, episode: EpisodeRecord) -> EpisodeInDb | None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def find_duplicate(self, episode: EpisodeRecord, *, checksum: str | None = None) -> EpisodeInDb | None:
         pass  # pragma: no cover
 
     @abstractmethod
-    def exists(self, episode: BaseEpisode) -> EpisodeInDb | None:
+    def iter_archived(self) -> Iterator[EpisodeInDb]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def remove(self, guid: str) -> None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_retry(self, episode: EpisodeRecord, *, feed: str, target: Path) -> RetryInDb | None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def iter_retries(self) -> Iterator[RetryInDb]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def remove_retry(self, guid: str) -> None:
         pass  # pragma: no cover
 
 
 class DummyDatabase(BaseDatabase):
-    def add(self, episode: BaseEpisode) -> None:
+    def add(
+        self,
+        episode: EpisodeRecord,
+        *,
+        checksum: str | None = None,
+        path: Path | None = None,
+        etag: str | None = None,
+        feed: str | None = None,
+    ) -> None:
         pass
 
-    def exists(self, episode: BaseEpisode) -> EpisodeInDb | None:
+    def add_many(self, episodes: Iterable[tuple[EpisodeRecord, Path]], *, feed: str | None = None) -> int:
+        return 0
+
+    def exists(self, episode: EpisodeRecord) -> EpisodeInDb | None:
+        return None
+
+    def find_duplicate(self, episode: EpisodeRecord, *, checksum: str | None = None) -> EpisodeInDb | None:
         return None
 
+    def iter_archived(self) -> Iterator[EpisodeInDb]:
+        yield from ()
+
+    def remove(self, guid: str) -> None:
+        pass
+
+    def add_retry(self, episode: EpisodeRecord, *, feed: str, target: Path) -> RetryInDb | None:
+        return None
+
+    def iter_retries(self) -> Iterator[RetryInDb]:
+        yield from ()
+
+    def remove_retry(self, guid: str) -> None:
+        pass
+
 
 class Database(BaseDatabase):
     lock: Lock
@@ -70,7 +192,8 @@ class Database(BaseDatabase):
     def __init__(self, filename: str, ignore_existing: bool) -> None:
         super().__init__(filename=filename, ignore_existing=ignore_existing)
         self.lock = Lock()
-        self.conn = sqlite3.connect(self.filename, detect_types=sqlite3.PARSE_DECLTYPES)
+        # Episodes are enqueued from download worker threads; access is serialized through `self.lock`.
+        self.conn = sqlite3.connect(self.filename, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
         self.migrate()
 
     @contextmanager
@@ -89,6 +212,17 @@ class Database(BaseDatabase):
                     title TEXT
                 )"""
             )
+            conn.execute(
+                """\
+                CREATE TABLE IF NOT EXISTS retries(
+                    guid TEXT UNIQUE NOT NULL,
+                    feed TEXT NOT NULL,
+                    target PATH NOT NULL,
+                    episode TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt TIMESTAMP NOT NULL
+                )"""
+            )
 
         # NOTE: This is is a rudimentary migration system. It's not perfect but it's
         # good enough for now, and does not require additional dependencies.
@@ -100,6 +234,33 @@ class Database(BaseDatabase):
             "published_time",
             "ALTER TABLE episodes ADD COLUMN published_time TIMESTAMP",
         )
+        self._add_column_if_missing(
+            "checksum",
+            "ALTER TABLE episodes ADD COLUMN checksum TEXT",
+        )
+        self._add_column_if_missing(
+            "enclosure_url",
+            "ALTER TABLE episodes ADD COLUMN enclosure_url TEXT",
+        )
+        self._add_column_if_missing(
+            "path",
+            "ALTER TABLE episodes ADD COLUMN path PATH",
+        )
+        self._add_column_if_missing(
+            "size",
+            "ALTER TABLE episodes ADD COLUMN size UNSIGNED BIG INT",
+        )
+        self._add_column_if_missing(
+            "etag",
+            "ALTER TABLE episodes ADD COLUMN etag TEXT",
+        )
+        self._add_column_if_missing(
+            "feed",
+            "ALTER TABLE episodes ADD COLUMN feed TEXT",
+        )
+        with self.get_conn() as conn:
+            conn.execute("CREATE INDEX IF NOT EXISTS episodes_checksum ON episodes(checksum)")
+            conn.execute("CREATE INDEX IF NOT EXISTS episodes_enclosure_url ON episodes(enclosure_url)")
 
     def _add_column_if_missing(self, name: str, alter_stmt: str) -> None:
         with self.get_conn() as conn:
@@ -114,32 +275,136 @@ class Database(BaseDatabase):
         )
         return bool(result.fetchone()[0])
 
-    def add(self, episode: BaseEpisode) -> None:
+    def add(
+        self,
+        episode: EpisodeRecord,
+        *,
+        checksum: str | None = None,
+        path: Path | None = None,
+        etag: str | None = None,
+        feed: str | None = None,
+    ) -> None:
+        row = self._episode_row(episode, checksum=checksum, path=path, etag=etag, feed=feed)
         with self.get_conn() as conn:
             try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO episodes(guid, title, length, published_time) VALUES (?, ?, ?, ?)",
-                    (
-                        episode.guid,
-                        episode.title,
-                        episode.enclosure.length,
-                        episode.published_time,
-                    ),
-                )
+                conn.execute(UPSERT_EPISODE, row)
+                conn.execute("DELETE FROM retries WHERE guid = ?", (episode.guid,))
             except sqlite3.DatabaseError as exc:
                 logger.debug("Error adding %s to db", episode, exc_info=exc)
 
-    def exists(self, episode: BaseEpisode) -> EpisodeInDb | None:
+    def add_many(self, episodes: Iterable[tuple[EpisodeRecord, Path]], *, feed: str | None = None) -> int:
+        rows = [self._episode_row(episode, path=path, feed=feed) for episode, path in episodes]
+        # A single transaction for all episodes, rather than one per episode.
+        with self.get_conn() as conn:
+            try:
+                conn.executemany(UPSERT_EPISODE, rows)
+                conn.executemany("DELETE FROM retries WHERE guid = ?", ((row[0],) for row in rows))
+            except sqlite3.DatabaseError as exc:
+                logger.debug("Error adding %s episodes to db", len(rows), exc_info=exc)
+                conn.rollback()
+                return 0
+        return len(rows)
+
+    @staticmethod
+    def _episode_row(
+        episode: EpisodeRecord,
+        *,
+        checksum: str | None = None,
+        path: Path | None = None,
+        etag: str | None = None,
+        feed: str | None = None,
+    ) -> EpisodeRow:
+        size = None
+        if path:
+            path = path.absolute()
+            with suppress(OSError):
+                size = path.stat().st_size
+        return (
+            episode.guid,
+            episode.title,
+            episode.enclosure.length,
+            episode.published_time,
+            checksum,
+            episode.enclosure.href,
+            path,
+            size,
+            etag,
+            feed,
+        )
+
+    def exists(self, episode: EpisodeRecord) -> EpisodeInDb | None:
         if self.ignore_existing:
             return None
         with self.get_conn() as conn:
             result = conn.execute(
-                "SELECT length, published_time FROM episodes WHERE guid = ?",
+                f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE guid = ?",
                 (episode.guid,),
             )
             match = result.fetchone()
         return EpisodeInDb(**match) if match else None
 
+    def find_duplicate(self, episode: EpisodeRecord, *, checksum: str | None = None) -> EpisodeInDb | None:
+        if checksum:
+            query = f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE checksum = ? AND guid != ?"
+            params: tuple[str | int, ...] = (checksum, episode.guid)
+        else:
+            query = f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE enclosure_url = ? AND guid != ?"
+            params = (episode.enclosure.href, episode.guid)
+            if length := episode.enclosure.length:
+                query += " AND (length IS NULL OR length = ?)"
+                params += (length,)
+
+        with self.get_conn() as conn:
+            result = conn.execute(query + " AND path IS NOT NULL", params)
+            matches = result.fetchall()
+
+        for match in matches:
+            if match["path"].is_file():
+                return EpisodeInDb(**match)
+        return None
+
+    def iter_archived(self) -> Iterator[EpisodeInDb]:
+        with self.get_conn() as conn:
+            rows = conn.execute(f"SELECT {EPISODE_COLUMNS} FROM episodes").fetchall()
+        for row in rows:
+            yield EpisodeInDb(**row)
+
+    def remove(self, guid: str) -> None:
+        with self.get_conn() as conn:
+            conn.execute("DELETE FROM episodes WHERE guid = ?", (guid,))
+
+    def add_retry(self, episode: EpisodeRecord, *, feed: str, target: Path) -> RetryInDb | None:
+        with self.get_conn() as conn:
+            row = conn.execute("SELECT attempts FROM retries WHERE guid = ?", (episode.guid,)).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            retry = RetryInDb(
+                guid=episode.guid,
+                feed=feed,
+                target=target,
+                episode=episode.materialize().model_dump_json(by_alias=True),
+                attempts=attempts,
+                next_attempt=datetime.now(compat.UTC) + next_retry_delay(attempts),
+            )
+            try:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO retries({RETRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                    (retry.guid, retry.feed, retry.target, retry.episode, retry.attempts, retry.next_attempt),
+                )
+            except sqlite3.DatabaseError as exc:
+                logger.debug("Error adding retry for %s to db", episode, exc_info=exc)
+                return None
+        return retry
+
+    def iter_retries(self) -> Iterator[RetryInDb]:
+        with self.get_conn() as conn:
+            rows = conn.execute(f"SELECT {RETRY_COLUMNS} FROM retries ORDER BY next_attempt").fetchall()
+        for row in rows:
+            yield RetryInDb(**row)
+
+    def remove_retry(self, guid: str) -> None:
+        with self.get_conn() as conn:
+            conn.execute("DELETE FROM retries WHERE guid = ?", (guid,))
+
 
 def get_database(path: Path | Literal[":memory:"] | None, ignore_existing: bool = False) -> Database:
     if path is None:
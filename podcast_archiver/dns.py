@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import socket
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from urllib3.util.connection import allowed_gai_family
+
+from podcast_archiver.logging import logger
+
+AddrInfo = list[tuple[Any, ...]]
+CacheKey = tuple[Any, ...]
+
+
+class DnsCache:
+    ttl: float
+
+    _lock: Lock
+    _entries: dict[CacheKey, tuple[float, AddrInfo]]
+    _getaddrinfo: Any
+
+    __slots__ = ("ttl", "_lock", "_entries", "_getaddrinfo")
+
+    def __init__(self, ttl: float = 0) -> None:
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entries = {}
+        self._getaddrinfo = socket.getaddrinfo
+
+    @property
+    def is_installed(self) -> bool:
+        return socket.getaddrinfo == self.getaddrinfo
+
+    def configure(self, ttl: float) -> None:
+        # Every connection, regardless of the HTTP client used, resolves host names through `socket.getaddrinfo`.
+        self.ttl = ttl
+        if ttl > 0 and not self.is_installed:
+            socket.getaddrinfo = self.getaddrinfo
+        elif ttl <= 0:
+            self.uninstall()
+
+    def uninstall(self) -> None:
+        if self.is_installed:
+            socket.getaddrinfo = self._getaddrinfo
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def getaddrinfo(
+        self,
+        host: Any,
+        port: Any,
+        family: int = 0,
+        type: int = 0,  # noqa: A002
+        proto: int = 0,
+        flags: int = 0,
+    ) -> AddrInfo:
+        key = (host, port, family, type, proto, flags)
+        now = monotonic()
+        with self._lock:
+            if (entry := self._entries.get(key)) and entry[0] > now:
+                return list(entry[1])
+            # Expired entries are dropped on every miss, so that the cache does not grow while running continuously.
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+
+        result = self._getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+        return list(result)
+
+    def resolve(self, host: str, port: int) -> bool:
+        try:
+            # Resolve the same way urllib3 does when connecting, so that the connection finds the cached entry.
+            socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError as exc:
+            logger.debug("Failed to resolve %s", host, exc_info=exc)
+            return False
+        return True
+
+
+dns_cache = DnsCache()
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from threading import Event
-from typing import IO, TYPE_CHECKING, Generator
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, Any, Callable, Generator
+
+from requests import HTTPError
 
 from podcast_archiver import constants
-from podcast_archiver.enums import DownloadResult
+from podcast_archiver.enums import DownloadResult, ReportEvent, Stage
 from podcast_archiver.exceptions import NotCompleted
 from podcast_archiver.logging import logger
+from podcast_archiver.metrics import metrics
+from podcast_archiver.report import episode_fields, run_report
 from podcast_archiver.session import session
+from podcast_archiver.timing import stage_timer
 from podcast_archiver.types import EpisodeResult
-from podcast_archiver.utils import atomic_write
+from podcast_archiver.utils import atomic_write, link_or_copy, sanitize_url
 from podcast_archiver.utils.progress import progress_manager
 
 if TYPE_CHECKING:
@@ -19,37 +26,126 @@ if TYPE_CHECKING:
 
     from requests import Response
 
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.database import EpisodeInDb
+    from podcast_archiver.models.episode import EpisodeRecord
+    from podcast_archiver.probe import ProbeResult
 
 
 @dataclass(slots=True)
 class DownloadJob:
-    episode: BaseEpisode
+    episode: EpisodeRecord
     target: Path
     add_info_json: bool = False
     stop_event: Event = field(default_factory=Event)
     max_download_bytes: int | None = None
+    duplicate: EpisodeInDb | None = None
+    probe: ProbeResult | None = None
+    on_receive: Callable[[int], Any] | None = None
+    feed: str | None = None
+    checksum: str | None = field(default=None, init=False)
+    etag: str | None = field(default=None, init=False)
+    latency: float | None = field(default=None, init=False)
+    status_code: int | None = field(default=None, init=False)
+    attempts: int = field(default=0, init=False)
+    received: int = field(default=0, init=False)
+    error: str | None = field(default=None, init=False)
 
     def __call__(self) -> EpisodeResult:
+        run_report.emit(
+            ReportEvent.DOWNLOAD_STARTED,
+            feed=sanitize_url(self.feed) if self.feed else None,
+            attempt=self.attempts + 1,
+            **self.report_fields,
+        )
+        metrics.active_downloads.inc()
+        start = perf_counter()
+        try:
+            episode_result = self._attempt()
+        finally:
+            metrics.active_downloads.dec()
+            # Added once per download rather than per chunk, which would contend for the lock of the counter.
+            metrics.downloaded_bytes.inc(self.received)
+        metrics.downloads.inc(result=episode_result.result.name.lower())
+        self._report(episode_result, duration=perf_counter() - start)
+        return episode_result
+
+    @property
+    def report_fields(self) -> dict[str, Any]:
+        return {**episode_fields(self.episode), "target": str(self.target)}
+
+    def _report(self, episode_result: EpisodeResult, duration: float) -> None:
+        if not run_report.enabled:
+            return
+        result = episode_result.result
+        run_report.emit(
+            ReportEvent.DOWNLOAD_COMPLETED if result in DownloadResult.successful() else ReportEvent.DOWNLOAD_FAILED,
+            feed=sanitize_url(self.feed) if self.feed else None,
+            result=result.name.lower(),
+            bytes=self.received,
+            duration=round(duration, 3),
+            status_code=self.status_code,
+            error=self.error,
+            **self.report_fields,
+        )
+
+    def _attempt(self) -> EpisodeResult:
+        self.attempts += 1
+        self.status_code = None
+        self.received = 0
+        self.error = None
         try:
-            self.run()
-            result = DownloadResult.COMPLETED_SUCCESSFULLY
+            with stage_timer.feed(self.feed):
+                result = self.run()
         except NotCompleted:
-            result = DownloadResult.ABORTED
+            return EpisodeResult(self.episode, DownloadResult.ABORTED)
         except Exception as exc:
+            if isinstance(exc, HTTPError) and exc.response is not None:
+                self.status_code = exc.response.status_code
+            self.error = str(exc)
+            if self.may_retry:
+                logger.info("Download rate-limited, will retry: %s; %s", self.episode, exc)
+                return EpisodeResult(self.episode, DownloadResult.FAILED)
             logger.error("Download failed: %s; %s", self.episode, exc)
             logger.debug("Exception while downloading", exc_info=exc)
-            result = DownloadResult.FAILED
+            return EpisodeResult(self.episode, DownloadResult.FAILED)
 
-        return EpisodeResult(self.episode, result)
+        return EpisodeResult(self.episode, result, checksum=self.checksum, target=self.target, etag=self.etag)
 
-    def run(self) -> None:
+    def run(self) -> DownloadResult:
         self.target.parent.mkdir(parents=True, exist_ok=True)
+        if self.duplicate and self.duplicate.path:
+            logger.info("Linking: %s from %s", self.episode, self.duplicate.path)
+            with self.write_info_json():
+                link_or_copy(self.duplicate.path, self.target)
+            self.checksum = self.duplicate.checksum
+            return DownloadResult.LINKED
+
         logger.info("Downloading: %s", self.episode)
+        start = perf_counter()
         response = session.get_and_raise(self.episode.enclosure.href, stream=True)
+        self.status_code = response.status_code
+        self.latency = response.elapsed.total_seconds()
+        self.etag = response.headers.get("ETag")
         with self.write_info_json(), atomic_write(self.target, mode="wb") as fp:
             self.receive_data(fp, response)
+            # Writing the file to disk is timed separately, as the finalize stage.
+            stage_timer.add(Stage.DOWNLOAD, perf_counter() - start)
         logger.info("Completed: %s", self.episode)
+        return DownloadResult.COMPLETED_SUCCESSFULLY
+
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.status_code in constants.THROTTLING_STATUS_CODES
+
+    @property
+    def may_retry(self) -> bool:
+        return self.is_rate_limited and self.attempts < constants.MAX_RATE_LIMITED_ATTEMPTS
+
+    @property
+    def expected_size(self) -> int:
+        if self.probe and self.probe.length:
+            return self.probe.length
+        return self.episode.enclosure.length or 0
 
     @property
     def infojsonfile(self) -> Path:
@@ -59,28 +155,39 @@ class DownloadJob:
         total_size = int(response.headers.get("content-length", "0"))
         total_written = 0
         max_bytes = self.max_download_bytes
+        hasher = hashlib.new(constants.CHECKSUM_ALGORITHM)
         for chunk in progress_manager.track(
             response.iter_content(chunk_size=constants.DOWNLOAD_CHUNK_SIZE),
             episode=self.episode,
             total=total_size,
         ):
-            total_written += fp.write(chunk)
+            written = fp.write(chunk)
+            total_written += written
+            self.received = total_written
+            if self.on_receive:
+                self.on_receive(written)
 
             if max_bytes and total_written >= max_bytes:
                 fp.truncate(max_bytes)
+                hasher.update(chunk[: len(chunk) - (total_written - max_bytes)])
+                self.checksum = hasher.hexdigest()
                 logger.debug("Partial download of first %s bytes completed.", max_bytes)
                 return
 
+            hasher.update(chunk)
+
             if self.stop_event.is_set():
                 logger.debug("Stop event is set, bailing on %s.", self.episode)
                 raise NotCompleted
 
+        self.checksum = hasher.hexdigest()
+
     @contextmanager
     def write_info_json(self) -> Generator[None, None, None]:
         if not self.add_info_json:
             yield
             return
         with atomic_write(self.infojsonfile) as fp:
-            fp.write(self.episode.model_dump_json(indent=2) + "\n")
+            fp.write(self.episode.materialize().model_dump_json(indent=2) + "\n")
             yield
         logger.debug("Wrote episode metadata to %s", self.infojsonfile.name)
@@ -43,6 +43,7 @@ class QueueCompletionType(StrEnum):
 class DownloadResult(StrEnum):
     ALREADY_EXISTS = "✓ Present"
     COMPLETED_SUCCESSFULLY = "✓ Archived"
+    LINKED = "✓ Linked"
     MISSING = "✘ Missing"
     FAILED = "✘ Failed"
     ABORTED = "✘ Aborted"
@@ -60,6 +61,7 @@ class DownloadResult(StrEnum):
         return {
             cls.ALREADY_EXISTS,
             cls.COMPLETED_SUCCESSFULLY,
+            cls.LINKED,
         }
 
     def render_padded(self, padding: str = "   ") -> RenderableType:
@@ -69,4 +71,66 @@ class DownloadResult(StrEnum):
         return self.render_padded()
 
 
-RESULT_MAX_LEN = max(len(result.value) for result in DownloadResult)
+class DownloadOrder(StrEnum):
+    FEED = "feed"
+    ROUND_ROBIN = "round-robin"
+    NEWEST = "newest"
+    SHORTEST = "shortest"
+    LARGEST = "largest"
+
+
+class ProgressDisplay(StrEnum):
+    AUTO = "auto"
+    EPISODES = "episodes"
+    AGGREGATE = "aggregate"
+
+
+class Stage(StrEnum):
+    RESOLVE = "resolve"
+    FETCH = "fetch"
+    PARSE = "parse"
+    DATABASE = "database"
+    DOWNLOAD = "download"
+    FINALIZE = "finalize"
+
+
+class ReportEvent(StrEnum):
+    RUN_STARTED = "run_started"
+    FEED_LOADED = "feed_loaded"
+    FEED_FAILED = "feed_failed"
+    EPISODE_QUEUED = "episode_queued"
+    DOWNLOAD_STARTED = "download_started"
+    DOWNLOAD_COMPLETED = "download_completed"
+    DOWNLOAD_FAILED = "download_failed"
+    FEED_COMPLETED = "feed_completed"
+    RUN_COMPLETED = "run_completed"
+
+
+class VerificationResult(StrEnum):
+    INTACT = "✓ Intact"
+    MISSING = "✘ Missing"
+    TRUNCATED = "✘ Truncated"
+    CORRUPTED = "✘ Corrupted"
+    ORPHANED = "? Orphaned"
+
+    @property
+    def style(self) -> str:
+        if self is self.INTACT:
+            return "success"
+        if self is self.ORPHANED:
+            return "missing"
+        return "error"
+
+    @classmethod
+    def broken(cls) -> set[VerificationResult]:
+        return {
+            cls.MISSING,
+            cls.TRUNCATED,
+            cls.CORRUPTED,
+        }
+
+    def __rich__(self) -> RenderableType:
+        return Text(f"{self.value:{RESULT_MAX_LEN}s}   ", style=self.style, end="")
+
+
+RESULT_MAX_LEN = max(len(result.value) for result in (*DownloadResult, *VerificationResult))
@@ -49,3 +49,7 @@ class NotModified(PodcastArchiverException):
 
 class NotSupported(PodcastArchiverException):
     pass
+
+
+class MalformedFeed(PodcastArchiverException):
+    pass
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from podcast_archiver import constants
+from podcast_archiver.logging import logger, rprint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from podcast_archiver.models.episode import EpisodeRecord
+    from podcast_archiver.models.feed import Feed
+    from podcast_archiver.processor import FeedProcessor
+
+
+# Records episodes whose files already exist in the archive directory in the database, so that later runs can rely on
+# database lookups alone instead of checking the filesystem for every episode not in the database.
+class ArchiveImporter:
+    processor: FeedProcessor
+
+    __slots__ = ("processor",)
+
+    def __init__(self, processor: FeedProcessor) -> None:
+        self.processor = processor
+
+    def import_feeds(self, urls: Iterable[str]) -> int:
+        imported = 0
+        for url in urls:
+            if not (feed := self.processor.load_feed(url)):
+                continue
+            rprint(f"→ Importing: {feed.info.title}", style="title", markup=False, highlight=False)
+            imported += self.import_feed(feed)
+
+        rprint(f"✔ Imported {imported} existing episodes", style="completed")
+        return imported
+
+    def import_feed(self, feed: Feed) -> int:
+        imported = 0
+        batch: list[tuple[EpisodeRecord, Path]] = []
+        for episode, target in self._iter_existing(feed):
+            batch.append((episode, target))
+            if len(batch) >= constants.IMPORT_BATCH_SIZE:
+                imported += self.processor.database.add_many(batch, feed=feed.url)
+                batch = []
+        imported += self.processor.database.add_many(batch, feed=feed.url)
+        logger.info("Imported %s existing episodes of %s", imported, feed)
+        return imported
+
+    def _iter_existing(self, feed: Feed) -> Iterator[tuple[EpisodeRecord, Path]]:
+        database = self.processor.database
+        for idx, episode in enumerate(feed.episodes, 1):
+            if episode is None:
+                logger.debug("Skipping invalid episode at idx %s", idx)
+                continue
+            target = self.processor.filename_formatter.format(episode=episode, feed_info=feed.info)
+            record = episode.to_record()
+            if database.exists(record) or not self.processor.directory_listing.exists(target):
+                continue
+            logger.debug("Episode '%s': found on disk at %s", record, target)
+            yield record, target
@@ -8,7 +8,6 @@ from typing import TYPE_CHECKING, Any
 
 from rich.console import Console
 from rich.highlighter import NullHighlighter
-from rich.logging import RichHandler
 
 from podcast_archiver.console import console
 
@@ -75,6 +74,8 @@ def configure_logging(verbosity: int, quiet: bool) -> None:
     logformat: str = "%(asctime)s %(name)-16s %(levelname)-5s %(message)s"
 
     if is_interactive():
+        from rich.logging import RichHandler
+
         logformat = "%(message)s"
         handlers = [
             RichHandler(
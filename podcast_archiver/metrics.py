@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Callable, Iterator
+
+from podcast_archiver import constants
+from podcast_archiver.logging import logger
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, **extra: str) -> str:
+    pairs = [*zip(names, values, strict=True), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    kind: str = "untyped"
+
+    name: str
+    description: str
+    labels: tuple[str, ...]
+    _lock: Lock
+
+    __slots__ = ("name", "description", "labels", "_lock")
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = f"{constants.METRICS_PREFIX}_{name}"
+        self.description = description
+        self.labels = labels
+        self._lock = Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        pass  # pragma: no cover
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    _values: dict[LabelValues, float]
+
+    __slots__ = ("_values",)
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, description, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    _function: Callable[[], float] | None
+
+    __slots__ = ("_function",)
+
+    def __init__(self, name: str, description: str) -> None:
+        super().__init__(name, description)
+        self._function = None
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._values[()] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float] | None) -> None:
+        # Evaluated when the metrics are collected, for values that are already tracked elsewhere.
+        self._function = function
+
+    def samples(self) -> Iterator[str]:
+        if function := self._function:
+            yield f"{self.name} {_format_value(function())}"
+            return
+        yield from super().samples()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    buckets: tuple[float, ...]
+    _counts: dict[LabelValues, list[int]]
+    _sums: dict[LabelValues, float]
+
+    __slots__ = ("buckets", "_counts", "_sums")
+
+    def __init__(
+        self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = ()
+    ) -> None:
+        super().__init__(name, description, labels)
+        self.buckets = (*sorted(buckets or constants.METRICS_BUCKETS), float("inf"))
+        self._counts = {}
+        self._sums = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            if not (counts := self._counts.get(key)):
+                counts = self._counts[key] = [0] * len(self.buckets)
+            counts[idx] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                labels = _format_labels(self.labels, key, le=_format_value(bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class Metrics:
+    downloaded_bytes: Counter
+    downloads: Counter
+    active_downloads: Gauge
+    queued_downloads: Gauge
+    workers: Gauge
+    feed_responses: Counter
+    stage_duration: Histogram
+    last_run: Gauge
+
+    __slots__ = (
+        "downloaded_bytes",
+        "downloads",
+        "active_downloads",
+        "queued_downloads",
+        "workers",
+        "feed_responses",
+        "stage_duration",
+        "last_run",
+    )
+
+    def __init__(self) -> None:
+        self.downloaded_bytes = Counter("downloaded_bytes_total", "Bytes of media downloaded.")
+        self.downloads = Counter("downloads_total", "Finished episode downloads by result.", labels=("result",))
+        self.active_downloads = Gauge("active_downloads", "Episodes currently being downloaded.")
+        self.queued_downloads = Gauge("queued_downloads", "Episodes queued for download.")
+        self.workers = Gauge("workers", "Download workers currently running.")
+        self.feed_responses = Counter(
+            "feed_responses_total",
+            "Responses to feed requests by status code, where 304 means the feed was not modified.",
+            labels=("status",),
+        )
+        self.stage_duration = Histogram(
+            "stage_duration_seconds",
+            "Duration of processing stages, such as fetching feeds, database access, and downloads.",
+            labels=("stage",),
+        )
+        self.last_run = Gauge("last_run_timestamp_seconds", "Time the last run completed, as a Unix timestamp.")
+
+    def __iter__(self) -> Iterator[Metric]:
+        return (getattr(self, name) for name in self.__slots__)
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self for line in metric.render()) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, msg: str, *args: Any) -> None:
+        logger.debug("Metrics request: " + msg, *args)
+
+
+class MetricsServer:
+    server: ThreadingHTTPServer | None
+
+    __slots__ = ("server",)
+
+    def __init__(self) -> None:
+        self.server = None
+
+    @property
+    def url(self) -> str | None:
+        if not self.server:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}/metrics"
+
+    def start(self, address: str, port: int) -> None:
+        if self.server:
+            return
+        self.server = ThreadingHTTPServer((address, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, name="metrics", daemon=True).start()
+        logger.info("Serving metrics at %s", self.url)
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.server = None
+
+
+metrics = Metrics()
+metrics_server = MetricsServer()
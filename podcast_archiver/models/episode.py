@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Annotated
 from urllib.parse import urlparse
 
 from pydantic import (
+    AliasChoices,
+    AliasPath,
     BaseModel,
     Field,
     field_validator,
@@ -20,6 +23,8 @@ from podcast_archiver.models.misc import Link
 from podcast_archiver.utils import get_generic_extension, truncate
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from rich.console import RenderableType
 
 
@@ -76,6 +81,15 @@ class BaseEpisode(BaseModel):
             self.guid = self.enclosure.href
         return self
 
+    def to_record(self, keep_full: bool = False) -> EpisodeRecord:
+        return EpisodeRecord(
+            guid=self.guid,
+            title=self.title,
+            published_time=self.published_time,
+            enclosure=self.enclosure,
+            full=self if keep_full else None,
+        )
+
     @cached_property
     def ext(self) -> str:
         if fname := self.original_filename:
@@ -101,7 +115,12 @@ class Episode(BaseEpisode):
 
     summary: str | None = Field(None, repr=False)
     duration: str | None = Field(None, repr=False, alias="itunes_duration")
-    chapters: list[Chapter] | None = Field(None, repr=False, alias="psc_chapters.chapters")
+    chapters: list[Chapter] | None = Field(
+        None,
+        repr=False,
+        alias="psc_chapters.chapters",
+        validation_alias=AliasChoices(AliasPath("psc_chapters", "chapters"), "psc_chapters.chapters"),
+    )
     shownotes: str | None = Field(None, repr=False)
     content: list[Content] | None = Field(None, repr=False, alias="content", exclude=True)
 
@@ -124,4 +143,28 @@ class Episode(BaseEpisode):
         return [field.title for field in cls.model_fields.values() if field.title]
 
 
+# Compact stand-in for an episode while it is checked, queued, and downloaded. The full model with its links,
+# chapters, and shownotes is only kept around when needed to write the .info.json file.
+@dataclass(slots=True, frozen=True)
+class EpisodeRecord:
+    guid: str
+    title: str
+    published_time: datetime
+    enclosure: Link
+    full: BaseEpisode | None = None
+
+    def __str__(self) -> str:
+        return f"{self.published_time.strftime(DEFAULT_DATETIME_FORMAT)} {self.title}"
+
+    def __rich__(self) -> RenderableType:
+        return Text(f"{self.published_time:%Y-%m-%d} {self.title}", spans=[Span(0, 10, "dim")], end="")
+
+    def materialize(self) -> BaseEpisode:
+        if self.full:
+            return self.full
+        return BaseEpisode.model_validate(
+            {"id": self.guid, "title": self.title, "published_parsed": self.published_time, "links": [self.enclosure]}
+        )
+
+
 EpisodeOrFallback = Annotated[Episode | BaseEpisode | None, FallbackToNone]
@@ -6,16 +6,18 @@ from typing import TYPE_CHECKING, Iterator
 from urllib.parse import urlparse
 from xml.sax import SAXParseException
 
-import feedparser
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
 
 from podcast_archiver.constants import MAX_TITLE_LENGTH
-from podcast_archiver.exceptions import NotModified, NotSupported
+from podcast_archiver.enums import Stage
+from podcast_archiver.exceptions import MalformedFeed, NotModified, NotSupported
 from podcast_archiver.logging import logger, rprint
-from podcast_archiver.models.episode import EpisodeOrFallback
+from podcast_archiver.metrics import metrics
+from podcast_archiver.models.episode import Episode, EpisodeOrFallback
 from podcast_archiver.models.field_types import LenientDatetime
 from podcast_archiver.models.misc import Link
-from podcast_archiver.session import session
+from podcast_archiver.parsing import parser_pool
+from podcast_archiver.timing import stage_timer
 from podcast_archiver.utils import truncate
 
 if TYPE_CHECKING:
@@ -31,7 +33,8 @@ class Feed:
     _page: FeedPage | None = field(init=False)
 
     def __post_init__(self) -> None:
-        self._page = FeedPage.from_url(self.url, known_info=self.known_info)
+        with stage_timer.feed(self.url):
+            self._page = FeedPage.from_url(self.url, known_info=self.known_info)
         self.info = self._page.feed
         logger.debug("Loaded feed for '%s' by %s from %s", self.info.title, self.info.author, self.url)
 
@@ -62,7 +65,8 @@ class Feed:
         for link in self._page.feed.links:
             if link.rel == "next" and link.href:
                 logger.debug("Found next page at %s", link.href)
-                self._page = FeedPage.from_url(link.href)
+                with stage_timer.feed(self.url):
+                    self._page = FeedPage.from_url(link.href)
                 return
         logger.debug("Page was the last")
         self._page = None
@@ -111,8 +115,8 @@ class FeedPage(BaseModel):
 
     @classmethod
     def parse_feed(cls, source: str | bytes, alt_url: str | None, retry: bool = False) -> FeedPage:
-        feedobj = feedparser.parse(source)
-        obj = cls.model_validate(feedobj)
+        with stage_timer.measure(Stage.PARSE):
+            obj = parser_pool.run(parse_page, source)
         if not obj.bozo:
             return obj
 
@@ -121,22 +125,26 @@ class FeedPage(BaseModel):
             return cls.from_url(fallback_url, retry=True)
 
         url = source if isinstance(source, str) and not alt_url else alt_url
-        if (exc := obj.bozo_exception) and isinstance(exc, SAXParseException):
+        if (exc := obj.bozo_exception) and isinstance(exc, MalformedFeed):
             rprint(f"Feed content is not well-formed for {url}", style="warning")
-            rprint(f"Attemping processing but here be dragons ({exc.getMessage()})", style="warninghint")
+            rprint(f"Attemping processing but here be dragons ({exc})", style="warninghint")
 
         raise NotSupported(f"Content at {url} is not supported")
 
     @classmethod
     def from_url(cls, url: str, *, known_info: FeedInfo | None = None, retry: bool = False) -> FeedPage:
+        from podcast_archiver.session import session
+
         parsed = urlparse(url)
         if parsed.scheme == "file":
             return cls.parse_feed(parsed.path, None)
 
+        with stage_timer.measure(Stage.FETCH):
+            response = session.get_and_raise(url, last_modified=known_info.last_modified if known_info else None)
+        metrics.feed_responses.inc(status=str(response.status_code))
         if not known_info:
-            return cls.from_response(session.get_and_raise(url), alt_url=url, retry=retry)
+            return cls.from_response(response, alt_url=url, retry=retry)
 
-        response = session.get_and_raise(url, last_modified=known_info.last_modified)
         if response.status_code == HTTPStatus.NOT_MODIFIED:
             logger.debug("Server reported 'not modified' from %s, skipping fetch.", known_info.last_modified)
             raise NotModified(known_info)
@@ -153,3 +161,17 @@ class FeedPage(BaseModel):
         instance = cls.parse_feed(response.content, alt_url=alt_url, retry=retry)
         instance.feed.last_modified = response.headers.get("Last-Modified")
         return instance
+
+
+def parse_page(source: str | bytes) -> FeedPage:
+    # Runs in a worker process when parsing in parallel, so the result must be picklable and is kept small.
+    import feedparser
+
+    page = FeedPage.model_validate(feedparser.parse(source))
+    if isinstance(exc := page.bozo_exception, SAXParseException):
+        page.bozo_exception = MalformedFeed(exc.getMessage())
+    for episode in page.episodes:
+        if isinstance(episode, Episode):
+            # Only needed to populate the shownotes, and excluded from serialization.
+            episode.content = None
+    return page
@@ -15,9 +15,14 @@ from pydantic.functional_validators import BeforeValidator
 from podcast_archiver import compat
 
 
-def parse_from_struct_time(value: struct_time | datetime) -> datetime:
+def parse_from_struct_time(value: struct_time | datetime | str | None) -> datetime | None:
+    if value is None:
+        # Unparseable dates are None, leave rejecting them to the datetime validation.
+        return None
     if isinstance(value, struct_time):
         value = datetime.fromtimestamp(mktime(value))
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value)
     if not value.tzinfo:
         value = value.replace(tzinfo=compat.UTC)
     return value
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar
+
+from podcast_archiver.logging import logger
+
+SourceT = TypeVar("SourceT")
+ResultT = TypeVar("ResultT")
+
+
+class ParserPool:
+    processes: int
+    executor: ProcessPoolExecutor | None
+
+    __slots__ = ("processes", "executor")
+
+    def __init__(self) -> None:
+        self.processes = 0
+        self.executor = None
+
+    def configure(self, processes: int) -> None:
+        if processes == self.processes:
+            return
+        self.shutdown()
+        self.processes = max(processes, 0)
+        if self.processes:
+            logger.debug("Parsing feeds in %s processes", self.processes)
+            # Forking a process that is already running threads is unsafe, start fresh interpreters instead.
+            self.executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def run(self, func: Callable[[SourceT], ResultT], source: SourceT) -> ResultT:
+        if not self.executor:
+            return func(source)
+        return self.executor.submit(func, source).result()
+
+    def shutdown(self) -> None:
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.processes = 0
+        self.executor = None
+
+
+parser_pool = ParserPool()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from requests import RequestException
+
+from podcast_archiver.backoff import backoff
+from podcast_archiver.constants import REQUESTS_TIMEOUT, THROTTLING_STATUS_CODES
+from podcast_archiver.logging import logger
+from podcast_archiver.session import session
+
+if TYPE_CHECKING:
+    from requests import Response
+
+content_range_re = re.compile(r"bytes\s+\d+-\d+/(?P<length>\d+)")
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    url: str
+    length: int | None = None
+    etag: str | None = None
+
+    @classmethod
+    def from_response(cls, response: Response) -> ProbeResult:
+        length = None
+        if response.status_code == HTTPStatus.PARTIAL_CONTENT:
+            if match := content_range_re.match(response.headers.get("Content-Range", "")):
+                length = int(match["length"])
+        elif content_length := response.headers.get("Content-Length"):
+            length = int(content_length)
+        return cls(url=response.url, length=length, etag=response.headers.get("ETag"))
+
+
+def probe_enclosure(url: str) -> ProbeResult | None:
+    if backoff.remaining(url):
+        logger.debug("Not probing %s while its host is paused", url)
+        return None
+    try:
+        response = session.head(url, allow_redirects=True, timeout=REQUESTS_TIMEOUT)
+        session.track_backoff(url, response)
+        if response.status_code in THROTTLING_STATUS_CODES:
+            return None
+        if not response.ok or "Content-Length" not in response.headers:
+            # Not all servers answer HEAD requests properly, retry with a request for a single byte.
+            with session.get(
+                url, headers={"Range": "bytes=0-0"}, stream=True, allow_redirects=True, timeout=REQUESTS_TIMEOUT
+            ) as response:
+                session.track_backoff(url, response)
+                response.raise_for_status()
+                return ProbeResult.from_response(response)
+        return ProbeResult.from_response(response)
+    except (RequestException, ValueError) as exc:
+        logger.debug("Failed to probe %s", url, exc_info=exc)
+        return None
@@ -1,84 +1,323 @@
 from __future__ import annotations
 
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from threading import Event
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Iterator
+from urllib.parse import urlparse
 
+from pydantic import ValidationError
 from rich.console import Group, NewLine
 
 from podcast_archiver import constants
+from podcast_archiver.backoff import backoff
+from podcast_archiver.concurrency import ConcurrencyController
 from podcast_archiver.config import Settings
 from podcast_archiver.console import console
 from podcast_archiver.database import get_database
+from podcast_archiver.dns import dns_cache
 from podcast_archiver.download import DownloadJob
-from podcast_archiver.enums import DownloadResult, QueueCompletionType
+from podcast_archiver.enums import DownloadResult, QueueCompletionType, ReportEvent, Stage
+from podcast_archiver.exceptions import MissingDownloadUrl
 from podcast_archiver.logging import logger, rprint
+from podcast_archiver.metrics import metrics
+from podcast_archiver.models.episode import Episode
 from podcast_archiver.models.feed import Feed, FeedInfo
+from podcast_archiver.parsing import parser_pool
+from podcast_archiver.probe import probe_enclosure
+from podcast_archiver.profiling import ProfiledThreadPoolExecutor
+from podcast_archiver.report import run_report
+from podcast_archiver.scheduler import DownloadScheduler
+from podcast_archiver.session import session
+from podcast_archiver.timing import stage_timer
 from podcast_archiver.types import (
+    EnqueuedFeed,
     EpisodeResult,
-    EpisodeResultsList,
     FutureEpisodeResult,
     ProcessingResult,
 )
 from podcast_archiver.urls import registry
-from podcast_archiver.utils import FilenameFormatter, handle_feed_request, sanitize_url
-from podcast_archiver.utils.pretty_printing import PrettyPrintEpisodeRange
+from podcast_archiver.utils import FilenameFormatter, handle_feed_request, link_or_copy, sanitize_url
+from podcast_archiver.utils.listing import DirectoryListing
 from podcast_archiver.utils.progress import progress_manager
 
 if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
     from pathlib import Path
 
-    from podcast_archiver.database import BaseDatabase
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.database import BaseDatabase, EpisodeInDb, RetryInDb
+    from podcast_archiver.models.episode import BaseEpisode, EpisodeRecord
+    from podcast_archiver.probe import ProbeResult
 
 
 class FeedProcessor:
     settings: Settings
     database: BaseDatabase
     filename_formatter: FilenameFormatter
+    directory_listing: DirectoryListing
 
     pool_executor: ThreadPoolExecutor
+    probe_executor: ThreadPoolExecutor
+    scheduler: DownloadScheduler
     stop_event: Event
 
     known_feeds: dict[str, FeedInfo]
+    retrying: set[str]
 
-    __slots__ = ("settings", "database", "filename_formatter", "pool_executor", "stop_event", "known_feeds")
+    __slots__ = (
+        "settings",
+        "database",
+        "filename_formatter",
+        "directory_listing",
+        "pool_executor",
+        "probe_executor",
+        "scheduler",
+        "stop_event",
+        "known_feeds",
+        "retrying",
+    )
 
     def __init__(self, settings: Settings | None = None, database: BaseDatabase | None = None) -> None:
         self.settings = settings or Settings()
         database_path = self.settings.database or (self.settings.config.parent if self.settings.config else None)
         self.database = database or get_database(database_path, ignore_existing=self.settings.ignore_database)
         self.filename_formatter = FilenameFormatter(self.settings)
-        self.pool_executor = ThreadPoolExecutor(max_workers=self.settings.concurrency)
+        self.directory_listing = DirectoryListing()
+        session.configure(http2=self.settings.http2, max_connections=self.settings.concurrency)
+        dns_cache.configure(ttl=self.settings.dns_cache_ttl)
+        parser_pool.configure(self.settings.parse_processes)
+        progress_manager.configure(aggregate=self.settings.aggregate_progress)
+        self.pool_executor = ProfiledThreadPoolExecutor(max_workers=self.settings.concurrency)
+        # Shared by all download workers that prepare batches of jobs, threads are only started when probing.
+        self.probe_executor = ProfiledThreadPoolExecutor(max_workers=constants.PROBE_BATCH_SIZE)
+        self.scheduler = DownloadScheduler(
+            self.pool_executor,
+            max_workers=self.settings.concurrency,
+            order=self.settings.download_order,
+            weights=self.settings.feed_weights,
+            controller=(
+                ConcurrencyController(self.settings.concurrency, initial=constants.DEFAULT_CONCURRENCY)
+                if self.settings.adaptive_concurrency
+                else None
+            ),
+        )
+        metrics.queued_downloads.set_function(self.scheduler.__len__)
+        metrics.workers.set_function(lambda: self.scheduler.active_workers)
         self.stop_event = Event()
         self.known_feeds = {}
+        self.retrying = set()
 
     def process(self, url: str, dry_run: bool = False) -> ProcessingResult:
+        return self.process_many([url], dry_run=dry_run)[0]
+
+    def process_many(self, urls: Iterable[str], dry_run: bool = False) -> list[ProcessingResult]:
+        results: list[ProcessingResult] = []
+        pending: list[EnqueuedFeed] = []
+        # Files may have changed on disk since the previous run in continuous mode.
+        self.directory_listing.clear()
+        try:
+            if not dry_run and (enqueued := self.enqueue_retries()):
+                pending.append(enqueued)
+
+            urls = list(urls)
+            if self.settings.warm_up:
+                self.warm_up(urls)
+
+            # Feeds on hosts that asked us to back off are tried again after all other feeds are done.
+            deferred = urls
+            for attempt in range(constants.MAX_RATE_LIMITED_ATTEMPTS):
+                if not (deferred := self._process_round(deferred, pending, results, dry_run=dry_run, wait=attempt > 0)):
+                    break
+                pending = []
+
+            for url in deferred:
+                rprint(f"✘ Giving up on rate-limited feed {sanitize_url(url)}", style="error")
+                results.append(ProcessingResult(feed=None, tombstone=QueueCompletionType.FAILED))
+        finally:
+            progress_manager.stop()
+        return results
+
+    def _process_round(
+        self,
+        urls: list[str],
+        pending: list[EnqueuedFeed],
+        results: list[ProcessingResult],
+        *,
+        dry_run: bool,
+        wait: bool,
+    ) -> list[str]:
+        deferred: list[str] = []
+        enqueued = None
+        # Enqueue the downloads of all feeds first so the scheduler can prioritize across them.
+        for url, prefetched in zip(urls, self._prefetch(urls), strict=True):
+            if wait:
+                backoff.wait(url)
+            elif delay := backoff.remaining(url):
+                rprint(
+                    f"⏲ Host of {sanitize_url(url)} asked to back off for {delay:.0f} seconds, trying again later",
+                    style="warning",
+                )
+                deferred.append(url)
+                continue
+
+            enqueued = self.enqueue(url, dry_run=dry_run, prefetched=prefetched)
+            if enqueued.tombstone == QueueCompletionType.FAILED and backoff.remaining(url):
+                deferred.append(url)
+            elif enqueued.is_pending:
+                pending.append(enqueued)
+            else:
+                results.append(self.complete(enqueued))
+
+        for enqueued_feed in pending:
+            results.append(self.complete(enqueued_feed, show_title=enqueued_feed is not enqueued))
+        return deferred
+
+    def warm_up(self, urls: Iterable[str]) -> None:
+        origins: dict[tuple[str, str | None, int | None], str] = {}
+        for url in urls:
+            parsed = urlparse(url)
+            origins.setdefault((parsed.scheme, parsed.hostname, parsed.port), url)
+
+        # Only as many hosts as the session keeps connection pools for are connected to, the rest is only resolved.
+        connect = [idx < constants.MAX_CONNECTION_POOLS for idx in range(len(origins))]
+        with self._status(msg := f"Warming up connections to {len(origins)} hosts ..."):
+            logger.info(msg)
+            warmed = sum(self.probe_executor.map(self._warm_up, origins.values(), connect))
+        logger.debug("Warmed up %s of %s hosts", warmed, len(origins))
+
+    @staticmethod
+    def _warm_up(url: str, connect: bool) -> bool:
+        parsed = urlparse(url)
+        if not parsed.hostname or not dns_cache.resolve(
+            parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80)
+        ):
+            return False
+        if not connect:
+            return True
+        try:
+            session.preconnect(url)
+        except Exception as exc:
+            logger.debug("Failed to connect to %s", parsed.hostname, exc_info=exc)
+            return False
+        return True
+
+    def enqueue(self, url: str, dry_run: bool = False, prefetched: Future[Feed | None] | None = None) -> EnqueuedFeed:
         msg = f"Loading feed from '{sanitize_url(url)}' ..."
         logger.info(msg)
-        with console.status(msg):
-            feed = self.load_feed(url)
+        with self._status(msg):
+            feed = self.load_feed(url, prefetched=prefetched)
         if not feed:
-            return ProcessingResult(feed=None, tombstone=QueueCompletionType.FAILED)
+            run_report.emit(ReportEvent.FEED_FAILED, feed=sanitize_url(url))
+            return EnqueuedFeed(feed=None, tombstone=QueueCompletionType.FAILED, exhausted=True)
+
+        run_report.emit(ReportEvent.FEED_LOADED, feed=sanitize_url(feed.url), title=feed.info.title)
+        stage_timer.set_title(feed.url, feed.info.title)
 
         action = "Dry-run" if dry_run else "Processing"
         rprint(f"→ {action}: {feed.info.title}", style="title", markup=False, highlight=False)
-        with progress_manager:
-            result = self.process_feed(feed=feed, dry_run=dry_run)
+        return self.enqueue_feed(feed, dry_run=dry_run)
+
+    def complete(self, enqueued: EnqueuedFeed, show_title: bool = False) -> ProcessingResult:
+        if enqueued.tombstone == QueueCompletionType.FAILED:
+            return ProcessingResult(feed=None, tombstone=enqueued.tombstone)
+
+        if show_title:
+            rprint(f"→ Downloading: {enqueued.title}", style="title", markup=False, highlight=False)
+        result = self.complete_feed(enqueued)
+        run_report.emit(
+            ReportEvent.FEED_COMPLETED,
+            feed=sanitize_url(enqueued.feed.url) if enqueued.feed else None,
+            title=enqueued.title,
+            result=result.tombstone.name.lower(),
+            success=result.success,
+            failures=result.failures,
+        )
         rprint(result, end="\n\n")
         return result
 
-    def load_feed(self, url: str) -> Feed | None:
-        resolved_url = registry.get_feed(url) or url
-        with handle_feed_request(resolved_url):
-            feed = Feed(url=resolved_url, known_info=self.known_feeds.get(url))
+    def enqueue_retries(self) -> EnqueuedFeed | None:
+        self.retrying = set()
+        if self.settings.ignore_database:
+            return None
+
+        due: list[RetryInDb] = []
+        for retry in self.database.iter_retries():
+            if retry.attempts >= constants.MAX_RETRY_ATTEMPTS:
+                logger.info("Giving up on retrying %s after %s attempts", retry.guid, retry.attempts)
+                self.database.remove_retry(retry.guid)
+                continue
+            # Episodes with a pending retry are skipped when processing their feed, until the retry is due.
+            self.retrying.add(retry.guid)
+            if retry.is_due:
+                due.append(retry)
+        if not due:
+            return None
+
+        enqueued = EnqueuedFeed(feed=None, title="Retrying failed downloads", tombstone=QueueCompletionType.COMPLETED)
+        rprint(f"→ Retrying {len(due)} failed downloads", style="title", markup=False, highlight=False)
+        self.scheduler.add_source(
+            self._iter_retry_jobs(due, enqueued),
+            feed=constants.RETRY_QUEUE_NAME,
+            on_submit=partial(self._track_download, enqueued, constants.RETRY_QUEUE_NAME),
+        )
+        return enqueued
+
+    def _iter_retry_jobs(self, retries: list[RetryInDb], enqueued: EnqueuedFeed) -> Iterator[DownloadJob]:
+        try:
+            for retry in retries:
+                try:
+                    episode = Episode.model_validate_json(retry.episode)
+                except (ValidationError, MissingDownloadUrl) as exc:
+                    logger.debug("Dropping invalid retry entry for %s", retry.guid, exc_info=exc)
+                    self.database.remove_retry(retry.guid)
+                    continue
+                job = self._make_job(episode.to_record(keep_full=self.settings.write_info_json), target=retry.target)
+                job.feed = retry.feed
+                yield from self._prepare_jobs([job], enqueued)
+        finally:
+            enqueued.close()
+
+    @staticmethod
+    def _status(msg: str) -> AbstractContextManager[object]:
+        # Rich does not support more than one live display at a time
+        return nullcontext() if progress_manager.is_started else console.status(msg)
+
+    def load_feed(self, url: str, prefetched: Future[Feed | None] | None = None) -> Feed | None:
+        with handle_feed_request(url):
+            feed = (prefetched and prefetched.result()) or self._fetch_feed(url)
             if not feed or not hasattr(feed, "info"):
                 return None
             self.known_feeds[url] = feed.info
             return feed
 
-    def _does_already_exist(self, episode: BaseEpisode, *, target: Path) -> bool:
-        if not (existing := self.database.exists(episode)):
+    def _fetch_feed(self, url: str) -> Feed:
+        start = perf_counter()
+        resolved_url = registry.get_feed(url) or url
+        stage_timer.add(Stage.RESOLVE, perf_counter() - start, feed=resolved_url)
+        return Feed(url=resolved_url, known_info=self.known_feeds.get(url))
+
+    def _prefetch_feed(self, url: str) -> Feed | None:
+        # Feeds on paused hosts are left to the main thread, which defers them.
+        return None if backoff.remaining(url) else self._fetch_feed(url)
+
+    def _prefetch(self, urls: list[str]) -> Iterator[Future[Feed | None] | None]:
+        # Fetch and parse a few feeds ahead of the one being enqueued, so that they are parsed in parallel.
+        if not (ahead := parser_pool.processes * 2):
+            yield from (None for _ in urls)
+            return
+        window = deque(self.probe_executor.submit(self._prefetch_feed, url) for url in urls[:ahead])
+        for url in urls[ahead:]:
+            yield window.popleft()
+            window.append(self.probe_executor.submit(self._prefetch_feed, url))
+        yield from window
+
+    def _does_already_exist(self, episode: EpisodeRecord, *, target: Path) -> bool:
+        with stage_timer.measure(Stage.DATABASE):
+            existing = self.database.exists(episode)
+        if not existing:
             # NOTE on backwards-compatibility: if the episode is not in the DB we'd normally
             # download it again outright. This might cause a complete replacement of
             # episodes on disk for existing users who either used pre-v1.4 until now or
@@ -88,7 +327,7 @@ class FeedProcessor:
             # the DB (or ignored via `ignore_database`). Only if the episode is indeed
             # in the DB, we do the additional checks to possibly re-download an episode
             # if it was republished/changed.
-            if target.exists():
+            if self.directory_listing.exists(target):
                 logger.debug("Episode '%s': not in db but on disk", episode)
                 return True
             logger.debug("Episode '%s': not in db", episode)
@@ -115,62 +354,195 @@ class FeedProcessor:
         logger.debug("Episode '%s': already in database.", episode)
         return True
 
+    def _is_unchanged_on_server(self, episode: EpisodeRecord, probe: ProbeResult) -> bool:
+        if not (existing := self.database.exists(episode)):
+            return False
+        if existing.etag and probe.etag == existing.etag:
+            logger.debug("Episode '%s': ETag unchanged on server", episode)
+            return True
+        if existing.size and probe.length == existing.size:
+            logger.debug("Episode '%s': size unchanged on server", episode)
+            return True
+        return False
+
+    @property
+    def _batch_size(self) -> int:
+        return constants.PROBE_BATCH_SIZE if self.settings.probe_enclosures else 1
+
     def process_feed(self, feed: Feed, dry_run: bool) -> ProcessingResult:
-        tombstone = QueueCompletionType.COMPLETED
-        results: EpisodeResultsList = []
-        with PrettyPrintEpisodeRange() as pretty_range:
+        return self.complete_feed(self.enqueue_feed(feed, dry_run=dry_run))
+
+    def enqueue_feed(self, feed: Feed, dry_run: bool) -> EnqueuedFeed:
+        enqueued = EnqueuedFeed(
+            feed=feed,
+            title=feed.info.title,
+            tombstone=QueueCompletionType.COMPLETED if not dry_run else QueueCompletionType.DRY_RUN,
+        )
+        self.scheduler.add_source(
+            self._iter_jobs(feed, enqueued, dry_run=dry_run),
+            feed=feed.url,
+            on_submit=partial(self._track_download, enqueued, feed.url),
+        )
+        return enqueued
+
+    def complete_feed(self, enqueued: EnqueuedFeed) -> ProcessingResult:
+        success, failures = self._handle_results(enqueued, feed=enqueued.feed.url if enqueued.feed else None)
+        enqueued.episode_range.show()
+        return ProcessingResult(
+            feed=enqueued.feed,
+            success=success,
+            failures=failures,
+            tombstone=enqueued.tombstone,
+        )
+
+    def _iter_jobs(self, feed: Feed, enqueued: EnqueuedFeed, dry_run: bool) -> Iterator[DownloadJob]:
+        # Consumed lazily by the scheduler: episodes are only checked and turned into download jobs once there is
+        # room for them in the download queue.
+        pending: list[DownloadJob] = []
+        try:
             for idx, episode in enumerate(feed.episodes, 1):
                 if episode is None:
                     logger.debug("Skipping invalid episode at idx %s", idx)
                     continue
-                enqueued = self._enqueue_episode(episode, feed.info, dry_run=dry_run)
-                exists = isinstance(enqueued, EpisodeResult) and enqueued.result == DownloadResult.ALREADY_EXISTS
-                pretty_range.update(exists, episode)
-
-                if not dry_run and not exists:
-                    results.append(enqueued)
+                with stage_timer.feed(feed.url):
+                    job = self._enqueue_episode(episode, feed.info, dry_run=dry_run)
+                # Queued downloads are reported individually as they complete, and are left out of the overview.
+                if isinstance(job, DownloadJob):
+                    job.feed = feed.url
+                    run_report.emit(ReportEvent.EPISODE_QUEUED, feed=sanitize_url(feed.url), **job.report_fields)
+                    pending.append(job)
+                else:
+                    enqueued.episode_range.update(job.result == DownloadResult.ALREADY_EXISTS, job.episode)
+                if len(pending) >= self._batch_size:
+                    yield from self._prepare_jobs(pending, enqueued)
+                    pending = []
 
                 if (max_count := self.settings.maximum_episode_count) and idx == max_count:
                     logger.debug("Reached requested maximum episode count of %s", max_count)
-                    tombstone = QueueCompletionType.MAX_EPISODES
+                    if not dry_run:
+                        enqueued.tombstone = QueueCompletionType.MAX_EPISODES
                     break
 
-        success, failures = self._handle_results(results)
-        return ProcessingResult(
-            feed=feed,
-            success=success,
-            failures=failures,
-            tombstone=tombstone if not dry_run else QueueCompletionType.DRY_RUN,
-        )
+            yield from self._prepare_jobs(pending, enqueued)
+        finally:
+            enqueued.close()
 
-    def _enqueue_episode(self, episode: BaseEpisode, feed_info: FeedInfo, dry_run: bool) -> FutureEpisodeResult:
+    def _enqueue_episode(self, episode: BaseEpisode, feed_info: FeedInfo, dry_run: bool) -> EpisodeResult | DownloadJob:
         target = self.filename_formatter.format(episode=episode, feed_info=feed_info)
-        if self._does_already_exist(episode, target=target):
+        record = episode.to_record(keep_full=self.settings.write_info_json)
+        if self._does_already_exist(record, target=target):
             result = DownloadResult.ALREADY_EXISTS
-            return EpisodeResult(episode, result, is_eager=True)
+            return EpisodeResult(record, result, is_eager=True)
 
+        if dry_run or episode.guid in self.retrying:
+            return EpisodeResult(record, DownloadResult.MISSING, is_eager=True)
         logger.debug("Queueing download for %r", episode)
-        if dry_run:
-            return EpisodeResult(episode, DownloadResult.MISSING, is_eager=True)
-        return self.pool_executor.submit(
-            DownloadJob(
-                episode,
-                target=target,
-                max_download_bytes=constants.DEBUG_PARTIAL_SIZE if self.settings.debug_partial else None,
-                add_info_json=self.settings.write_info_json,
-                stop_event=self.stop_event,
-            )
+        return self._make_job(record, target=target)
+
+    def _make_job(self, record: EpisodeRecord, *, target: Path) -> DownloadJob:
+        return DownloadJob(
+            record,
+            target=target,
+            max_download_bytes=constants.DEBUG_PARTIAL_SIZE if self.settings.debug_partial else None,
+            add_info_json=self.settings.write_info_json,
+            stop_event=self.stop_event,
+            duplicate=self._find_duplicate(record, target=target),
+            on_receive=self.scheduler.controller.receive if self.scheduler.controller else None,
         )
 
-    def _handle_results(self, episode_results: EpisodeResultsList) -> tuple[int, int]:
+    def _probe_jobs(self, jobs: list[DownloadJob]) -> tuple[list[DownloadJob], list[EpisodeResult]]:
+        remaining: list[DownloadJob] = []
+        unchanged: list[EpisodeResult] = []
+        probes = list(self.probe_executor.map(probe_enclosure, (job.episode.enclosure.href for job in jobs)))
+
+        for job, probe in zip(jobs, probes, strict=True):
+            job.probe = probe
+            if probe and self._is_unchanged_on_server(job.episode, probe):
+                unchanged.append(EpisodeResult(job.episode, DownloadResult.ALREADY_EXISTS, is_eager=True))
+            else:
+                remaining.append(job)
+        return remaining, unchanged
+
+    def _prepare_jobs(self, jobs: list[DownloadJob], enqueued: EnqueuedFeed) -> list[DownloadJob]:
+        if jobs and self.settings.probe_enclosures:
+            jobs, unchanged = self._probe_jobs(jobs)
+            for result in unchanged:
+                enqueued.put(result)
+        if jobs:
+            progress_manager.start()
+        return jobs
+
+    def _find_duplicate(
+        self, episode: EpisodeRecord, *, target: Path, checksum: str | None = None
+    ) -> EpisodeInDb | None:
+        if not self.settings.deduplicate:
+            return None
+        duplicate = self.database.find_duplicate(episode, checksum=checksum)
+        if not duplicate or not duplicate.path or duplicate.path == target.absolute():
+            return None
+        logger.debug("Episode '%s': identical to %s", episode, duplicate.path)
+        return duplicate
+
+    def _deduplicate(self, episode_result: EpisodeResult) -> None:
+        target, checksum = episode_result.target, episode_result.checksum
+        if episode_result.result != DownloadResult.COMPLETED_SUCCESSFULLY or not (target and checksum):
+            return
+        duplicate = self._find_duplicate(episode_result.episode, target=target, checksum=checksum)
+        if duplicate and duplicate.path:
+            logger.info("Replacing %s with link to identical %s", target, duplicate.path)
+            link_or_copy(duplicate.path, target)
+
+    def _track_download(
+        self, enqueued: EnqueuedFeed, feed: str, job: DownloadJob, future: Future[EpisodeResult]
+    ) -> None:
+        # Record downloads as soon as they complete so they are not fetched again should the process be killed.
+        future.add_done_callback(partial(self._record_download, feed, job))
+        enqueued.put(future)
+
+    def _record_download(self, feed: str, job: DownloadJob, future: Future[EpisodeResult]) -> None:
+        if future.cancelled():
+            return
+        # Runs as a done callback, where exceptions would otherwise be swallowed by the future.
+        try:
+            with stage_timer.feed(job.feed):
+                if not future.exception() and (result := future.result()).result in DownloadResult.successful():
+                    self._record_result(result, feed=job.feed)
+                    return
+                with stage_timer.measure(Stage.DATABASE):
+                    retry = self.database.add_retry(job.episode, feed=feed, target=job.target)
+            if retry:
+                logger.info("Will retry %s after %s (attempt %s)", job.episode, retry.next_attempt, retry.attempts)
+        except Exception as exc:
+            logger.error("Failed to record download of %s: %s", job.episode, exc)
+            logger.debug("Exception while recording download", exc_info=exc)
+
+    def _record_result(self, episode_result: EpisodeResult, *, feed: str | None = None) -> None:
+        if episode_result.result not in DownloadResult.successful():
+            return
+        self._deduplicate(episode_result)
+        if episode_result.target:
+            self.directory_listing.add(episode_result.target)
+        with stage_timer.measure(Stage.DATABASE):
+            self.database.add(
+                episode_result.episode,
+                checksum=episode_result.checksum,
+                path=episode_result.target,
+                etag=episode_result.etag,
+                feed=feed,
+            )
+
+    def _handle_results(
+        self, episode_results: Iterable[FutureEpisodeResult], *, feed: str | None = None
+    ) -> tuple[int, int]:
         failures = success = 0
         for episode_result in episode_results:
             if isinstance(episode_result, Future):
                 episode_result = episode_result.result()
+            else:
+                self._record_result(episode_result, feed=feed)
 
             if episode_result.result in DownloadResult.successful():
                 success += 1
-                self.database.add(episode_result.episode)
             elif not episode_result.is_eager:
                 failures += 1
 
@@ -180,6 +552,10 @@ class FeedProcessor:
     def shutdown(self) -> None:
         if not self.stop_event.is_set():
             self.stop_event.set()
+            self.scheduler.cancel()
             self.pool_executor.shutdown(cancel_futures=True)
+            self.probe_executor.shutdown(cancel_futures=True)
+            parser_pool.shutdown()
+            dns_cache.uninstall()
 
             logger.debug("Completed processor shutdown")
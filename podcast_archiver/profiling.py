@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, ClassVar, Iterator, ParamSpec, TypeVar
+
+from podcast_archiver import compat, constants
+from podcast_archiver.logging import logger, rprint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from rich.console import RenderableType
+
+ParamsT = ParamSpec("ParamsT")
+ResultT = TypeVar("ResultT")
+
+
+# Profiles runs including the download workers. Before Python 3.12, profilers only cover the thread they were enabled
+# in, so tasks of a ProfiledThreadPoolExecutor are profiled in their worker thread while a run is profiled.
+class RunProfiler:
+    active: ClassVar[RunProfiler | None] = None
+
+    path: Path
+    _lock: Lock
+    _local: threading.local
+    _main: cProfile.Profile
+    _threads: list[cProfile.Profile]
+
+    __slots__ = ("path", "_lock", "_local", "_main", "_threads")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        self._main = cProfile.Profile()
+        self._threads = []
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        # Every run gets its own stats
+        self._reset()
+        if not compat.PROFILES_ALL_THREADS:
+            RunProfiler.active = self
+        self._main.enable()
+        try:
+            yield
+        finally:
+            self._main.disable()
+            RunProfiler.active = None
+            self.dump()
+
+    @contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        # Worker threads outlive a run, so their profiler is only enabled while running a task of this run.
+        if getattr(self._local, "enabled", False):
+            yield
+            return
+        if (profile := getattr(self._local, "profile", None)) is None:
+            profile = self._local.profile = cProfile.Profile()
+            with self._lock:
+                self._threads.append(profile)
+        self._local.enabled = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.enabled = False
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            threads = list(self._threads)
+        for profile in threads:
+            stats.add(profile)
+        return stats
+
+    def dump(self) -> None:
+        stats = self.stats()
+        stats.dump_stats(self.path)
+        logger.info("Wrote profile of %s threads to %s", len(self._threads) + 1, self.path)
+        rprint(self.render_summary(stats), end="\n\n")
+
+    @staticmethod
+    def render_summary(stats: pstats.Stats, limit: int = constants.PROFILE_SUMMARY_ENTRIES) -> RenderableType:
+        from rich.table import Table
+
+        table = Table(
+            "Function",
+            "Calls",
+            "Own time",
+            "Total time",
+            title=f"Top {limit} functions by own time",
+            title_justify="left",
+        )
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)  # type: ignore[attr-defined]
+        for (filename, line, name), (_, calls, own, total, _) in entries[:limit]:
+            location = f"{filename}:{line}({name})" if line else name
+            table.add_row(location, str(calls), f"{own:.3f}s", f"{total:.3f}s")
+        return table
+
+
+def _profiled(fn: Callable[ParamsT, ResultT], /, *args: ParamsT.args, **kwargs: ParamsT.kwargs) -> ResultT:
+    if (profiler := RunProfiler.active) is None:
+        return fn(*args, **kwargs)
+    with profiler.profile_thread():
+        return fn(*args, **kwargs)
+
+
+class ProfiledThreadPoolExecutor(ThreadPoolExecutor):
+    def submit(
+        self, fn: Callable[ParamsT, ResultT], /, *args: ParamsT.args, **kwargs: ParamsT.kwargs
+    ) -> Future[ResultT]:
+        return super().submit(_profiled, fn, *args, **kwargs)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import IO, TYPE_CHECKING, Any
+
+from podcast_archiver import compat
+from podcast_archiver.console import console
+from podcast_archiver.logging import logger
+from podcast_archiver.utils import sanitize_url
+
+if TYPE_CHECKING:
+    from podcast_archiver.enums import ReportEvent
+    from podcast_archiver.models.episode import EpisodeRecord
+
+
+def episode_fields(episode: EpisodeRecord) -> dict[str, Any]:
+    return {
+        "guid": episode.guid,
+        "title": episode.title,
+        "published": episode.published_time.isoformat() if episode.published_time else None,
+        "url": sanitize_url(episode.enclosure.href),
+    }
+
+
+# Writes processing events as JSON lines for other tools to consume, one object per line with at least the time and
+# the type of the event.
+class RunReport:
+    _lock: Lock
+    _file: IO[str] | None
+
+    __slots__ = ("_lock", "_file")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._file = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def open(self, target: str) -> None:
+        self.close()
+        if target == "-":
+            # Keep the report on stdout parseable by moving everything else to stderr.
+            console.file = sys.stderr
+            self._file = sys.stdout
+            return
+        path = Path(target).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Appended to, so that continuous mode keeps the events of all runs.
+        self._file = path.open("a", encoding="utf-8")
+        logger.debug("Writing report to %s", path)
+
+    def emit(self, event: ReportEvent, **fields: Any) -> None:
+        if not self._file:
+            return
+        line = json.dumps({"time": datetime.now(compat.UTC).isoformat(), "event": event, **fields}, default=str)
+        with self._lock:
+            if self._file:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is sys.stdout:
+                console.file = None  # type: ignore[assignment]
+            elif self._file:
+                self._file.close()
+            self._file = None
+
+
+run_report = RunReport()
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from podcast_archiver.backoff import backoff, get_host
+from podcast_archiver.enums import DownloadOrder, DownloadResult
+from podcast_archiver.logging import logger
+from podcast_archiver.types import EpisodeResult
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from podcast_archiver.concurrency import ConcurrencyController
+    from podcast_archiver.download import DownloadJob
+
+SortKey = tuple[float, ...]
+Deferred = tuple[float, int, str, "DownloadJob", "Future[EpisodeResult]"]
+
+
+@dataclass(slots=True)
+class _FeedQueue:
+    name: str
+    weight: int
+    credit: int
+    heap: list[tuple[SortKey, int, DownloadJob, Future[EpisodeResult]]] = field(default_factory=list)
+    source: Iterator[DownloadJob] | None = None
+    on_submit: Callable[[DownloadJob, Future[EpisodeResult]], Any] | None = None
+    refilling: bool = False
+
+    @property
+    def is_drained(self) -> bool:
+        return not self.heap and not self.source and not self.refilling
+
+    @property
+    def head_key(self) -> tuple[SortKey, int]:
+        key, seq, *_ = self.heap[0]
+        return key, seq
+
+
+class DownloadScheduler:
+    executor: Executor
+    max_workers: int
+    lookahead: int
+    order: DownloadOrder
+    weights: dict[str, int]
+    controller: ConcurrencyController | None
+
+    _lock: Lock
+    _condition: Condition
+    _queues: dict[str, _FeedQueue]
+    _rotation: deque[str]
+    _deferred: list[Deferred]
+    _counter: Iterator[int]
+    _active_workers: int
+    _waiting: bool
+    _cancelled: bool
+
+    __slots__ = (
+        "executor",
+        "max_workers",
+        "lookahead",
+        "order",
+        "weights",
+        "controller",
+        "_lock",
+        "_condition",
+        "_queues",
+        "_rotation",
+        "_deferred",
+        "_counter",
+        "_active_workers",
+        "_waiting",
+        "_cancelled",
+    )
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_workers: int,
+        order: DownloadOrder = DownloadOrder.ROUND_ROBIN,
+        weights: dict[str, int] | None = None,
+        lookahead: int | None = None,
+        controller: ConcurrencyController | None = None,
+    ) -> None:
+        self.executor = executor
+        self.max_workers = max_workers
+        self.lookahead = lookahead or max_workers
+        self.order = order
+        self.weights = weights or {}
+        self.controller = controller
+        self._lock = Lock()
+        self._condition = Condition(self._lock)
+        self._queues = {}
+        self._rotation = deque()
+        self._deferred = []
+        self._counter = count()
+        self._active_workers = 0
+        self._waiting = False
+        self._cancelled = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(queue.heap) for queue in self._queues.values()) + len(self._deferred)
+
+    def submit(self, job: DownloadJob, *, feed: str) -> Future[EpisodeResult]:
+        future: Future[EpisodeResult] = Future()
+        with self._lock:
+            queue = self._get_queue(feed)
+            heappush(queue.heap, (self._sort_key(job), next(self._counter), job, future))
+            self._condition.notify()
+            self._spawn_workers()
+        return future
+
+    def add_source(
+        self,
+        jobs: Iterable[DownloadJob],
+        *,
+        feed: str,
+        on_submit: Callable[[DownloadJob, Future[EpisodeResult]], Any],
+    ) -> None:
+        with self._lock:
+            queue = self._get_queue(feed)
+            queue.source = iter(jobs)
+            queue.on_submit = on_submit
+        self._refill(queue)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            for queue in self._queues.values():
+                for *_, future in queue.heap:
+                    future.cancel()
+            for *_, job, future in self._deferred:
+                future.set_result(EpisodeResult(job.episode, DownloadResult.ABORTED))
+            self._queues.clear()
+            self._rotation.clear()
+            self._deferred.clear()
+            self._condition.notify_all()
+
+    @property
+    def active_workers(self) -> int:
+        return self._active_workers
+
+    @property
+    def worker_limit(self) -> int:
+        return min(self.controller.limit, self.max_workers) if self.controller else self.max_workers
+
+    def _spawn_workers(self) -> None:
+        while self._active_workers < self.worker_limit and any(queue.heap for queue in self._queues.values()):
+            self._active_workers += 1
+            self.executor.submit(self._work)
+
+    def _get_queue(self, feed: str) -> _FeedQueue:
+        if not (queue := self._queues.get(feed)):
+            weight = max(self.weights.get(feed, 1), 1)
+            queue = self._queues[feed] = _FeedQueue(name=feed, weight=weight, credit=weight)
+            self._rotation.append(feed)
+        return queue
+
+    def _refill(self, queue: _FeedQueue) -> None:
+        # Jobs are only pulled from a source when there is room in its lookahead window, so that the number of
+        # jobs in memory stays proportional to the number of workers rather than to the size of the backlog.
+        with self._lock:
+            if queue.refilling or not queue.source:
+                return
+            queue.refilling = True
+            source = queue.source
+
+        while True:
+            exhausted = self._pull(queue, source)
+            with self._lock:
+                if exhausted:
+                    queue.source = None
+                # Workers that drained the window in the meantime skipped their refill while this one was running.
+                if queue.source and not self._cancelled and len(queue.heap) < self.lookahead:
+                    continue
+                queue.refilling = False
+                if queue.is_drained and self._queues.get(queue.name) is queue:
+                    self._remove_queue(queue)
+                return
+
+    def _pull(self, queue: _FeedQueue, source: Iterator[DownloadJob]) -> bool:
+        try:
+            while not self._cancelled and len(queue.heap) < self.lookahead:
+                if (job := next(source, None)) is None:
+                    return True
+                future = self.submit(job, feed=queue.name)
+                if queue.on_submit:
+                    queue.on_submit(job, future)
+        except Exception as exc:
+            logger.error("Failed to enqueue downloads of %s: %s", queue.name, exc)
+            logger.debug("Exception while enqueuing downloads", exc_info=exc)
+            return True
+        return False
+
+    def _remove_queue(self, queue: _FeedQueue) -> None:
+        del self._queues[queue.name]
+        self._rotation.remove(queue.name)
+
+    def _sort_key(self, job: DownloadJob) -> SortKey:
+        if self.order == DownloadOrder.NEWEST:
+            return (-job.episode.published_time.timestamp(),)
+        if self.order == DownloadOrder.SHORTEST:
+            return (job.expected_size,)
+        if self.order == DownloadOrder.LARGEST:
+            return (-job.expected_size,)
+        return ()
+
+    def _select_queue(self) -> _FeedQueue | None:
+        if self.order == DownloadOrder.FEED:
+            # Feeds are downloaded one after another, in the order they were added.
+            return next((queue for queue in self._queues.values() if queue.heap), None)
+
+        if self.order != DownloadOrder.ROUND_ROBIN:
+            return min(
+                (queue for queue in self._queues.values() if queue.heap),
+                key=lambda queue: queue.head_key,
+                default=None,
+            )
+
+        for _ in range(len(self._rotation)):
+            queue = self._queues[self._rotation[0]]
+            if queue.heap:
+                break
+            self._rotation.rotate(-1)
+        else:
+            return None
+
+        queue.credit -= 1
+        if queue.credit <= 0:
+            queue.credit = queue.weight
+            self._rotation.rotate(-1)
+        return queue
+
+    def _next(self) -> tuple[_FeedQueue, DownloadJob, Future[EpisodeResult]] | None:
+        with self._lock:
+            while self._active_workers <= self.worker_limit:
+                self._release_deferred()
+                if queue := self._select_queue():
+                    *_, job, future = heappop(queue.heap)
+                    if queue.is_drained:
+                        self._remove_queue(queue)
+                    if not self._defer(queue.name, job, future):
+                        return queue, job, future
+                elif not self._wait_for_deferred():
+                    break
+
+            # Queues that are currently being refilled will start new workers as needed.
+            self._active_workers -= 1
+            return None
+
+    def _defer(self, feed: str, job: DownloadJob, future: Future[EpisodeResult]) -> bool:
+        if not (delay := backoff.remaining(job.episode.enclosure.href)):
+            return False
+        logger.debug("Deferring %s by %.0f seconds", job.episode, delay)
+        heappush(self._deferred, (monotonic() + delay, next(self._counter), feed, job, future))
+        return True
+
+    def _release_deferred(self) -> None:
+        now = monotonic()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, _, feed, job, future = heappop(self._deferred)
+            heappush(self._get_queue(feed).heap, (self._sort_key(job), next(self._counter), job, future))
+            self._spawn_workers()
+
+    def _wait_for_deferred(self) -> bool:
+        # A single worker stays around to pick up downloads from hosts that asked us to back off.
+        if not self._deferred or self._waiting or self._cancelled:
+            return False
+        self._waiting = True
+        try:
+            self._condition.wait(timeout=self._deferred[0][0] - monotonic())
+        finally:
+            self._waiting = False
+        return True
+
+    def _work(self) -> None:
+        while item := self._next():
+            queue, job, future = item
+            self._refill(queue)
+            # Downloads that were retried after being rate-limited are already running.
+            if not future.running() and not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = job()
+            except Exception as exc:
+                logger.debug("Unexpected error in download job", exc_info=exc)
+                future.set_exception(exc)
+                continue
+            self._record(job, result)
+            if job.may_retry:
+                self._retry(queue.name, job, future)
+                continue
+            future.set_result(result)
+
+    def _retry(self, feed: str, job: DownloadJob, future: Future[EpisodeResult]) -> None:
+        with self._lock:
+            if self._cancelled:
+                future.set_result(EpisodeResult(job.episode, DownloadResult.ABORTED))
+            elif not self._defer(feed, job, future):
+                heappush(self._get_queue(feed).heap, (self._sort_key(job), next(self._counter), job, future))
+
+    def _record(self, job: DownloadJob, result: EpisodeResult) -> None:
+        if not self.controller or result.result == DownloadResult.ABORTED:
+            return
+        self.controller.record(
+            get_host(job.episode.enclosure.href),
+            latency=job.latency,
+            failed=result.result == DownloadResult.FAILED,
+            throttled=job.is_rate_limited,
+        )
+        with self._lock:
+            self._spawn_workers()
@@ -6,7 +6,8 @@ from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
-from podcast_archiver.constants import REQUESTS_TIMEOUT, USER_AGENT
+from podcast_archiver.backoff import backoff
+from podcast_archiver.constants import MAX_CONNECTION_POOLS, REQUESTS_TIMEOUT, THROTTLING_STATUS_CODES, USER_AGENT
 
 if TYPE_CHECKING:
     from requests.models import Response
@@ -17,9 +18,12 @@ _retries = Retry(
     connect=1,
     backoff_factor=0.5,
     status_forcelist=[500, 501, 502, 503, 504],
+    # Rate limits are handled through the per-host backoff registry instead of blocking in place.
+    respect_retry_after_header=False,
+    raise_on_status=False,
 )
 
-_adapter = HTTPAdapter(max_retries=_retries)
+_adapter = HTTPAdapter(max_retries=_retries, pool_connections=MAX_CONNECTION_POOLS)
 
 
 class ArchiverSession(Session):
@@ -37,9 +41,34 @@ class ArchiverSession(Session):
             headers["If-Modified-Since"] = last_modified
 
         response = self.get(url, timeout=timeout, headers=headers, **kwargs)
+        self.track_backoff(url, response)
         response.raise_for_status()
         return response
 
+    def track_backoff(self, url: str, response: Response) -> None:
+        # Callers check `backoff.remaining()` themselves and postpone requests to paused hosts instead of blocking.
+        if response.status_code in THROTTLING_STATUS_CODES:
+            backoff.register(url, response.url, retry_after=response.headers.get("Retry-After"))
+        elif response.ok:
+            backoff.clear(url)
+
+    def preconnect(self, url: str) -> None:
+        # Open a connection ahead of the first request through a cheap request, which leaves the connection in the
+        # pool for the next request to the same host to pick up.
+        response = self.head(url, timeout=REQUESTS_TIMEOUT, allow_redirects=False)
+        response.close()
+        self.track_backoff(url, response)
+
+    def configure(self, *, http2: bool = False, max_connections: int | None = None) -> None:
+        # Plain HTTP stays on HTTP/1.1, as HTTP/2 is only negotiated during the TLS handshake.
+        if not http2:
+            self.mount("https://", _adapter)
+            return
+        # Imported on use, so that httpx is only loaded when HTTP/2 is enabled.
+        from podcast_archiver.transport import HTTP2Adapter
+
+        self.mount("https://", HTTP2Adapter(max_connections=max_connections))
+
 
 session = ArchiverSession()
 session.mount("http://", _adapter)
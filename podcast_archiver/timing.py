@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from podcast_archiver import constants
+from podcast_archiver.enums import Stage
+from podcast_archiver.logging import logger
+from podcast_archiver.metrics import metrics
+
+if TYPE_CHECKING:
+    from rich.console import RenderableType
+
+
+@dataclass(slots=True)
+class StageStats:
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.longest = max(self.longest, seconds)
+
+    def merge(self, other: StageStats) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.longest = max(self.longest, other.longest)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+# Aggregates the time spent in each stage of processing per feed. Measurements are attributed to the feed set for the
+# current thread, as the feed is not known everywhere a stage is timed.
+class StageTimer:
+    _lock: threading.Lock
+    _local: threading.local
+    _stats: dict[tuple[str | None, Stage], StageStats]
+    _titles: dict[str, str]
+
+    __slots__ = ("_lock", "_local", "_stats", "_titles")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+        self._titles = {}
+
+    @property
+    def current_feed(self) -> str | None:
+        return getattr(self._local, "feed", None)
+
+    @contextmanager
+    def feed(self, url: str | None) -> Iterator[None]:
+        previous = self.current_feed
+        self._local.feed = url
+        try:
+            yield
+        finally:
+            self._local.feed = previous
+
+    @contextmanager
+    def measure(self, stage: Stage) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - start)
+
+    def add(self, stage: Stage, seconds: float, *, feed: str | None = None) -> None:
+        key = (feed or self.current_feed, stage)
+        with self._lock:
+            if not (stats := self._stats.get(key)):
+                stats = self._stats[key] = StageStats()
+            stats.add(seconds)
+        metrics.stage_duration.observe(seconds, stage=stage)
+
+    def set_title(self, feed: str, title: str) -> None:
+        self._titles[feed] = title
+
+    def labels(self, feeds: Iterable[str]) -> dict[str, str]:
+        # Feeds are labelled by title, as sanitized URLs lack the query string (which may hold credentials) and are
+        # not unique. Feeds that share a title are told apart by their URL.
+        from podcast_archiver.utils import sanitize_url
+
+        labels = {feed: self._titles.get(feed) or sanitize_url(feed) for feed in feeds}
+        counts = Counter(labels.values())
+        return {
+            feed: f"{label} ({sanitize_url(feed)})" if counts[label] > 1 and feed in self._titles else label
+            for feed, label in labels.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def by_stage(self) -> dict[Stage, StageStats]:
+        totals = {stage: StageStats() for stage in Stage}
+        for (_, stage), stats in self.snapshot().items():
+            totals[stage].merge(stats)
+        return {stage: stats for stage, stats in totals.items() if stats.count}
+
+    def by_feed(self) -> dict[str, dict[Stage, StageStats]]:
+        feeds: dict[str, dict[Stage, StageStats]] = {}
+        for (feed, stage), stats in self.snapshot().items():
+            if feed:
+                feeds.setdefault(feed, {})[stage] = stats
+        # Slowest feeds first
+        return dict(sorted(feeds.items(), key=lambda item: -sum(stats.total for stats in item[1].values())))
+
+    def snapshot(self) -> dict[tuple[str | None, Stage], StageStats]:
+        with self._lock:
+            return {key: StageStats(stats.count, stats.total, stats.longest) for key, stats in self._stats.items()}
+
+    def log_summary(self) -> None:
+        for stage, stats in self.by_stage().items():
+            logger.debug(
+                "Timing of %s: %s times, %.3fs total, %.3fs mean, %.3fs max",
+                stage,
+                stats.count,
+                stats.total,
+                stats.mean,
+                stats.longest,
+            )
+        by_feed = self.by_feed()
+        labels = self.labels(by_feed)
+        for feed, stages in by_feed.items():
+            logger.debug(
+                "Timing of %s: %s",
+                labels[feed],
+                ", ".join(f"{stage} {stats.total:.3f}s" for stage, stats in stages.items()),
+            )
+
+    def render_summary(self) -> RenderableType:
+        from rich.console import Group
+        from rich.table import Table
+
+        stages = Table("Stage", "Count", "Total", "Mean", "Max", title="Time spent per stage", title_justify="left")
+        for stage, stats in self.by_stage().items():
+            stages.add_row(
+                str(stage), str(stats.count), f"{stats.total:.2f}s", f"{stats.mean:.3f}s", f"{stats.longest:.3f}s"
+            )
+
+        by_feed = self.by_feed()
+        columns = [stage for stage in Stage if any(stage in feed_stats for feed_stats in by_feed.values())]
+        feeds = Table(
+            "Feed",
+            *(str(stage) for stage in columns),
+            title=f"Slowest {constants.TIMING_SUMMARY_FEEDS} feeds",
+            title_justify="left",
+        )
+        slowest = dict(list(by_feed.items())[: constants.TIMING_SUMMARY_FEEDS])
+        labels = self.labels(slowest)
+        for feed, feed_stats in slowest.items():
+            feeds.add_row(
+                labels[feed],
+                *(f"{feed_stats[stage].total:.2f}s" if stage in feed_stats else "" for stage in columns),
+            )
+        return Group(stages, feeds)
+
+
+stage_timer = StageTimer()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import ssl
+from datetime import timedelta
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Iterator
+
+from requests import ConnectionError, ConnectTimeout, ReadTimeout
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+
+from podcast_archiver.exceptions import InvalidSettings
+from podcast_archiver.logging import logger
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore[assignment,unused-ignore]
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from requests import PreparedRequest
+
+# Connection-specific headers are not allowed in HTTP/2 requests.
+HOP_BY_HOP_HEADERS = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+Timeout = None | float | tuple[float, float] | tuple[float, None]
+ClientKey = tuple[bool | str, str | tuple[str, ...] | None, str | None]
+
+
+def ssl_context(verify: bool | str, cert: str | tuple[str, ...] | None) -> ssl.SSLContext:
+    # Mirrors how requests interprets `verify` and `cert`, including CA bundles set via `REQUESTS_CA_BUNDLE`.
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        ca_bundle = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        if os.path.isdir(ca_bundle):
+            context = ssl.create_default_context(capath=ca_bundle)
+        else:
+            context = ssl.create_default_context(cafile=ca_bundle)
+    if isinstance(cert, str):
+        context.load_cert_chain(cert)
+    elif cert:
+        context.load_cert_chain(*cert)
+    return context
+
+
+class _StreamReader:
+    _response: httpx.Response
+    _chunks: Iterator[bytes]
+    _buffer: bytes
+
+    __slots__ = ("_response", "_chunks", "_buffer")
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+
+    @property
+    def http_version(self) -> str:
+        return self._response.http_version
+
+    def read(self, amt: int | None = None) -> bytes:
+        if amt is None:
+            data, self._buffer = self._buffer + b"".join(self._chunks), b""
+            return data
+        if not self._buffer:
+            self._buffer = next(self._chunks, b"")
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+
+# Sends requests through an httpx client that multiplexes requests to the same host over a single connection where
+# the server supports HTTP/2 (negotiated via ALPN), and falls back to HTTP/1.1 otherwise. Redirects, cookies, and
+# status handling remain with the requests session.
+class HTTP2Adapter(BaseAdapter):
+    limits: httpx.Limits
+    clients: dict[ClientKey, httpx.Client]
+    _lock: Lock
+
+    def __init__(self, max_connections: int | None = None) -> None:
+        super().__init__()
+        if httpx is None:
+            raise InvalidSettings(
+                "HTTP/2 support requires the 'http2' extra, e.g. 'pip install podcast-archiver[http2]'."
+            )
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.clients = {}
+        self._lock = Lock()
+
+    def get_client(self, verify: bool | str, cert: Any, proxy: str | None) -> httpx.Client:
+        # Certificates and proxies are set per client in httpx rather than per request, so there is a client for each
+        # combination of them. The connection pool is configured on the transport, as httpx ignores the limits of
+        # the client when a transport is given.
+        key: ClientKey = (verify, tuple(cert) if isinstance(cert, (list, tuple)) else cert, proxy)
+        with self._lock:
+            if not (client := self.clients.get(key)):
+                client = self.clients[key] = httpx.Client(
+                    follow_redirects=False,
+                    # Proxies and CA bundles from the environment are already resolved by the requests session.
+                    trust_env=False,
+                    transport=httpx.HTTPTransport(
+                        http2=True,
+                        retries=1,
+                        limits=self.limits,
+                        verify=ssl_context(verify, key[1]),
+                        proxy=proxy,
+                    ),
+                )
+        return client
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Timeout = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        headers = {key: value for key, value in request.headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
+        client = self.get_client(verify, cert, select_proxy(request.url or "", proxies or {}))
+        httpx_request = client.build_request(
+            request.method or "GET",
+            request.url or "",
+            headers=headers,
+            content=request.body,
+            timeout=self._timeout(timeout),
+        )
+        start = perf_counter()
+        try:
+            response = client.send(httpx_request, stream=True)
+        except httpx.ConnectTimeout as exc:
+            raise ConnectTimeout(exc, request=request) from exc
+        except httpx.TimeoutException as exc:
+            raise ReadTimeout(exc, request=request) from exc
+        except httpx.TransportError as exc:
+            raise ConnectionError(exc, request=request) from exc
+
+        logger.debug("Received %s response via %s from %s", response.status_code, response.http_version, request.url)
+        return self.build_response(request, response, elapsed=perf_counter() - start)
+
+    def build_response(self, request: PreparedRequest, response: httpx.Response, elapsed: float = 0.0) -> Response:
+        built = Response()
+        # Like requests, the time until the response headers were received. The `elapsed` of a streamed httpx
+        # response is only available once its body has been read.
+        built.elapsed = timedelta(seconds=elapsed)
+        built.status_code = response.status_code
+        built.headers = CaseInsensitiveDict(response.headers)
+        built.encoding = get_encoding_from_headers(built.headers)
+        built.reason = response.reason_phrase
+        built.url = str(response.url)
+        built.raw = _StreamReader(response)
+        built.request = request
+        built.connection = self  # type: ignore[assignment]
+        return built
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            client.close()
+
+    @staticmethod
+    def _timeout(timeout: Timeout) -> httpx.Timeout:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
@@ -1,24 +1,33 @@
 from __future__ import annotations
 
 from concurrent.futures import Future
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Protocol, TypeAlias
+from dataclasses import dataclass, field
+from queue import SimpleQueue
+from threading import Lock
+from typing import TYPE_CHECKING, Iterator, Protocol, TypeAlias
 
 from rich.console import Group
 
+from podcast_archiver.utils.pretty_printing import PrettyPrintEpisodeRange
+
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from rich.console import RenderableType
 
     from podcast_archiver.enums import DownloadResult, QueueCompletionType
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.models.episode import EpisodeRecord
     from podcast_archiver.models.feed import Feed
 
 
 @dataclass(slots=True, frozen=True)
 class EpisodeResult:
-    episode: BaseEpisode
+    episode: EpisodeRecord
     result: DownloadResult
     is_eager: bool = False
+    checksum: str | None = None
+    target: Path | None = None
+    etag: str | None = None
 
     def __rich__(self) -> RenderableType:
         return Group(self.result, self.episode)
@@ -35,6 +44,52 @@ class ProcessingResult:
         return self.tombstone
 
 
+@dataclass(slots=True)
+class EnqueuedFeed:
+    feed: Feed | None
+    tombstone: QueueCompletionType
+    title: str = ""
+    episode_range: PrettyPrintEpisodeRange = field(default_factory=PrettyPrintEpisodeRange)
+    results: SimpleQueue[FutureEpisodeResult | None] = field(default_factory=SimpleQueue)
+    submitted: int = 0
+    outstanding: int = 0
+    exhausted: bool = False
+    _lock: Lock = field(default_factory=Lock)
+
+    @property
+    def is_pending(self) -> bool:
+        return self.submitted > 0 or not self.exhausted
+
+    def put(self, result: FutureEpisodeResult) -> None:
+        if not isinstance(result, Future):
+            self.results.put(result)
+            return
+        with self._lock:
+            self.submitted += 1
+            self.outstanding += 1
+        # Downloads are reported in the order they complete, not in the order they were submitted
+        result.add_done_callback(self._on_done)
+
+    def close(self) -> None:
+        self.episode_range.close()
+        with self._lock:
+            self.exhausted = True
+            finished = not self.outstanding
+        if finished:
+            self.results.put(None)
+
+    def _on_done(self, future: Future[EpisodeResult]) -> None:
+        self.results.put(future)
+        with self._lock:
+            self.outstanding -= 1
+            finished = self.exhausted and not self.outstanding
+        if finished:
+            self.results.put(None)
+
+    def __iter__(self) -> Iterator[FutureEpisodeResult]:
+        return iter(self.results.get, None)
+
+
 class ProgressCallback(Protocol):
     def __call__(self, total: int | None = None, completed: int | None = None) -> None: ...
 
@@ -2,18 +2,22 @@ from __future__ import annotations
 
 import os
 import re
+import shutil
 from contextlib import contextmanager
+from dataclasses import dataclass
 from functools import partial
+from operator import attrgetter
 from string import Formatter
-from typing import IO, TYPE_CHECKING, Any, Generator, Iterable, Iterator, Literal, TypedDict, overload
+from typing import IO, TYPE_CHECKING, Any, Callable, Generator, Iterable, Iterator, Literal, TypedDict, overload
 from urllib.parse import urlparse
 
 from pydantic import ValidationError
-from requests import HTTPError
 from slugify import slugify as _slugify
 
+from podcast_archiver.enums import Stage
 from podcast_archiver.exceptions import NotModified, NotSupported
 from podcast_archiver.logging import logger, rprint
+from podcast_archiver.timing import stage_timer
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -77,17 +81,30 @@ DATETIME_FIELDS = {"episode.published_time"}
 DEFAULT_DATETIME_FMT = "%Y-%m-%d"
 
 
+@dataclass(slots=True, frozen=True)
+class _TemplateField:
+    literal: str
+    field_name: str | None = None
+    root: str = ""
+    getter: Callable[[Any], Any] | None = None
+    format_spec: str = ""
+    conversion: str | None = None
+
+
 class FilenameFormatter(Formatter):
     _template: str
     _slugify: bool
     _path_root: Path
 
-    _parsed: list[tuple[str, str | None, str | None, str | None]]
+    _parsed: list[_TemplateField] | None
+    _show_fields: tuple[FeedInfo, dict[int, str]] | None
 
     def __init__(self, settings: Settings) -> None:
         self._template = settings.filename_template
         self._slugify = settings.slugify_paths
         self._path_root = settings.archive_directory
+        self._parsed = self._compile(self._template)
+        self._show_fields = None
 
     def parse(  # type: ignore[override]
         self,
@@ -110,7 +127,59 @@ class FilenameFormatter(Formatter):
             "show": feed_info,
             "ext": episode.ext,
         }
-        return self._path_root / self.vformat(self._template, args=(), kwargs=kwargs)
+        if self._parsed is None:
+            return self._path_root / self.vformat(self._template, args=(), kwargs=kwargs)
+
+        show_fields = self._get_show_fields(feed_info)
+        parts: list[str] = []
+        for idx, field in enumerate(self._parsed):
+            parts.append(field.literal)
+            if field.field_name is None:
+                continue
+            if (rendered := show_fields.get(idx)) is None:
+                rendered = self._render(field, kwargs)
+            parts.append(rendered)
+        return self._path_root / "".join(parts)
+
+    def _compile(self, template: str) -> list[_TemplateField] | None:
+        # Parse the template once into literal parts and attribute getters for its fields, rather than on every call.
+        parsed: list[_TemplateField] = []
+        for literal_text, field_name, format_spec, conversion in self.parse(template):
+            if field_name is None:
+                parsed.append(_TemplateField(literal_text))
+                continue
+            root, _, attrs = field_name.partition(".")
+            if not root.isidentifier() or "[" in field_name or "{" in (format_spec or ""):
+                # Positional fields, item access, and nested format specs are left to the regular formatter.
+                return None
+            parsed.append(
+                _TemplateField(
+                    literal_text,
+                    field_name=field_name,
+                    root=root,
+                    getter=attrgetter(attrs) if attrs else None,
+                    format_spec=format_spec or "",
+                    conversion=conversion,
+                )
+            )
+        return parsed
+
+    def _render(self, field: _TemplateField, kwargs: FormatterKwargs) -> str:
+        value = kwargs[field.root]  # type: ignore[literal-required]
+        if field.getter:
+            value = field.getter(value)
+        return self.format_field(self.convert_field(value, field.conversion), field.format_spec)
+
+    def _get_show_fields(self, feed_info: FeedInfo) -> dict[int, str]:
+        # Fields of the show are the same for all its episodes, so they are only rendered once per feed.
+        if (cached := self._show_fields) and cached[0] is feed_info:
+            return cached[1]
+        kwargs: FormatterKwargs = {"show": feed_info}
+        show_fields = {
+            idx: self._render(field, kwargs) for idx, field in enumerate(self._parsed or ()) if field.root == "show"
+        }
+        self._show_fields = (feed_info, show_fields)
+        return show_fields
 
 
 @overload
@@ -129,10 +198,12 @@ def atomic_write(target: Path, mode: Literal["w", "wb"] = "w") -> Iterator[IO[by
     try:
         with tempfile.open(mode) as fp:
             yield fp
-            fp.flush()
-            os.fsync(fp.fileno())
-        logger.debug("Moving file '%s' => '%s'", tempfile, target)
-        os.rename(tempfile, target)
+            with stage_timer.measure(Stage.FINALIZE):
+                fp.flush()
+                os.fsync(fp.fileno())
+                fp.close()
+                logger.debug("Moving file '%s' => '%s'", tempfile, target)
+                os.rename(tempfile, target)
     except Exception:
         target.unlink(missing_ok=True)
         raise
@@ -140,8 +211,25 @@ def atomic_write(target: Path, mode: Literal["w", "wb"] = "w") -> Iterator[IO[by
         tempfile.unlink(missing_ok=True)
 
 
+def link_or_copy(source: Path, target: Path) -> None:
+    tempfile = target.with_suffix(".part")
+    tempfile.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(source, tempfile)
+        except OSError as exc:
+            logger.debug("Hardlinking '%s' failed, copying instead: %s", source, exc)
+            shutil.copyfile(source, tempfile)
+        logger.debug("Moving file '%s' => '%s'", tempfile, target)
+        os.replace(tempfile, target)
+    finally:
+        tempfile.unlink(missing_ok=True)
+
+
 @contextmanager
 def handle_feed_request(url: str) -> Generator[None, Any, None]:
+    from requests import HTTPError
+
     printerr = partial(rprint, style="error")
     try:
         yield
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from podcast_archiver.logging import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _Listing:
+    names: set[str]
+    folded: set[str]
+
+    __slots__ = ("names", "folded")
+
+    def __init__(self, names: set[str]) -> None:
+        self.names = names
+        self.folded = {name.casefold() for name in names}
+
+    def add(self, name: str) -> None:
+        self.names.add(name)
+        self.folded.add(name.casefold())
+
+
+# Answers existence checks of files from a single listing of their directory, instead of one stat call per file,
+# which on network filesystems is a round trip each.
+class DirectoryListing:
+    _lock: Lock
+    _listings: dict[Path, _Listing]
+
+    __slots__ = ("_lock", "_listings")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._listings = {}
+
+    def exists(self, path: Path) -> bool:
+        listing = self._get_listing(path.parent)
+        if path.name in listing.names:
+            return True
+        if path.name.casefold() in listing.folded:
+            # Could be the same file on a case-insensitive filesystem, let the filesystem decide.
+            return path.exists()
+        return False
+
+    def add(self, path: Path) -> None:
+        with self._lock:
+            if listing := self._listings.get(path.parent):
+                listing.add(path.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+    def _get_listing(self, directory: Path) -> _Listing:
+        with self._lock:
+            if listing := self._listings.get(directory):
+                return listing
+        listing = _Listing(self._scan(directory))
+        with self._lock:
+            return self._listings.setdefault(directory, listing)
+
+    @staticmethod
+    def _scan(directory: Path) -> set[str]:
+        try:
+            with os.scandir(directory) as entries:
+                # Resolves symlinks like Path.exists() does, without additional stat calls for regular entries.
+                names = {entry.name for entry in entries if entry.is_file() or entry.is_dir()}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+        logger.debug("Listed %s entries in %s", len(names), directory)
+        return names
@@ -13,7 +13,7 @@ from podcast_archiver.logging import rprint
 if TYPE_CHECKING:
     from rich.console import ConsoleRenderable, RenderableType
 
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.models.episode import EpisodeRecord
 
 
 NEWLINE = NewLine()
@@ -22,11 +22,11 @@ NEWLINE = NewLine()
 @dataclass(slots=True)
 class _ValPair:
     prefix: DownloadResult
-    first: BaseEpisode | None = None
-    last: BaseEpisode | None = None
+    first: EpisodeRecord | None = None
+    last: EpisodeRecord | None = None
     length: int = 0
 
-    def populate(self, obj: BaseEpisode) -> None:
+    def populate(self, obj: EpisodeRecord) -> None:
         if not self.first:
             self.first = obj
         self.last = obj
@@ -77,12 +77,19 @@ class PrettyPrintEpisodeRange:
         return self
 
     def __exit__(self, *args: Any) -> None:
+        self.close()
+        self.show()
+
+    def close(self) -> None:
         if emitted := self._last_populated.emit():
             self.pairs.append(emitted)
+            self._last_populated = _ValPair(prefix=emitted.prefix)
+
+    def show(self) -> None:
         if self.pairs:
             rprint(self, no_wrap=True, overflow="ellipsis")
 
-    def _update_state(self, obj: BaseEpisode, to_populate: _ValPair, to_emit: _ValPair) -> _ValPair:
+    def _update_state(self, obj: EpisodeRecord, to_populate: _ValPair, to_emit: _ValPair) -> _ValPair:
         self._last_populated = to_populate
         to_populate.populate(obj)
         if emitted := to_emit.emit():
@@ -90,7 +97,7 @@ class PrettyPrintEpisodeRange:
             return _ValPair(prefix=to_emit.prefix)
         return to_emit
 
-    def update(self, exists: bool, obj: BaseEpisode) -> None:
+    def update(self, exists: bool, obj: EpisodeRecord) -> None:
         if exists:
             self._missing = self._update_state(obj, to_populate=self._present, to_emit=self._missing)
         else:
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from functools import partial
 from threading import Event, Lock, Thread
-from typing import TYPE_CHECKING, Any, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
 from rich import progress as rp
 from rich.table import Column
@@ -14,7 +15,7 @@ from podcast_archiver.logging import REDIRECT_VIA_LOGGING
 if TYPE_CHECKING:
     from rich.console import RenderableType
 
-    from podcast_archiver.models.episode import BaseEpisode
+    from podcast_archiver.models.episode import EpisodeRecord
 
 
 _Column = partial(
@@ -91,14 +92,25 @@ def make_episode_column(cols: list[rp.ProgressColumn], idx: int = 2) -> None:
 make_episode_column(PROGRESS_COLUMNS)
 
 
+@dataclass(slots=True)
+class _TaskCounter:
+    total: int
+    episode: EpisodeRecord
+    task_id: rp.TaskID | None = None
+    # Only ever written by the thread doing the download, and read when refreshing the display.
+    completed: int = 0
+
+
 class _ProgressRefreshThread(Thread):
     progress: rp.Progress
+    sample: Callable[[], None]
     stop_event: Event
 
-    __slots__ = ("progress", "stop_event")
+    __slots__ = ("progress", "sample", "stop_event")
 
-    def __init__(self, progress_obj: rp.Progress) -> None:
+    def __init__(self, progress_obj: rp.Progress, sample: Callable[[], None]) -> None:
         self.progress = progress_obj
+        self.sample = sample
         self.stop_event = Event()
         super().__init__(daemon=True)
 
@@ -106,6 +118,7 @@ class _ProgressRefreshThread(Thread):
         update_period = 1 / self.progress.live.refresh_per_second
         wait = self.stop_event.wait
         while not wait(update_period) and self.progress.live.is_started:
+            self.sample()
             self.progress.refresh()
 
     def stop(self) -> None:
@@ -113,17 +126,39 @@ class _ProgressRefreshThread(Thread):
         self.join()
 
 
+# Downloads count their progress in plain counters without any locking, which are only transferred to the progress
+# display when it is refreshed. The cost of rendering thereby depends on the refresh rate, not on the number of chunks
+# received. In aggregate mode, all downloads are shown as a single task.
 class ProgressManager:
+    aggregate: bool
     _progress: rp.Progress
     _lock: Lock
     _refresher: _ProgressRefreshThread
     _started: bool
-
-    __slots__ = ("_progress", "_lock", "_refresher", "_started")
+    _counters: list[_TaskCounter]
+    _aggregate_task: rp.TaskID | None
+    _finished_completed: int
+    _finished_total: int
+
+    __slots__ = (
+        "aggregate",
+        "_progress",
+        "_lock",
+        "_refresher",
+        "_started",
+        "_counters",
+        "_aggregate_task",
+        "_finished_completed",
+        "_finished_total",
+    )
 
     def __init__(self) -> None:
+        self.aggregate = False
         self._started = False
         self._lock = Lock()
+        self._counters = []
+        self._aggregate_task = None
+        self._finished_completed = self._finished_total = 0
         self._progress = rp.Progress(
             *PROGRESS_COLUMNS,
             console=console,
@@ -140,19 +175,59 @@ class ProgressManager:
     def __exit__(self, *args: Any) -> None:
         self.stop()
 
-    def track(self, iterable: Iterable[bytes], total: int, episode: BaseEpisode) -> Iterable[bytes]:
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    def configure(self, aggregate: bool) -> None:
+        self.aggregate = aggregate
+
+    def track(self, iterable: Iterable[bytes], total: int, episode: EpisodeRecord) -> Iterable[bytes]:
         if REDIRECT_VIA_LOGGING:
             yield from iterable
             return
 
-        task_id = self._progress.add_task("downloading", total=total, episode=episode)
+        counter = self._add(_TaskCounter(total=total, episode=episode))
         try:
             for it in iterable:
                 yield it
-                self._progress.advance(task_id, advance=len(it))
+                counter.completed += len(it)
         finally:
-            self._progress.remove_task(task_id)
-            self._progress.refresh()
+            self._remove(counter)
+
+    def _add(self, counter: _TaskCounter) -> _TaskCounter:
+        with self._lock:
+            if not self.aggregate:
+                counter.task_id = self._progress.add_task("downloading", total=counter.total, episode=counter.episode)
+            self._counters.append(counter)
+        return counter
+
+    def _remove(self, counter: _TaskCounter) -> None:
+        with self._lock:
+            self._counters.remove(counter)
+            self._finished_completed += counter.completed
+            self._finished_total += counter.total or counter.completed
+            if counter.task_id is not None:
+                self._progress.remove_task(counter.task_id)
+
+    def sample(self) -> None:
+        with self._lock:
+            if self._aggregate_task is None:
+                for counter in self._counters:
+                    if counter.task_id is not None:
+                        self._progress.update(counter.task_id, completed=counter.completed)
+                return
+
+            completed, total = self._finished_completed, self._finished_total
+            for counter in self._counters:
+                completed += counter.completed
+                total += counter.total or counter.completed
+            self._progress.update(
+                self._aggregate_task,
+                completed=completed,
+                total=total or None,
+                episode=f"{len(self._counters)} active download{'' if len(self._counters) == 1 else 's'}",
+            )
 
     def start(self) -> None:
         if REDIRECT_VIA_LOGGING:
@@ -160,8 +235,10 @@ class ProgressManager:
         with self._lock:
             if self._started:
                 return
+            if self.aggregate:
+                self._aggregate_task = self._progress.add_task("downloading", total=None, episode="")
             self._progress.start()
-            self._refresher = _ProgressRefreshThread(self._progress)
+            self._refresher = _ProgressRefreshThread(self._progress, self.sample)
             self._refresher.start()
             self._started = True
 
@@ -171,7 +248,11 @@ class ProgressManager:
                 return
             self._progress.stop()
             self._started = False
-            self._refresher.stop()
+            if self._aggregate_task is not None:
+                self._progress.remove_task(self._aggregate_task)
+                self._aggregate_task = None
+            self._finished_completed = self._finished_total = 0
+        self._refresher.stop()
 
 
 progress_manager = ProgressManager()
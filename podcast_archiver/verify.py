@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Collection, Iterator
+
+from rich.console import Group
+from rich.text import Text
+
+from podcast_archiver import constants
+from podcast_archiver.enums import VerificationResult
+from podcast_archiver.logging import logger, rprint
+
+if TYPE_CHECKING:
+    from rich.console import RenderableType
+
+    from podcast_archiver.config import Settings
+    from podcast_archiver.database import BaseDatabase, EpisodeInDb
+
+
+@dataclass(slots=True, frozen=True)
+class FileVerification:
+    path: Path
+    result: VerificationResult
+    episode: EpisodeInDb | None = None
+
+    def __rich__(self) -> RenderableType:
+        return Group(self.result, Text(str(self.path), end=""))
+
+
+def file_checksum(path: Path) -> str:
+    hasher = hashlib.new(constants.CHECKSUM_ALGORITHM)
+    with path.open("rb") as fp:
+        while chunk := fp.read(constants.DOWNLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def verify_file(episode: EpisodeInDb, path: Path, checksums: bool = False) -> FileVerification:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return FileVerification(path, VerificationResult.MISSING, episode)
+
+    if episode.size is not None and size != episode.size:
+        result = VerificationResult.TRUNCATED if size < episode.size else VerificationResult.CORRUPTED
+        return FileVerification(path, result, episode)
+
+    if checksums and episode.checksum and file_checksum(path) != episode.checksum:
+        return FileVerification(path, VerificationResult.CORRUPTED, episode)
+
+    return FileVerification(path, VerificationResult.INTACT, episode)
+
+
+class ArchiveVerifier:
+    settings: Settings
+    database: BaseDatabase
+    checksums: bool
+
+    __slots__ = ("settings", "database", "checksums")
+
+    def __init__(self, settings: Settings, database: BaseDatabase, checksums: bool = False) -> None:
+        self.settings = settings
+        self.database = database
+        self.checksums = checksums
+
+    def verify(self) -> list[FileVerification]:
+        recorded: set[Path] = set()
+        unindexed = 0
+        problems: list[FileVerification] = []
+        counts: Counter[VerificationResult] = Counter()
+
+        with ThreadPoolExecutor(max_workers=self.settings.concurrency) as executor:
+            futures = []
+            for episode in self.database.iter_archived():
+                if not episode.path:
+                    unindexed += 1
+                    continue
+                recorded.add(episode.path)
+                futures.append(executor.submit(verify_file, episode, episode.path, self.checksums))
+
+            orphans = [FileVerification(path, VerificationResult.ORPHANED) for path in self._walk_archive(recorded)]
+            for verification in (*(future.result() for future in futures), *orphans):
+                counts[verification.result] += 1
+                if verification.result is not VerificationResult.INTACT:
+                    problems.append(verification)
+                    rprint(verification, new_line_start=False)
+
+        rprint(self._summary(counts), style="error" if problems else "completed")
+        if unindexed:
+            logger.debug("Skipped %s database entries without a recorded path", unindexed)
+            rprint(
+                f"{unindexed} archived episodes have no recorded file path and could not be verified.",
+                style="warninghint",
+            )
+        return problems
+
+    def repair(self, problems: list[FileVerification], feeds: Collection[str]) -> list[FileVerification]:
+        # Only episodes of configured feeds are forgotten, as no other episodes would be archived again.
+        forgotten: list[FileVerification] = []
+        for verification in problems:
+            if verification.result not in VerificationResult.broken() or not (episode := verification.episode):
+                continue
+            if not episode.guid or episode.feed not in feeds:
+                logger.info("Not repairing %s, its feed is not configured", verification.path)
+                continue
+            logger.info("Forgetting broken episode %s at %s", episode.guid, verification.path)
+            verification.path.unlink(missing_ok=True)
+            self.database.remove(episode.guid)
+            forgotten.append(verification)
+        return forgotten
+
+    def count_restored(self, forgotten: list[FileVerification]) -> int:
+        archived = {episode.guid: episode for episode in self.database.iter_archived() if episode.path}
+        restored = 0
+        for verification in forgotten:
+            if verification.episode and (episode := archived.get(verification.episode.guid)) and episode.path:
+                restored += verify_file(episode, episode.path, self.checksums).result is VerificationResult.INTACT
+        return restored
+
+    def _walk_archive(self, recorded: set[Path]) -> Iterator[Path]:
+        ignored = {Path(self.database.filename).absolute()}
+        if self.settings.config:
+            ignored.add(self.settings.config.absolute())
+
+        for dirpath, dirnames, filenames in os.walk(self.settings.archive_directory.absolute()):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            for name in filenames:
+                if name.startswith(".") or name.endswith(".info.json"):
+                    continue
+                path = Path(dirpath) / name
+                if path not in recorded and path not in ignored:
+                    yield path
+
+    @staticmethod
+    def _summary(counts: Counter[VerificationResult]) -> str:
+        total = sum(count for result, count in counts.items() if result is not VerificationResult.ORPHANED)
+        details = ", ".join(f"{count} {result.name.lower()}" for result, count in counts.items() if count)
+        mark = "✔" if counts.keys() <= {VerificationResult.INTACT} else "✘"
+        return f"{mark} Verified {total} archived files" + (f" ({details})" if details else "")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import platform
+import timeit
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from tests.synthetic import SyntheticServer
+
+# Run with `pytest tests/benchmarks --pa-benchmark --no-cov`, add `--pa-benchmark-json PATH` to keep the results.
+# The options and fixture are prefixed so they do not clash with those of the pytest-benchmark plugin.
+BENCHMARK_REPEAT = 5
+
+
+@dataclass(slots=True)
+class Benchmark:
+    results: dict[str, tuple[float, str]] = field(default_factory=dict)
+
+    def __call__(self, name: str, func: Callable[[], Any], *, number: int = 1, repeat: int = BENCHMARK_REPEAT) -> float:
+        # Best of several repetitions, as the minimum is least affected by other load on the machine.
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        self.record(name, best * 1000, "ms")
+        return best
+
+    def record(self, name: str, value: float, unit: str) -> None:
+        self.results[name] = (value, unit)
+
+
+_benchmark = Benchmark()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--pa-benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --pa-benchmark")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("/"):
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    if not _benchmark.results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, (value, unit) in _benchmark.results.items():
+        terminalreporter.write_line(f"{name:<60} {value:>12.3f} {unit}")
+
+    if output := config.getoption("--pa-benchmark-json"):
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": {name: {"value": value, "unit": unit} for name, (value, unit) in _benchmark.results.items()},
+        }
+        Path(output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+@pytest.fixture
+def pa_benchmark() -> Benchmark:
+    return _benchmark
+
+
+@pytest.fixture(scope="module")
+def synthetic_server() -> Iterable[SyntheticServer]:
+    with SyntheticServer() as server:
+        yield server
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from podcast_archiver.config import Settings
+from podcast_archiver.models.feed import FeedPage
+from podcast_archiver.utils import FilenameFormatter
+from tests.conftest import FEED_CONTENT
+
+if TYPE_CHECKING:
+    from tests.benchmarks.conftest import Benchmark
+
+TEMPLATE = "{show.title}/{episode.published_time:%Y-%m-%d} - {episode.title}.{ext}"
+
+
+def test_filename_formatter(pa_benchmark: Benchmark) -> None:
+    page = FeedPage.parse_feed(FEED_CONTENT, alt_url=None)
+    episodes = [episode for episode in page.episodes if episode] * 100
+    formatter = FilenameFormatter(Settings(filename_template=TEMPLATE, slugify_paths=True))
+
+    def _vformat() -> None:
+        for episode in episodes:
+            kwargs = {"episode": episode, "show": page.feed, "ext": episode.ext}
+            formatter.vformat(TEMPLATE, args=(), kwargs=kwargs)
+
+    def _compiled() -> None:
+        for episode in episodes:
+            formatter.format(episode, feed_info=page.feed)
+
+    uncompiled = pa_benchmark(f"filename formatter: {len(episodes)} episodes, vformat", _vformat)
+    compiled = pa_benchmark(f"filename formatter: {len(episodes)} episodes, compiled", _compiled)
+
+    assert compiled < uncompiled
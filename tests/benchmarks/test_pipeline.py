@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import tracemalloc
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from podcast_archiver.config import Settings
+from podcast_archiver.database import Database
+from podcast_archiver.enums import QueueCompletionType
+from podcast_archiver.models.feed import FeedPage
+from podcast_archiver.processor import FeedProcessor
+from tests.synthetic import FeedSpec, generate_feed
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.benchmarks.conftest import Benchmark
+    from tests.synthetic import SyntheticServer
+
+pytestmark = pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+
+EPISODE_COUNTS = [10, 1_000, 10_000]
+DOWNLOAD_EPISODES = 16
+DOWNLOAD_SIZE = 4 * 1024 * 1024
+
+
+def make_processor(archive_directory: Path, **kwargs: Any) -> FeedProcessor:
+    archive_directory.mkdir(exist_ok=True)
+    settings = Settings(archive_directory=archive_directory, **kwargs)
+    return FeedProcessor(settings, database=Database(":memory:", ignore_existing=False))
+
+
+@pytest.mark.parametrize("count", EPISODE_COUNTS)
+def test_parse_feed(pa_benchmark: Benchmark, count: int) -> None:
+    content = generate_feed("http://127.0.0.1", FeedSpec(count=count))
+
+    pa_benchmark(f"parse feed: {count} episodes", lambda: FeedPage.parse_feed(content, alt_url=None), repeat=3)
+
+
+@pytest.mark.parametrize("count", EPISODE_COUNTS)
+def test_dry_run(pa_benchmark: Benchmark, synthetic_server: SyntheticServer, tmp_path: Path, count: int) -> None:
+    url = synthetic_server.feed_url(FeedSpec(count=count))
+
+    def _dry_run() -> None:
+        # A new processor every time, as a known feed would not be processed again.
+        processor = make_processor(tmp_path)
+        result = processor.process(url, dry_run=True)
+        processor.shutdown()
+        assert result.tombstone == QueueCompletionType.DRY_RUN
+
+    pa_benchmark(f"dry run: {count} episodes", _dry_run, repeat=3)
+
+    tracemalloc.start()
+    try:
+        _dry_run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    pa_benchmark.record(f"dry run: {count} episodes, peak memory", peak / 1024 / 1024, "MiB")
+
+
+def test_download_throughput(pa_benchmark: Benchmark, synthetic_server: SyntheticServer, tmp_path: Path) -> None:
+    url = synthetic_server.feed_url(FeedSpec(count=DOWNLOAD_EPISODES, media_size=DOWNLOAD_SIZE))
+
+    best = float("inf")
+    for attempt in range(3):
+        processor = make_processor(tmp_path / str(attempt), concurrency=4)
+        start = perf_counter()
+        result = processor.process(url)
+        best = min(best, perf_counter() - start)
+        processor.shutdown()
+        assert result.success == DOWNLOAD_EPISODES
+
+    total = DOWNLOAD_EPISODES * DOWNLOAD_SIZE / 1024 / 1024
+    pa_benchmark.record(f"download: {DOWNLOAD_EPISODES} x {DOWNLOAD_SIZE // 1024 // 1024} MiB", best * 1000, "ms")
+    pa_benchmark.record(
+        f"download: {DOWNLOAD_EPISODES} x {DOWNLOAD_SIZE // 1024 // 1024} MiB, throughput", total / best, "MiB/s"
+    )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from podcast_archiver.models.episode import BaseEpisode
+from podcast_archiver.utils.progress import ProgressManager
+
+if TYPE_CHECKING:
+    from tests.benchmarks.conftest import Benchmark
+
+CONCURRENCY = 32
+CHUNKS = 2_000
+CHUNK = b"x" * 1024
+
+
+@pytest.mark.parametrize("aggregate", [False, True])
+def test_progress_tracking(pa_benchmark: Benchmark, aggregate: bool) -> None:
+    episode = BaseEpisode.model_validate(
+        {
+            "title": "Episode",
+            "published_parsed": "2020-01-01T00:00:00Z",
+            "links": [{"rel": "enclosure", "type": "audio/mpeg", "href": "http://127.0.0.1/media.mp3"}],
+        }
+    ).to_record()
+    manager = ProgressManager()
+    manager.configure(aggregate=aggregate)
+
+    def _download(_: int) -> None:
+        for _chunk in manager.track((CHUNK for _ in range(CHUNKS)), total=CHUNKS * len(CHUNK), episode=episode):
+            pass
+
+    def _run() -> None:
+        with manager, ThreadPoolExecutor(CONCURRENCY) as executor:
+            list(executor.map(_download, range(CONCURRENCY)))
+
+    mode = "aggregate" if aggregate else "episodes"
+    pa_benchmark(f"progress: {CONCURRENCY} x {CHUNKS} chunks, {mode}", _run, repeat=3)
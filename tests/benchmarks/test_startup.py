@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+from tests.test_main import LAZY_IMPORTS_CODE
+
+if TYPE_CHECKING:
+    from tests.benchmarks.conftest import Benchmark
+
+# Time spent starting the CLI beyond starting the interpreter itself, about twice what `--version` takes currently.
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def test_cli_startup(pa_benchmark: Benchmark) -> None:
+    def _interpreter() -> None:
+        subprocess.run([sys.executable, "-c", "pass"], capture_output=True, check=True)
+
+    def _version() -> None:
+        result = subprocess.run([sys.executable, "-c", LAZY_IMPORTS_CODE], capture_output=True, text=True, check=True)
+        # Modules that are only needed for archiving must not be imported
+        assert result.stderr.split() == []
+
+    interpreter = pa_benchmark("interpreter startup", _interpreter)
+    startup = pa_benchmark("cli startup: --version", _version)
+
+    assert startup - interpreter < STARTUP_BUDGET_SECONDS
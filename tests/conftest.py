@@ -3,7 +3,9 @@ from __future__ import annotations
 import os
 import re
 from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Thread
 from typing import Any, Iterable
 
 import feedparser
@@ -25,6 +27,13 @@ FEED_CONTENT_EMPTY = (FIXTURES_DIR / "feed_lautsprecher_empty.xml").read_text()
 FEED_OBJ = feedparser.parse(FEED_CONTENT)
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--pa-benchmark", action="store_true", default=False, help="Run the benchmarks in tests/benchmarks."
+    )
+    parser.addoption("--pa-benchmark-json", metavar="PATH", help="Write benchmark results to a JSON file.")
+
+
 @pytest.fixture(scope="function")
 def responses() -> Iterable[RequestsMock]:
     with RequestsMock() as rsps:
@@ -94,3 +103,43 @@ def episode() -> Episode:
             ),
         ],
     )
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:
+        self._respond(body=False)
+
+    def do_GET(self) -> None:
+        self._respond(body=True)
+
+    def _respond(self, body: bool) -> None:
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file.mp3")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path != "/file.mp3":
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "4")
+        self.send_header("ETag", '"blob"')
+        self.end_headers()
+        if body:
+            self.wfile.write(b"BLOB")
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def local_server() -> Iterable[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LocalHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
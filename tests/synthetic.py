@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlparse
+from xml.sax.saxutils import escape
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+MEDIA_CHUNK = bytes(range(256)) * 256
+DEFAULT_MEDIA_SIZE = 1024
+
+
+# Describes a synthetic feed. Specs are passed to the server as query parameters, so every combination of options can
+# be requested from the same server.
+@dataclass(slots=True, frozen=True)
+class FeedSpec:
+    count: int = 10
+    # Episodes per page, with pages linked through `rel="next"`. All episodes are on a single page if zero.
+    page_size: int = 0
+    media_size: int = DEFAULT_MEDIA_SIZE
+    # Every n-th episode has no enclosure or publishing date, and is not valid.
+    malformed_every: int = 0
+    chapters: int = 0
+
+    @classmethod
+    def from_query(cls, query: str) -> tuple[FeedSpec, int]:
+        params = {key: int(values[0]) for key, values in parse_qs(query).items()}
+        page = params.pop("page", 1)
+        names = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in params.items() if key in names}), page
+
+    def to_query(self, page: int = 1) -> str:
+        defaults = {field.name: field.default for field in fields(self)}
+        params = {key: value for key, value in asdict(self).items() if value != defaults[key]}
+        if page > 1:
+            params["page"] = page
+        return urlencode(params)
+
+    @property
+    def pages(self) -> int:
+        if not self.page_size:
+            return 1
+        return max(-(-self.count // self.page_size), 1)
+
+    def page_range(self, page: int) -> range:
+        if not self.page_size:
+            return range(self.count)
+        return range((page - 1) * self.page_size, min(page * self.page_size, self.count))
+
+    @property
+    def key(self) -> str:
+        # Distinguishes the episodes of different synthetic feeds, which are archived to the same database.
+        return hashlib.sha1(self.to_query().encode(), usedforsecurity=False).hexdigest()[:12]
+
+    def is_malformed(self, idx: int) -> bool:
+        return bool(self.malformed_every) and (idx + 1) % self.malformed_every == 0
+
+
+def generate_chapters(count: int) -> str:
+    if not count:
+        return ""
+    chapters = "".join(
+        f'<psc:chapter start="{idx // 60:02}:{idx % 60:02}:00.000" title="Chapter {idx + 1}"/>' for idx in range(count)
+    )
+    return f'<psc:chapters version="1.2">{chapters}</psc:chapters>'
+
+
+def generate_item(base_url: str, spec: FeedSpec, idx: int) -> str:
+    # Episode 0 is the oldest, and episodes are listed newest first, like in most feeds.
+    number = spec.count - idx - 1
+    if spec.is_malformed(idx):
+        return f"<item><title>Malformed episode {number}</title><pubDate>sometime</pubDate></item>\n"
+
+    published = EPOCH + timedelta(hours=number)
+    media_url = escape(f"{base_url}/media/{number}.mp3?{urlencode({'size': spec.media_size})}")
+    return f"""\
+    <item>
+      <title>Episode {number}</title>
+      <guid isPermaLink="false">synthetic-{spec.key}-{number}</guid>
+      <pubDate>{format_datetime(published)}</pubDate>
+      <itunes:duration>00:42:00</itunes:duration>
+      <description>{escape(f"<p>Shownotes of episode {number}</p>")}</description>
+      <enclosure url="{media_url}" length="{spec.media_size}" type="audio/mpeg"/>
+      {generate_chapters(spec.chapters)}
+    </item>
+"""
+
+
+@lru_cache(maxsize=16)
+def generate_feed(base_url: str, spec: FeedSpec, page: int = 1) -> bytes:
+    items = "".join(generate_item(base_url, spec, idx) for idx in spec.page_range(page))
+    next_link = ""
+    if page < spec.pages:
+        next_link = f'<atom:link rel="next" href="{escape(f"{base_url}/feed.xml?{spec.to_query(page + 1)}")}"/>'
+    return f"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"
+  xmlns:atom="http://www.w3.org/2005/Atom"
+  xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+  xmlns:psc="http://podlove.org/simple-chapters">
+  <channel>
+    <title>Synthetic Podcast {spec.key} ({spec.count} episodes)</title>
+    <link>{base_url}</link>
+    <language>en</language>
+    <itunes:author>Podcast Archiver</itunes:author>
+    {next_link}
+{items}  </channel>
+</rss>
+""".encode()
+
+
+class SyntheticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        try:
+            if parsed.path == "/feed.xml":
+                spec, page = FeedSpec.from_query(parsed.query)
+                self._send(generate_feed(f"http://{self.headers['Host']}", spec, page))
+            elif parsed.path.startswith("/media/"):
+                self._send_media(int(parse_qs(parsed.query).get("size", [DEFAULT_MEDIA_SIZE])[0]))
+            else:
+                self.send_error(404)
+        except ValueError as exc:
+            self.send_error(400, str(exc))
+
+    def _send(self, body: bytes, content_type: str = "application/rss+xml") -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_media(self, size: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        while size > 0:
+            chunk = MEDIA_CHUNK[:size]
+            self.wfile.write(chunk)
+            size -= len(chunk)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class SyntheticServer:
+    server: ThreadingHTTPServer
+
+    __slots__ = ("server",)
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.server = ThreadingHTTPServer((host, port), SyntheticHandler)
+        self.server.daemon_threads = True
+
+    def __enter__(self) -> SyntheticServer:
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def feed_url(self, spec: FeedSpec) -> str:
+        return f"{self.url}/feed.xml?{spec.to_query()}"
+
+
+def main() -> None:
+    # Serves synthetic feeds for load testing, e.g. `python -m tests.synthetic --port 8000`.
+    parser = argparse.ArgumentParser(description="Serve synthetic podcast feeds.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = SyntheticServer(args.host, args.port)
+    example = FeedSpec(count=10_000, page_size=500, media_size=1024 * 1024, malformed_every=100, chapters=5)
+    print(f"Serving synthetic feeds at {server.url}, for example {server.feed_url(example)}")
+    print(f"Parameters: {', '.join(field.name for field in fields(FeedSpec))}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
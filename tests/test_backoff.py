@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable
+from unittest import mock
+
+import pytest
+from requests import HTTPError
+
+from podcast_archiver import constants
+from podcast_archiver.backoff import HostBackoff, parse_retry_after
+from podcast_archiver.download import DownloadJob
+from podcast_archiver.enums import DownloadResult, QueueCompletionType
+from podcast_archiver.probe import probe_enclosure
+from podcast_archiver.processor import FeedProcessor
+from podcast_archiver.scheduler import DownloadScheduler
+from podcast_archiver.session import session
+from podcast_archiver.types import EpisodeResult
+from tests.conftest import FEED_CONTENT, FEED_URL
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from responses import RequestsMock
+
+    from podcast_archiver.models.episode import Episode
+
+URL = "http://nowhere.invalid/file.mp3"
+
+
+@pytest.fixture
+def registry() -> Iterable[HostBackoff]:
+    registry = HostBackoff()
+    with (
+        mock.patch("podcast_archiver.session.backoff", registry),
+        mock.patch("podcast_archiver.scheduler.backoff", registry),
+        mock.patch("podcast_archiver.processor.backoff", registry),
+        mock.patch("podcast_archiver.probe.backoff", registry),
+    ):
+        yield registry
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, None),
+        ("120", 120.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    assert parse_retry_after(value) == expected
+
+
+def test_register(registry: HostBackoff) -> None:
+    assert registry.register(URL, retry_after="30") == 30
+    assert 0 < registry.remaining("http://nowhere.invalid/other.mp3") <= 30
+    assert not registry.remaining("http://elsewhere.invalid/file.mp3")
+
+    registry.clear(URL)
+    assert registry.remaining(URL)
+
+
+def test_register_exponential(registry: HostBackoff) -> None:
+    with mock.patch.object(constants, "BACKOFF_MAX_SECONDS", 12):
+        delays = [registry.register(URL) for _ in range(3)]
+
+    assert delays == [5, 10, 12]
+
+
+def test_session_registers_throttling(registry: HostBackoff, responses: RequestsMock) -> None:
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "30"})
+
+    with pytest.raises(HTTPError):
+        session.get_and_raise(URL)
+
+    assert registry.remaining(URL) > 0
+
+
+def test_scheduler_retries_rate_limited(
+    registry: HostBackoff, responses: RequestsMock, tmp_path: Path, episode: Episode
+) -> None:
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "0"})
+    responses.add(responses.GET, URL, body=b"BLOB")
+    job = DownloadJob(episode.to_record(), target=tmp_path / "file.mp3")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = DownloadScheduler(executor, max_workers=1).submit(job, feed="a").result(timeout=5)
+
+    assert result.result == DownloadResult.COMPLETED_SUCCESSFULLY
+    assert job.attempts == 2
+
+
+def test_scheduler_defers_paused_host(registry: HostBackoff, tmp_path: Path, episode: Episode) -> None:
+    registry.register(URL, retry_after="60")
+    paused = DownloadJob(episode.to_record(), target=tmp_path / "paused.mp3")
+    other_episode = episode.model_copy(update={"guid": "other"})
+    other_episode.enclosure = other_episode.enclosure.model_copy(update={"href": "http://elsewhere.invalid/a.mp3"})
+    other = DownloadJob(other_episode.to_record(), target=tmp_path / "other.mp3")
+
+    def _download(job: DownloadJob) -> EpisodeResult:
+        return EpisodeResult(job.episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+
+    with (
+        ThreadPoolExecutor(max_workers=1) as executor,
+        mock.patch.object(DownloadJob, "__call__", autospec=True, side_effect=_download),
+    ):
+        scheduler = DownloadScheduler(executor, max_workers=1)
+        paused_future = scheduler.submit(paused, feed="a")
+        other_future = scheduler.submit(other, feed="b")
+
+        assert other_future.result(timeout=5).result == DownloadResult.COMPLETED_SUCCESSFULLY
+        assert not paused_future.done()
+        assert len(scheduler) == 1
+
+        scheduler.cancel()
+
+    assert paused_future.result(timeout=5).result == DownloadResult.ABORTED
+
+
+def test_probe_respects_backoff(registry: HostBackoff, responses: RequestsMock) -> None:
+    responses.add(responses.HEAD, URL, status=429, headers={"Retry-After": "30"})
+
+    assert probe_enclosure(URL) is None
+    assert registry.remaining(URL) > 0
+    assert probe_enclosure(URL) is None
+
+    responses.assert_call_count(URL, 1)
+
+
+def test_processor_defers_rate_limited_feed(registry: HostBackoff, responses: RequestsMock, tmp_path_cd: Path) -> None:
+    responses.add(responses.GET, FEED_URL, status=429, headers={"Retry-After": "30"})
+    responses.add(responses.GET, FEED_URL, FEED_CONTENT)
+
+    with mock.patch("podcast_archiver.backoff.time.sleep") as mock_sleep:
+        result = FeedProcessor().process(FEED_URL, dry_run=True)
+
+    assert result.tombstone == QueueCompletionType.DRY_RUN
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 30
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Iterable
+from unittest import mock
+
+import pytest
+
+from podcast_archiver.concurrency import ConcurrencyController
+
+
+@pytest.fixture
+def clock() -> Iterable[mock.Mock]:
+    with mock.patch("podcast_archiver.concurrency.monotonic", return_value=0.0) as mocked:
+        yield mocked
+
+
+def complete_round(controller: ConcurrencyController, clock: mock.Mock, nbytes: int, latency: float = 0.1) -> int:
+    clock.return_value += 1.0
+    controller.receive(nbytes * controller.limit)
+    for _ in range(controller.limit):
+        controller.record("example.com", latency=latency, failed=False, throttled=False)
+    return controller.limit
+
+
+def test_additive_increase(clock: mock.Mock) -> None:
+    controller = ConcurrencyController(4, initial=1)
+
+    assert [complete_round(controller, clock, nbytes=1000) for _ in range(4)] == [2, 3, 4, 4]
+
+
+def test_decrease_on_throughput_drop(clock: mock.Mock) -> None:
+    controller = ConcurrencyController(8, initial=4)
+    complete_round(controller, clock, nbytes=1000)
+
+    assert complete_round(controller, clock, nbytes=100) == 2
+
+
+def test_decrease_on_latency(clock: mock.Mock) -> None:
+    controller = ConcurrencyController(8, initial=4)
+    complete_round(controller, clock, nbytes=1000, latency=0.1)
+
+    assert complete_round(controller, clock, nbytes=1000, latency=1.0) == 2
+
+
+def test_decrease_when_throttled(clock: mock.Mock) -> None:
+    controller = ConcurrencyController(8, initial=8)
+
+    assert controller.record("example.com", latency=None, failed=True, throttled=True) == 4
+
+
+def test_decrease_on_error_rate(clock: mock.Mock) -> None:
+    controller = ConcurrencyController(8, initial=8)
+
+    assert controller.record("example.com", latency=None, failed=True, throttled=False) == 8
+    assert controller.record("other.com", latency=None, failed=True, throttled=False) == 8
+    assert controller.record("example.com", latency=None, failed=True, throttled=False) == 4
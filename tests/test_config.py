@@ -53,3 +53,23 @@ def test_load_nonexistent(tmp_path_cd: Path) -> None:
 
     with pytest.raises(FileNotFoundError):
         Settings.load_from_yaml(configfile)
+
+
+@pytest.mark.parametrize(
+    "feed_weights",
+    [
+        {DUMMY_FEED: 3},
+        [f"{DUMMY_FEED}=3"],
+    ],
+)
+def test_feed_weights(feed_weights: dict[str, int] | list[str]) -> None:
+    settings = Settings.load_from_dict({"feed_weights": feed_weights})
+
+    assert settings.feed_weights == {DUMMY_FEED: 3}
+    assert settings.model_dump()["feed_weights"] == [f"{DUMMY_FEED}=3"]
+
+
+@pytest.mark.parametrize("feed_weight", [DUMMY_FEED, f"{DUMMY_FEED}=0", f"{DUMMY_FEED}=many"])
+def test_feed_weights_invalid(feed_weight: str) -> None:
+    with pytest.raises(InvalidSettings):
+        Settings.load_from_dict({"feed_weights": [feed_weight]})
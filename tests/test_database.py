@@ -16,30 +16,33 @@ def test_dummy(tmp_path_cd: Path, episode: Episode) -> None:
     db = DummyDatabase("db.db", ignore_existing=False)
 
     assert not (tmp_path_cd / "db.db").is_file()
-    assert not db.exists(episode)
-    db.add(episode)
-    assert not db.exists(episode)
-    db.add(episode)
-    assert not db.exists(episode)
+    assert not db.exists(episode.to_record())
+    db.add(episode.to_record())
+    assert not db.exists(episode.to_record())
+    db.add(episode.to_record())
+    assert not db.exists(episode.to_record())
 
 
 def test_add(tmp_path_cd: Path, episode: Episode) -> None:
     db = Database("db.db", ignore_existing=False)
 
     assert (tmp_path_cd / "db.db").is_file()
-    assert not db.exists(episode)
-    db.add(episode)
-    assert db.exists(episode)
-    db.add(episode)
-    assert db.exists(episode)
+    assert not db.exists(episode.to_record())
+    db.add(episode.to_record())
+    assert db.exists(episode.to_record())
+    db.add(episode.to_record(), feed="https://example.com/feed.xml")
+    db.add(episode.to_record())
+    existing = db.exists(episode.to_record())
+    assert existing
+    assert existing.feed == "https://example.com/feed.xml"
 
 
 def test_add_ignore_existing(tmp_path_cd: Path, episode: Episode) -> None:
     db = Database("db.db", ignore_existing=True)
 
-    assert not db.exists(episode)
-    db.add(episode)
-    assert not db.exists(episode)
+    assert not db.exists(episode.to_record())
+    db.add(episode.to_record())
+    assert not db.exists(episode.to_record())
 
 
 def test_migrate_idempotency(tmp_path_cd: Path) -> None:
@@ -65,3 +68,38 @@ def test_get_database(
 
     assert db.filename == expected_result_path
     assert (tmp_path_cd / "podcast-archiver.db").is_file() == (expected_result_path != ":memory:")
+
+
+def test_add_checksum(tmp_path_cd: Path, episode: Episode) -> None:
+    db = Database("db.db", ignore_existing=False)
+
+    db.add(episode.to_record(), checksum="abc123")
+    existing = db.exists(episode.to_record())
+    assert existing
+    assert existing.checksum == "abc123"
+
+    # Re-adding without a checksum must not discard the known one
+    db.add(episode.to_record())
+    existing = db.exists(episode.to_record())
+    assert existing
+    assert existing.checksum == "abc123"
+
+
+def test_find_duplicate(tmp_path_cd: Path, episode: Episode) -> None:
+    db = Database("db.db", ignore_existing=False)
+    existing = tmp_path_cd / "existing.mp3"
+    other = episode.model_copy(update={"guid": "other"}).to_record()
+
+    db.add(episode.to_record(), checksum="abc123", path=existing)
+    assert not db.find_duplicate(other), "file does not exist on disk"
+
+    existing.touch()
+    by_url = db.find_duplicate(other)
+    assert by_url
+    assert by_url.path == existing
+    by_checksum = db.find_duplicate(other, checksum="abc123")
+    assert by_checksum
+    assert by_checksum.path == existing
+
+    assert not db.find_duplicate(other, checksum="def456")
+    assert not db.find_duplicate(episode.to_record()), "episode is not a duplicate of itself"
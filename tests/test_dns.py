@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import socket
+from typing import Iterable
+from unittest import mock
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from podcast_archiver.config import Settings
+from podcast_archiver.dns import DnsCache
+from podcast_archiver.processor import FeedProcessor
+from podcast_archiver.session import ArchiverSession
+
+ADDRINFO = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 443))]
+
+
+@pytest.fixture
+def clock() -> Iterable[mock.Mock]:
+    with mock.patch("podcast_archiver.dns.monotonic", return_value=0.0) as mocked:
+        yield mocked
+
+
+def test_cache_expires(clock: mock.Mock) -> None:
+    cache = DnsCache(ttl=60)
+    with mock.patch.object(cache, "_getaddrinfo", return_value=ADDRINFO) as resolver:
+        assert cache.getaddrinfo("example.com", 443) == ADDRINFO
+        assert cache.getaddrinfo("example.com", 443) == ADDRINFO
+        assert resolver.call_count == 1
+
+        clock.return_value = 61.0
+        cache.getaddrinfo("example.com", 443)
+        assert resolver.call_count == 2
+
+
+def test_cache_evicts_expired(clock: mock.Mock) -> None:
+    cache = DnsCache(ttl=60)
+    with mock.patch.object(cache, "_getaddrinfo", return_value=ADDRINFO):
+        cache.getaddrinfo("a.example.com", 443)
+        cache.getaddrinfo("b.example.com", 443)
+
+        clock.return_value = 61.0
+        cache.getaddrinfo("c.example.com", 443)
+
+    assert [key[0] for key in cache._entries] == ["c.example.com"]
+
+
+def test_cache_errors_not_cached() -> None:
+    cache = DnsCache(ttl=60)
+    with (
+        mock.patch.object(cache, "_getaddrinfo", side_effect=socket.gaierror) as resolver,
+        pytest.raises(socket.gaierror),
+    ):
+        cache.getaddrinfo("example.invalid", 443)
+
+    assert not cache.resolve("example.invalid", 443)
+    assert resolver.call_count == 1
+
+
+def test_configure_installs_cache() -> None:
+    original = socket.getaddrinfo
+    cache = DnsCache()
+    try:
+        cache.configure(ttl=60)
+        assert cache.is_installed
+    finally:
+        cache.uninstall()
+
+    assert socket.getaddrinfo is original
+
+
+def test_cache_disabled_by_default() -> None:
+    original = socket.getaddrinfo
+    FeedProcessor(Settings())
+
+    assert socket.getaddrinfo is original
+
+
+def test_shutdown_uninstalls_cache() -> None:
+    original = socket.getaddrinfo
+    proc = FeedProcessor(Settings(dns_cache_ttl=60))
+    assert socket.getaddrinfo is not original
+
+    proc.shutdown()
+    assert socket.getaddrinfo is original
+
+
+@pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+def test_preconnect(local_server: str) -> None:
+    session = ArchiverSession()
+    adapter = session.get_adapter(local_server)
+    assert isinstance(adapter, HTTPAdapter)
+    pools = adapter.poolmanager.pools
+
+    def connections() -> int:
+        # The pools container cannot be iterated directly
+        return sum(pools[key].num_connections for key in pools.keys())  # noqa: SIM118
+
+    session.preconnect(f"{local_server}/file.mp3")
+    assert connections() == 1
+
+    assert session.get_and_raise(f"{local_server}/file.mp3").content == b"BLOB"
+    assert connections() == 1
+
+
+def test_warm_up_per_origin() -> None:
+    proc = FeedProcessor(Settings(warm_up=True))
+    urls = ["https://example.com/a.xml", "https://example.com/b.xml", "http://example.com/c.xml"]
+
+    with (
+        mock.patch.object(DnsCache, "resolve", return_value=True) as resolve,
+        mock.patch("podcast_archiver.processor.session.preconnect") as preconnect,
+    ):
+        proc.warm_up(urls)
+
+    assert sorted(call.args for call in resolve.call_args_list) == [("example.com", 80), ("example.com", 443)]
+    assert sorted(call.args for call in preconnect.call_args_list) == [(urls[2],), (urls[0],)]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from functools import partial
 from pathlib import Path
@@ -18,15 +19,22 @@ from tests.conftest import MEDIA_URL
 if TYPE_CHECKING:
     from responses import RequestsMock
 
+BLOB_CHECKSUM = hashlib.sha256(b"BLOB").hexdigest()
+
 
 def test_download_job(tmp_path_cd: Path, feedobj_lautsprecher: dict[str, Any]) -> None:
     feed = FeedPage.model_validate(feedobj_lautsprecher)
     episode = feed.episodes[0]
     assert episode
-    job = download.DownloadJob(episode=episode, target=Path("file.mp3"))
+    on_receive = mock.Mock()
+    job = download.DownloadJob(episode=episode.to_record(), target=Path("file.mp3"), on_receive=on_receive)
     result = job()
 
-    assert result == EpisodeResult(episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+    assert result == EpisodeResult(
+        episode.to_record(), DownloadResult.COMPLETED_SUCCESSFULLY, checksum=BLOB_CHECKSUM, target=job.target
+    )
+    assert result.checksum == hashlib.sha256(job.target.read_bytes()).hexdigest()
+    on_receive.assert_called_once_with(len(b"BLOB"))
 
 
 def test_download_already_exists(tmp_path_cd: Path, feedobj_lautsprecher: dict[str, Any]) -> None:
@@ -34,13 +42,15 @@ def test_download_already_exists(tmp_path_cd: Path, feedobj_lautsprecher: dict[s
     episode = feed.episodes[0]
     assert episode
 
-    job = download.DownloadJob(episode=episode, target=Path("file.mp3"))
+    job = download.DownloadJob(episode=episode.to_record(), target=Path("file.mp3"))
     job.target.parent.mkdir(exist_ok=True)
     job.target.touch()
     result = job()
 
     # behavioral change: DownloadJob no longer cares if the file exists; relies on DB only.
-    assert result == EpisodeResult(episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+    assert result == EpisodeResult(
+        episode.to_record(), DownloadResult.COMPLETED_SUCCESSFULLY, checksum=BLOB_CHECKSUM, target=job.target
+    )
 
 
 def test_download_partial(
@@ -52,13 +62,18 @@ def test_download_partial(
     episode = feed.episodes[0]
     assert episode
 
-    job = download.DownloadJob(episode=episode, target=Path("file.mp3"), max_download_bytes=2)
+    job = download.DownloadJob(episode=episode.to_record(), target=Path("file.mp3"), max_download_bytes=2)
     with caplog.at_level(logging.DEBUG, "podcast_archiver"):
         result = job()
 
-    assert result == EpisodeResult(episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+    assert result == EpisodeResult(
+        episode.to_record(),
+        DownloadResult.COMPLETED_SUCCESSFULLY,
+        checksum=hashlib.sha256(b"BL").hexdigest(),
+        target=job.target,
+    )
     assert "Partial download of first 2 bytes completed." in caplog.messages
-    assert len(job.target.read_bytes())
+    assert job.target.read_bytes() == b"BL"
 
 
 def test_download_aborted(tmp_path_cd: Path, feedobj_lautsprecher: dict[str, Any]) -> None:
@@ -66,11 +81,11 @@ def test_download_aborted(tmp_path_cd: Path, feedobj_lautsprecher: dict[str, Any
     episode = feed.episodes[0]
     assert episode
 
-    job = download.DownloadJob(episode=episode, target=Path("file.mp3"))
+    job = download.DownloadJob(episode=episode.to_record(), target=Path("file.mp3"))
     job.stop_event.set()
     result = job()
 
-    assert result == EpisodeResult(episode, DownloadResult.ABORTED)
+    assert result == EpisodeResult(episode.to_record(), DownloadResult.ABORTED)
 
 
 class PartialObjectMock(Protocol):
@@ -100,11 +115,11 @@ def test_download_failed(
         responses.add(responses.GET, MEDIA_URL, b"BLOB")
     assert episode
 
-    job = download.DownloadJob(episode=episode, target=Path("file.mp3"))
+    job = download.DownloadJob(episode=episode.to_record(), target=Path("file.mp3"))
     with failure_mode(side_effect=side_effect), caplog.at_level(logging.DEBUG):
         result = job()
 
-    assert result == EpisodeResult(episode, DownloadResult.FAILED)
+    assert result == EpisodeResult(episode.to_record(), DownloadResult.FAILED)
     failure_rec = None
     for record in caplog.records:
         if record.message.startswith("Download failed: "):
@@ -132,8 +147,13 @@ def test_download_info_json(tmp_path_cd: Path, feedobj_lautsprecher: dict[str, A
     episode = feed.episodes[0]
     assert episode
 
-    job = download.DownloadJob(episode=episode, target=tmp_path_cd / "file.mp3", add_info_json=write_info_json)
+    record = episode.to_record(keep_full=write_info_json)
+    job = download.DownloadJob(episode=record, target=tmp_path_cd / "file.mp3", add_info_json=write_info_json)
     result = job()
 
-    assert result == EpisodeResult(episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+    assert result == EpisodeResult(
+        record, DownloadResult.COMPLETED_SUCCESSFULLY, checksum=BLOB_CHECKSUM, target=job.target
+    )
     assert job.infojsonfile.exists() == write_info_json
+    if write_info_json:
+        assert job.infojsonfile.read_text() == episode.model_dump_json(indent=2) + "\n"
@@ -50,3 +50,22 @@ def test_filename_formatting(fname_tmpl: str, slugify: bool, expected_fname: str
     result = formatter.format(episode, feed_info=FEED_INFO)
 
     assert str(result) == expected_fname
+
+
+@pytest.mark.parametrize(
+    "fname_tmpl,compiled",
+    [
+        ("{show.title}/{episode.published_time:%Y-%m-%d} - {episode.title!r}.{ext}", True),
+        ("{show.title}/{episode.links[0].href}", False),
+        ("{show.title}/{episode.published_time:%Y {show.language}}", False),
+    ],
+)
+def test_filename_formatting_compiled(fname_tmpl: str, compiled: bool, episode: Episode) -> None:
+    formatter = FilenameFormatter(settings=Settings(filename_template=fname_tmpl))
+    other_show = FEED_INFO.model_copy(update={"title": "Other Show"})
+
+    assert (formatter._parsed is not None) == compiled
+    for feed_info in (FEED_INFO, other_show, FEED_INFO):
+        kwargs = {"episode": episode, "show": feed_info, "ext": episode.ext}
+        expected = formatter._path_root / formatter.vformat(fname_tmpl, args=(), kwargs=kwargs)
+        assert formatter.format(episode, feed_info=feed_info) == expected
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import mock
+
+from podcast_archiver import constants
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.database import Database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_import_existing(tmp_path_cd: Path, feed_lautsprecher: str) -> None:
+    PodcastArchiver(
+        Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher], database=tmp_path_cd / "db.db")
+    ).run()
+    files = sorted(tmp_path_cd.glob("**/*.m4a"))
+    files[0].unlink()
+
+    database = Database(str(tmp_path_cd / "new.db"), ignore_existing=False)
+    pa = PodcastArchiver(Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher]), database=database)
+    with (
+        mock.patch.object(constants, "IMPORT_BATCH_SIZE", 2),
+        mock.patch.object(Database, "add_many", autospec=True, side_effect=Database.add_many) as add_many,
+    ):
+        assert pa.import_existing() == len(files) - 1
+
+    assert [len(call.args[1]) for call in add_many.call_args_list] == [2, 2, 0]
+    archived = {episode.path: episode for episode in database.iter_archived()}
+    assert set(archived) == {path.absolute() for path in files[1:]}
+    assert all(episode.size == 4 for episode in archived.values())
+
+    assert pa.import_existing() == 0
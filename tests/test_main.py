@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from os import environ
 from pathlib import Path
 from unittest.mock import patch
@@ -7,7 +9,8 @@ import pytest
 from pydantic_core import Url
 
 from podcast_archiver import __version__ as version
-from podcast_archiver import cli
+from podcast_archiver import cli, constants
+from podcast_archiver.base import PodcastArchiver
 
 
 def test_main(tmp_path_cd: Path, feed_lautsprecher: Url) -> None:
@@ -108,3 +111,69 @@ def test_main_config_file_generate(tmp_path_cd: Path, capsys: pytest.CaptureFixt
     assert "feeds: []\n" in captured.out
     assert "# Field 'archive_directory': " in captured.out
     assert 'archive_directory: "."\n' in captured.out
+
+
+def test_main_verify_repair(tmp_path_cd: Path, feed_lautsprecher: Url, caplog: pytest.LogCaptureFixture) -> None:
+    cli.main(["--feed", feed_lautsprecher, "-d", tmp_path_cd], standalone_mode=False)
+    truncated, *_ = sorted(tmp_path_cd.glob("**/*.m4a"))
+    truncated.write_bytes(b"BL")
+
+    assert cli.main(["--verify", "-d", tmp_path_cd], standalone_mode=False) == 1
+    assert "Truncated" in caplog.text
+    assert truncated.read_bytes() == b"BL"
+
+    assert (
+        cli.main(["--feed", feed_lautsprecher, "--verify", "--repair", "-d", tmp_path_cd], standalone_mode=False) == 0
+    )
+    assert truncated.read_bytes() == b"BLOB"
+    assert cli.main(["--verify", "-d", tmp_path_cd], standalone_mode=False) == 0
+
+
+def test_main_repair_requires_verify(tmp_path_cd: Path) -> None:
+    with pytest.raises(click.UsageError, match="--repair requires"):
+        cli.main(["--feed", "http://nowhere.invalid/feed.xml", "--repair", "-d", tmp_path_cd], standalone_mode=False)
+
+
+def test_main_repair_requires_feeds(tmp_path_cd: Path) -> None:
+    with pytest.raises(click.UsageError, match="--repair requires feeds"):
+        cli.main(["--verify", "--repair", "-d", tmp_path_cd], standalone_mode=False)
+
+
+def test_main_import_existing(tmp_path_cd: Path) -> None:
+    feed = "http://nowhere.invalid/feed.xml"
+    with patch.object(PodcastArchiver, "import_existing", return_value=1) as import_existing:
+        assert cli.main(["--feed", feed, "--import-existing", "-d", tmp_path_cd], standalone_mode=False) == 0
+    import_existing.assert_called_once_with()
+
+    with pytest.raises(click.UsageError, match="--import-existing cannot"):
+        cli.main(["--feed", feed, "--import-existing", "--verify"], standalone_mode=False)
+
+
+def test_main_profile(tmp_path_cd: Path) -> None:
+    with patch.object(PodcastArchiver, "run", return_value=0, autospec=True) as run:
+        cli.main(["--feed", "http://nowhere.invalid/feed.xml", "--profile", "run.prof"], standalone_mode=False)
+
+    pa = run.call_args.args[0]
+    assert pa.profiler
+    assert pa.profiler.path == Path("run.prof")
+
+
+# Heavy modules only needed once archiving starts, which must not slow down starting the CLI.
+LAZY_MODULES = ("feedparser", "httpx", "requests", "rich.logging", "rich.progress", "podcast_archiver.processor")
+
+LAZY_IMPORTS_CODE = f"""\
+import sys
+from podcast_archiver import cli
+try:
+    cli.main(["--version"])
+except SystemExit:
+    pass
+print(*(name for name in {LAZY_MODULES!r} if name in sys.modules), file=sys.stderr)
+"""
+
+
+def test_main_lazy_imports() -> None:
+    result = subprocess.run([sys.executable, "-c", LAZY_IMPORTS_CODE], capture_output=True, text=True, check=True)
+
+    assert result.stdout.startswith(constants.PROG_NAME)
+    assert result.stderr.split() == []
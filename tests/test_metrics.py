@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.metrics import Counter, Gauge, Histogram, MetricsServer, metrics
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_counter_and_gauge() -> None:
+    counter = Counter("things_total", "Things.", labels=("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind='b"c')
+    gauge = Gauge("level", "Level.")
+    gauge.inc(3)
+    gauge.dec()
+
+    assert list(counter.render()) == [
+        "# HELP podcast_archiver_things_total Things.",
+        "# TYPE podcast_archiver_things_total counter",
+        'podcast_archiver_things_total{kind="a"} 1.0',
+        'podcast_archiver_things_total{kind="b\\"c"} 2.0',
+    ]
+    assert list(gauge.samples()) == ["podcast_archiver_level 2.0"]
+
+    gauge.set_function(lambda: 7)
+    assert list(gauge.samples()) == ["podcast_archiver_level 7.0"]
+
+
+def test_histogram() -> None:
+    histogram = Histogram("duration_seconds", "Duration.", labels=("stage",), buckets=(1, 0.1))
+    histogram.observe(0.05, stage="fetch")
+    histogram.observe(0.5, stage="fetch")
+    histogram.observe(5, stage="fetch")
+
+    assert list(histogram.samples()) == [
+        'podcast_archiver_duration_seconds_bucket{stage="fetch",le="0.1"} 1',
+        'podcast_archiver_duration_seconds_bucket{stage="fetch",le="1.0"} 2',
+        'podcast_archiver_duration_seconds_bucket{stage="fetch",le="+Inf"} 3',
+        'podcast_archiver_duration_seconds_sum{stage="fetch"} 5.55',
+        'podcast_archiver_duration_seconds_count{stage="fetch"} 3',
+    ]
+
+
+def test_run_metrics(tmp_path_cd: Path, feed_lautsprecher: str) -> None:
+    settings = Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher], quiet=True)
+    downloaded = metrics.downloaded_bytes._values.get((), 0)
+    PodcastArchiver(settings).run()
+
+    assert metrics.downloaded_bytes._values[()] - downloaded == sum(
+        path.stat().st_size for path in tmp_path_cd.glob("**/*.m4a")
+    )
+    rendered = metrics.render()
+    assert 'podcast_archiver_downloads_total{result="completed_successfully"}' in rendered
+    assert 'podcast_archiver_feed_responses_total{status="200"}' in rendered
+    assert 'podcast_archiver_stage_duration_seconds_count{stage="download"}' in rendered
+    assert "podcast_archiver_queued_downloads 0.0" in rendered
+    assert "podcast_archiver_active_downloads 0.0" in rendered
+
+
+@pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+def test_metrics_server() -> None:
+    server = MetricsServer()
+    server.start("127.0.0.1", 0)
+    try:
+        assert server.url
+        response = requests.get(server.url, timeout=5)
+        missing = requests.get(server.url.replace("/metrics", "/other"), timeout=5)
+    finally:
+        server.stop()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert "# TYPE podcast_archiver_downloaded_bytes_total counter" in response.text
+    assert missing.status_code == 404
+    assert server.url is None
@@ -3,16 +3,19 @@ from __future__ import annotations
 import time
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Protocol
+from unittest import mock
 
 import pytest
 from pydantic import ValidationError
 from responses import RequestsMock
 
-from podcast_archiver.exceptions import NotModified, NotSupported
+from podcast_archiver.exceptions import MalformedFeed, NotModified, NotSupported
 from podcast_archiver.models.episode import Episode
-from podcast_archiver.models.feed import Feed, FeedInfo, FeedPage
+from podcast_archiver.models.feed import Feed, FeedInfo, FeedPage, parse_page
+from podcast_archiver.parsing import ParserPool
 from podcast_archiver.utils import MIMETYPE_EXTENSION_MAPPING
 from tests.conftest import FEED_CONTENT
+from tests.synthetic import FeedSpec, SyntheticServer, generate_feed
 
 if TYPE_CHECKING:
     from typing_extensions import TypedDict
@@ -233,3 +236,73 @@ def test_feed_with_known_info_updated_time_empty(constructor: FeedConstructor, f
     with RequestsMock() as responses:
         responses.get(feed_lautsprecher_onlyfeed, FEED_CONTENT)
         assert constructor(feed_lautsprecher_onlyfeed, known_info=info)
+
+
+def test_parse_page_compact() -> None:
+    page = parse_page(FEED_CONTENT)
+
+    assert not page.bozo
+    assert page.episodes
+    assert all(isinstance(episode, Episode) and episode.content is None for episode in page.episodes)
+
+
+def test_parse_page_malformed() -> None:
+    page = parse_page("<rss><channel><title>Broken</channel>")
+
+    assert page.bozo
+    assert isinstance(page.bozo_exception, MalformedFeed)
+
+
+def test_parse_feed_in_process_pool() -> None:
+    pool = ParserPool()
+    pool.configure(1)
+    try:
+        with mock.patch("podcast_archiver.models.feed.parser_pool", pool):
+            page = FeedPage.parse_feed(FEED_CONTENT, alt_url=None)
+    finally:
+        pool.shutdown()
+
+    assert page == parse_page(FEED_CONTENT)
+
+
+def test_episode_record(episode: Episode) -> None:
+    record = episode.to_record()
+
+    assert (record.guid, record.title, record.enclosure) == (episode.guid, episode.title, episode.enclosure)
+    assert str(record) == str(episode)
+    assert record.full is None
+    assert episode.to_record(keep_full=True).materialize() is episode
+
+    materialized = record.materialize()
+    assert (materialized.guid, materialized.published_time) == (episode.guid, episode.published_time)
+    assert materialized.enclosure == episode.enclosure
+
+
+def test_parse_synthetic_malformed_and_chapters() -> None:
+    spec = FeedSpec(count=6, malformed_every=3, chapters=2)
+    page = parse_page(generate_feed("http://127.0.0.1", spec))
+
+    assert [episode.title if episode else None for episode in page.episodes] == [
+        "Episode 5",
+        "Episode 4",
+        None,
+        "Episode 2",
+        "Episode 1",
+        None,
+    ]
+    episode = page.episodes[0]
+    assert isinstance(episode, Episode)
+    assert episode.chapters
+    assert [chapter.title for chapter in episode.chapters] == ["Chapter 1", "Chapter 2"]
+
+
+@pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+def test_feed_synthetic_pagination() -> None:
+    spec = FeedSpec(count=25, page_size=10)
+    with SyntheticServer() as server:
+        episodes = list(Feed(server.feed_url(spec), known_info=None).episodes)
+
+    assert [episode.guid for episode in episodes if episode] == [
+        f"synthetic-{spec.key}-{idx}" for idx in reversed(range(25))
+    ]
+    assert spec.key != FeedSpec(count=25).key
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from podcast_archiver.probe import ProbeResult, probe_enclosure
+
+if TYPE_CHECKING:
+    from responses import RequestsMock
+
+URL = "https://cdn.example.com/episode.mp3"
+
+
+def test_probe_head(responses: RequestsMock) -> None:
+    responses.add(responses.HEAD, URL, headers={"Content-Length": "1234", "ETag": '"abc"'})
+
+    assert probe_enclosure(URL) == ProbeResult(url=URL, length=1234, etag='"abc"')
+
+
+def test_probe_head_redirect(responses: RequestsMock) -> None:
+    final_url = "https://cdn2.example.com/episode.mp3"
+    responses.add(responses.HEAD, URL, status=302, headers={"Location": final_url})
+    responses.add(responses.HEAD, final_url, headers={"Content-Length": "1234"})
+
+    assert probe_enclosure(URL) == ProbeResult(url=final_url, length=1234)
+
+
+def test_probe_range_fallback(responses: RequestsMock) -> None:
+    responses.add(responses.HEAD, URL, status=405)
+    responses.add(
+        responses.GET,
+        URL,
+        status=206,
+        body=b"B",
+        headers={"Content-Range": "bytes 0-0/4321", "ETag": '"def"'},
+    )
+
+    assert probe_enclosure(URL) == ProbeResult(url=URL, length=4321, etag='"def"')
+    assert responses.calls[-1].request.headers["Range"] == "bytes=0-0"
+
+
+def test_probe_failure(responses: RequestsMock) -> None:
+    responses.add(responses.HEAD, URL, status=404)
+    responses.add(responses.GET, URL, status=404)
+
+    assert probe_enclosure(URL) is None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -9,11 +10,16 @@ from unittest.mock import patch
 import pytest
 
 from podcast_archiver import compat
-from podcast_archiver.database import Database, EpisodeInDb
+from podcast_archiver.config import Settings
+from podcast_archiver.database import Database, EpisodeInDb, RetryInDb
+from podcast_archiver.download import DownloadJob
 from podcast_archiver.enums import DownloadResult, QueueCompletionType
-from podcast_archiver.models.feed import FeedPage
+from podcast_archiver.models.feed import FeedInfo, FeedPage
+from podcast_archiver.models.misc import Link
+from podcast_archiver.parsing import parser_pool
 from podcast_archiver.processor import FeedProcessor
-from podcast_archiver.types import EpisodeResult, ProcessingResult
+from podcast_archiver.types import EnqueuedFeed, EpisodeResult, ProcessingResult
+from podcast_archiver.utils.pretty_printing import PrettyPrintEpisodeRange
 
 if TYPE_CHECKING:
     from pydantic_core import Url
@@ -50,7 +56,7 @@ def test_preflight_check(
     if file_exists:
         target.touch()
     with patch.object(Database, "exists", return_value=database_exists):
-        result = proc._does_already_exist(episode, target=target)
+        result = proc._does_already_exist(episode.to_record(), target=target)
 
     assert result == expected_result
 
@@ -67,18 +73,22 @@ def test_retrieve_failure(responses: RequestsMock) -> None:
 def test_download_success(tmp_path_cd: Path, feed_lautsprecher: str) -> None:
     proc = FeedProcessor()
 
-    result = proc.process(feed_lautsprecher)
+    with patch.object(PrettyPrintEpisodeRange, "update", autospec=True) as mock_update:
+        result = proc.process(feed_lautsprecher)
 
     assert result != ProcessingResult(None, QueueCompletionType.COMPLETED)
     assert result.success == 5
     assert result.feed
     assert result.feed.url == feed_lautsprecher
+    # Downloaded episodes are reported individually, not in the overview of missing episodes
+    mock_update.assert_not_called()
 
 
 def test_download_dry_run(tmp_path_cd: Path, feed_lautsprecher_onlyfeed: str) -> None:
     proc = FeedProcessor()
 
-    result = proc.process(feed_lautsprecher_onlyfeed, dry_run=True)
+    with patch.object(PrettyPrintEpisodeRange, "update", autospec=True) as mock_update:
+        result = proc.process(feed_lautsprecher_onlyfeed, dry_run=True)
 
     assert result != ProcessingResult(None, QueueCompletionType.COMPLETED)
     assert result.success == 0
@@ -87,13 +97,14 @@ def test_download_dry_run(tmp_path_cd: Path, feed_lautsprecher_onlyfeed: str) ->
     assert result.feed.url == feed_lautsprecher_onlyfeed
     assert result.tombstone == QueueCompletionType.DRY_RUN
     assert not list(tmp_path_cd.rglob("*.m4a"))
+    assert mock_update.call_count == 5
 
 
 def test_handle_results_mixed(episode: Episode) -> None:
     proc = FeedProcessor()
     episodes: EpisodeResultsList = [
-        EpisodeResult(episode=episode, result=DownloadResult.COMPLETED_SUCCESSFULLY),
-        EpisodeResult(episode=episode, result=DownloadResult.FAILED),
+        EpisodeResult(episode=episode.to_record(), result=DownloadResult.COMPLETED_SUCCESSFULLY),
+        EpisodeResult(episode=episode.to_record(), result=DownloadResult.FAILED),
     ]
 
     with mock.patch.object(Database, "add", return_value=None) as mock_add:
@@ -107,8 +118,8 @@ def test_handle_results_mixed(episode: Episode) -> None:
 def test_handle_results_mixed_dry_run(episode: Episode) -> None:
     proc = FeedProcessor()
     episodes: EpisodeResultsList = [
-        EpisodeResult(episode=episode, result=DownloadResult.ALREADY_EXISTS),
-        EpisodeResult(episode=episode, result=DownloadResult.MISSING, is_eager=True),
+        EpisodeResult(episode=episode.to_record(), result=DownloadResult.ALREADY_EXISTS),
+        EpisodeResult(episode=episode.to_record(), result=DownloadResult.MISSING, is_eager=True),
     ]
 
     with mock.patch.object(Database, "add", return_value=None) as mock_add:
@@ -121,7 +132,7 @@ def test_handle_results_mixed_dry_run(episode: Episode) -> None:
 
 def test_handle_results_failure(episode: Episode) -> None:
     proc = FeedProcessor()
-    episodes: EpisodeResultsList = [EpisodeResult(episode=episode, result=DownloadResult.ABORTED)]
+    episodes: EpisodeResultsList = [EpisodeResult(episode=episode.to_record(), result=DownloadResult.ABORTED)]
 
     with mock.patch.object(Database, "add", return_value=None) as mock_add:
         success, failures = proc._handle_results(episodes)
@@ -133,7 +144,7 @@ def test_handle_results_failure(episode: Episode) -> None:
 
 def test_handle_results_failed_future(episode: Episode) -> None:
     proc = FeedProcessor()
-    episodes: EpisodeResultsList = [EpisodeResult(episode=episode, result=DownloadResult.ABORTED)]
+    episodes: EpisodeResultsList = [EpisodeResult(episode=episode.to_record(), result=DownloadResult.ABORTED)]
 
     with mock.patch.object(Database, "add", return_value=None) as mock_add:
         success, failures = proc._handle_results(episodes)
@@ -141,3 +152,164 @@ def test_handle_results_failed_future(episode: Episode) -> None:
     assert success == 0
     assert failures == 1
     mock_add.assert_not_called()
+
+
+def test_deduplicate_by_enclosure(tmp_path_cd: Path, episode: Episode) -> None:
+    existing = tmp_path_cd / "existing.mp3"
+    existing.write_bytes(b"BLOB")
+    database = Database(":memory:", ignore_existing=False)
+    database.add(episode.to_record(), checksum="abc123", path=existing)
+    proc = FeedProcessor(Settings(archive_directory=tmp_path_cd, deduplicate=True), database=database)
+    republished = episode.model_copy(update={"guid": "republished"})
+
+    job = proc._enqueue_episode(republished, FeedInfo(title="Other Show"), dry_run=False)
+    assert isinstance(job, DownloadJob)
+    result = job()
+
+    assert result.result == DownloadResult.LINKED
+    assert result.checksum == "abc123"
+    assert result.target
+    assert result.target.samefile(existing)
+
+
+def test_deduplicate_by_checksum(tmp_path_cd: Path, episode: Episode) -> None:
+    existing = tmp_path_cd / "existing.mp3"
+    existing.write_bytes(b"BLOB")
+    downloaded = tmp_path_cd / "downloaded.mp3"
+    downloaded.write_bytes(b"BLOB")
+    database = Database(":memory:", ignore_existing=False)
+    database.add(episode.to_record(), checksum="abc123", path=existing)
+    proc = FeedProcessor(Settings(archive_directory=tmp_path_cd, deduplicate=True), database=database)
+    other = episode.model_copy(update={"guid": "other"})
+    other.enclosure = Link(rel="enclosure", link_type="audio/mpeg", href="http://elsewhere.invalid/file.mp3")
+    episodes: EpisodeResultsList = [
+        EpisodeResult(other.to_record(), DownloadResult.COMPLETED_SUCCESSFULLY, checksum="abc123", target=downloaded),
+    ]
+
+    success, failures = proc._handle_results(episodes)
+
+    assert (success, failures) == (1, 0)
+    assert downloaded.samefile(existing)
+    in_db = database.exists(other.to_record())
+    assert in_db
+    assert in_db.path == downloaded.absolute()
+
+
+def test_deduplicate_disabled(tmp_path_cd: Path, episode: Episode) -> None:
+    existing = tmp_path_cd / "existing.mp3"
+    existing.write_bytes(b"BLOB")
+    database = Database(":memory:", ignore_existing=False)
+    database.add(episode.to_record(), checksum="abc123", path=existing)
+    proc = FeedProcessor(Settings(archive_directory=tmp_path_cd), database=database)
+
+    assert not proc._find_duplicate(
+        episode.model_copy(update={"guid": "other"}).to_record(), target=tmp_path_cd / "new.mp3"
+    )
+
+
+def test_probe_unchanged_on_server(tmp_path_cd: Path, episode: Episode, responses: RequestsMock) -> None:
+    database = Database(":memory:", ignore_existing=False)
+    database.add(episode.to_record(), etag='"abc"')
+    proc = FeedProcessor(Settings(probe_enclosures=True), database=database)
+    republished = episode.model_copy(update={"published_time": datetime(2999, 1, 1, tzinfo=compat.UTC)}).to_record()
+    responses.add(responses.HEAD, episode.enclosure.href, headers={"Content-Length": "4", "ETag": '"abc"'})
+
+    enqueued = EnqueuedFeed(feed=None, tombstone=QueueCompletionType.COMPLETED)
+
+    jobs = proc._prepare_jobs([DownloadJob(republished, target=tmp_path_cd / "file.mp3")], enqueued)
+    enqueued.close()
+
+    assert jobs == []
+    assert list(enqueued) == [EpisodeResult(republished, DownloadResult.ALREADY_EXISTS, is_eager=True)]
+
+
+def test_results_in_completion_order(tmp_path_cd: Path, episode: Episode) -> None:
+    database = Database(":memory:", ignore_existing=False)
+    proc = FeedProcessor(Settings(), database=database)
+    enqueued = EnqueuedFeed(feed=None, tombstone=QueueCompletionType.COMPLETED)
+    job = DownloadJob(episode.to_record(), target=tmp_path_cd / "file.mp3")
+    slow: Future[EpisodeResult] = Future()
+    fast: Future[EpisodeResult] = Future()
+    proc._track_download(enqueued, "feed", job, slow)
+    proc._track_download(enqueued, "feed", job, fast)
+    enqueued.close()
+
+    fast.set_result(
+        EpisodeResult(episode.to_record(), DownloadResult.COMPLETED_SUCCESSFULLY, target=tmp_path_cd / "file.mp3")
+    )
+
+    assert database.exists(episode.to_record())
+    assert enqueued.results.get_nowait() is fast
+
+    slow.set_result(EpisodeResult(episode.to_record(), DownloadResult.FAILED))
+
+    assert list(enqueued) == [slow]
+
+
+def test_record_download_error(tmp_path_cd: Path, episode: Episode, caplog: pytest.LogCaptureFixture) -> None:
+    proc = FeedProcessor(Settings(), database=Database(":memory:", ignore_existing=False))
+    job = DownloadJob(episode.to_record(), target=tmp_path_cd / "file.mp3")
+    future: Future[EpisodeResult] = Future()
+    proc._track_download(EnqueuedFeed(feed=None, tombstone=QueueCompletionType.COMPLETED), "feed", job, future)
+
+    with patch.object(Database, "add", side_effect=OSError("disk full")):
+        future.set_result(EpisodeResult(episode.to_record(), DownloadResult.COMPLETED_SUCCESSFULLY))
+
+    assert "Failed to record download" in caplog.text
+    assert "disk full" in caplog.text
+
+
+def test_retry_failed_downloads(tmp_path_cd: Path, episode: Episode, responses: RequestsMock) -> None:
+    database = Database(":memory:", ignore_existing=False)
+    proc = FeedProcessor(Settings(), database=database)
+    enqueued = EnqueuedFeed(feed=None, tombstone=QueueCompletionType.COMPLETED)
+    future: Future[EpisodeResult] = Future()
+    proc._track_download(enqueued, "feed", DownloadJob(episode.to_record(), target=tmp_path_cd / "file.mp3"), future)
+    future.set_result(EpisodeResult(episode.to_record(), DownloadResult.FAILED))
+
+    (retry,) = database.iter_retries()
+    assert (retry.guid, retry.feed, retry.attempts, retry.is_due) == (episode.guid, "feed", 1, False)
+    assert not proc.enqueue_retries()
+    assert proc.retrying == {episode.guid}
+    assert proc._enqueue_episode(episode, FeedInfo(title="feed"), dry_run=False) == EpisodeResult(
+        episode.to_record(), DownloadResult.MISSING, is_eager=True
+    )
+
+    responses.add(responses.GET, episode.enclosure.href, body=b"BLOB")
+    with patch.object(RetryInDb, "is_due", True):
+        retries = proc.enqueue_retries()
+        assert retries
+
+    assert proc.complete(retries) == ProcessingResult(
+        feed=None, tombstone=QueueCompletionType.COMPLETED, success=1, failures=0
+    )
+    assert database.exists(episode.to_record())
+    assert list(database.iter_retries()) == []
+
+
+def test_prefetch_window() -> None:
+    proc = FeedProcessor()
+    urls = ["https://example.com/feed.xml", "https://broken.url.invalid"]
+
+    with patch.object(parser_pool, "processes", 0):
+        assert list(proc._prefetch(urls)) == [None, None]
+
+    with patch.object(parser_pool, "processes", 1), patch.object(FeedProcessor, "_prefetch_feed") as prefetch_feed:
+        futures = list(proc._prefetch(urls * 2))
+        for future in futures:
+            assert future
+            future.result()
+
+        assert [call.args[0] for call in prefetch_feed.call_args_list] == urls * 2
+        assert proc.load_feed(urls[0], prefetched=futures[0]) is prefetch_feed.return_value
+
+
+@pytest.mark.parametrize("write_info_json", [False, True])
+def test_enqueue_episode_record(tmp_path_cd: Path, episode: Episode, write_info_json: bool) -> None:
+    proc = FeedProcessor(Settings(write_info_json=write_info_json))
+
+    job = proc._enqueue_episode(episode, FeedInfo(title="feed"), dry_run=False)
+
+    assert isinstance(job, DownloadJob)
+    assert job.episode.guid == episode.guid
+    assert (job.episode.full is episode) == write_info_json
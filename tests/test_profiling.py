@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pstats
+import threading
+from typing import TYPE_CHECKING
+
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.profiling import ProfiledThreadPoolExecutor, RunProfiler
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def busy_worker() -> int:
+    return sum(range(1000))
+
+
+def worker_calls(stats: pstats.Stats) -> int:
+    entries = stats.stats.items()  # type: ignore[attr-defined]
+    return sum(calls for (_, _, name), (_, calls, *_) in entries if name == "busy_worker")
+
+
+def test_profile_worker_threads(tmp_path: Path) -> None:
+    profiler = RunProfiler(tmp_path / "run.prof")
+    # Worker threads are started before and outlive the profiled runs
+    with ProfiledThreadPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(lambda _: busy_worker(), range(2))) == [499500] * 2
+
+        for _ in range(2):
+            with profiler.profile():
+                assert list(executor.map(lambda _: busy_worker(), range(4))) == [499500] * 4
+            assert worker_calls(pstats.Stats(str(tmp_path / "run.prof"))) == 4
+
+        assert list(executor.map(lambda _: busy_worker(), range(2))) == [499500] * 2
+
+    # Thread profilers are disabled once the run completes
+    assert worker_calls(profiler.stats()) == 4
+    assert threading.getprofile() is None
+
+
+def test_run_profile(
+    tmp_path_cd: Path,
+    feed_lautsprecher: str,
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    settings = Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher])
+    PodcastArchiver(settings, profile=tmp_path_cd / "run.prof").run()
+
+    functions = {name for _, _, name in pstats.Stats(str(tmp_path_cd / "run.prof")).stats}  # type: ignore[attr-defined]
+    assert {"process_many", "receive_data"} <= functions
+    # Printed or logged, depending on whether the output is interactive
+    assert "Top 20 functions by own time" in capsys.readouterr().out + caplog.text
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from podcast_archiver.config import Settings
+from podcast_archiver.enums import ProgressDisplay
+from podcast_archiver.utils.progress import ProgressManager
+
+if TYPE_CHECKING:
+    from podcast_archiver.models.episode import Episode
+
+
+def test_track_episodes(episode: Episode) -> None:
+    manager = ProgressManager()
+    tracked = iter(manager.track([b"12", b"345", b"6"], total=6, episode=episode.to_record()))
+
+    assert next(tracked) == b"12"
+    assert next(tracked) == b"345"
+    (counter,) = manager._counters
+    assert counter.completed == 2
+    assert counter.task_id is not None
+    assert manager._progress.tasks[0].completed == 0
+
+    manager.sample()
+    assert manager._progress.tasks[0].completed == 2
+
+    assert list(tracked) == [b"6"]
+    assert not manager._counters
+    assert not manager._progress.tasks
+
+
+def test_track_aggregate(episode: Episode) -> None:
+    manager = ProgressManager()
+    manager.configure(aggregate=True)
+    with manager:
+        first = iter(manager.track([b"12", b"34"], total=4, episode=episode.to_record()))
+        second = iter(manager.track([b"567"], total=0, episode=episode.to_record()))
+        next(first)
+        next(first)
+        next(second)
+        manager.sample()
+
+        (task,) = manager._progress.tasks
+        assert (task.completed, task.total, task.fields["episode"]) == (2, 4, "2 active downloads")
+
+        list(first)
+        list(second)
+        manager.sample()
+        assert (task.completed, task.total, task.fields["episode"]) == (7, 7, "0 active downloads")
+
+    assert not manager._progress.tasks
+
+
+@pytest.mark.parametrize(
+    "display, concurrency, expected",
+    [
+        (ProgressDisplay.AUTO, 4, False),
+        (ProgressDisplay.AUTO, 32, True),
+        (ProgressDisplay.EPISODES, 32, False),
+        (ProgressDisplay.AGGREGATE, 4, True),
+    ],
+)
+def test_aggregate_progress_setting(display: ProgressDisplay, concurrency: int, expected: bool) -> None:
+    assert Settings(progress_display=display, concurrency=concurrency).aggregate_progress is expected
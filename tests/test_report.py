@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.console import console
+from podcast_archiver.enums import ReportEvent
+from podcast_archiver.report import RunReport, run_report
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def read_events(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_report_disabled() -> None:
+    report = RunReport()
+    report.emit(ReportEvent.RUN_STARTED)
+
+    assert not report.enabled
+
+
+def test_report_appends(tmp_path: Path) -> None:
+    report = RunReport()
+    report.open(str(tmp_path / "reports" / "report.jsonl"))
+    report.emit(ReportEvent.RUN_STARTED, feeds=1)
+    report.close()
+    report.open(str(tmp_path / "reports" / "report.jsonl"))
+    report.emit(ReportEvent.RUN_COMPLETED, failures=0)
+    report.close()
+
+    events = read_events(tmp_path / "reports" / "report.jsonl")
+    assert [(event["event"], event.get("feeds"), event.get("failures")) for event in events] == [
+        ("run_started", 1, None),
+        ("run_completed", None, 0),
+    ]
+    assert all(event["time"] for event in events)
+
+
+def test_report_stdout(capsys: pytest.CaptureFixture[str]) -> None:
+    report = RunReport()
+    report.open("-")
+    try:
+        report.emit(ReportEvent.FEED_FAILED, feed="https://example.com/feed.xml")
+        console.print("Not part of the report")
+    finally:
+        report.close()
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["event"] == "feed_failed"
+    assert "Not part of the report" in captured.err
+
+
+def test_run_report(tmp_path_cd: Path, feed_lautsprecher: str) -> None:
+    report = tmp_path_cd / "report.jsonl"
+    settings = Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher], quiet=True, report=str(report))
+    try:
+        PodcastArchiver(settings).run()
+    finally:
+        run_report.close()
+
+    events = read_events(report)
+    kinds = [event["event"] for event in events]
+    assert kinds[:2] == ["run_started", "feed_loaded"]
+    assert kinds[-2:] == ["feed_completed", "run_completed"]
+    assert kinds.count("episode_queued") == kinds.count("download_started") == kinds.count("download_completed") == 5
+
+    completed = next(event for event in events if event["event"] == "download_completed")
+    assert completed["feed"] == feed_lautsprecher
+    assert completed["result"] == "completed_successfully"
+    assert completed["bytes"] == len(b"BLOB")
+    assert completed["duration"] >= 0
+    assert completed["target"].endswith(".m4a")
+    assert events[-2]["success"] == 5
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Iterator
+from unittest import mock
+
+import pytest
+
+from podcast_archiver.concurrency import ConcurrencyController
+from podcast_archiver.download import DownloadJob
+from podcast_archiver.enums import DownloadOrder, DownloadResult
+from podcast_archiver.models.misc import Link
+from podcast_archiver.scheduler import DownloadScheduler
+from podcast_archiver.types import EpisodeResult
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from podcast_archiver.models.episode import Episode
+
+
+def make_job(episode: Episode, tmp_path: Path, name: str, length: int = 1, age: int = 0) -> DownloadJob:
+    job_episode = episode.model_copy(
+        update={"guid": name, "published_time": episode.published_time - timedelta(days=age)}
+    )
+    job_episode.enclosure = Link(rel="enclosure", href=f"http://nowhere.invalid/{name}.mp3", length=length)
+    return DownloadJob(job_episode.to_record(), target=tmp_path / f"{name}.mp3")
+
+
+def run_scheduler(scheduler: DownloadScheduler, executor: mock.Mock) -> list[str]:
+    downloaded: list[str] = []
+
+    def _download(job: DownloadJob) -> EpisodeResult:
+        downloaded.append(job.episode.guid)
+        return EpisodeResult(job.episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+
+    with mock.patch.object(DownloadJob, "__call__", autospec=True, side_effect=_download):
+        for call in executor.submit.call_args_list:
+            call.args[0]()
+    return downloaded
+
+
+@pytest.mark.parametrize(
+    "download_order,expected",
+    [
+        (DownloadOrder.FEED, ["a1", "a2", "a3", "b1"]),
+        (DownloadOrder.ROUND_ROBIN, ["a1", "b1", "a2", "a3"]),
+        (DownloadOrder.NEWEST, ["b1", "a3", "a2", "a1"]),
+        (DownloadOrder.SHORTEST, ["a3", "b1", "a1", "a2"]),
+        (DownloadOrder.LARGEST, ["a2", "a1", "b1", "a3"]),
+    ],
+)
+def test_scheduler_order(tmp_path: Path, episode: Episode, download_order: DownloadOrder, expected: list[str]) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=1, order=download_order)
+    futures = [
+        scheduler.submit(make_job(episode, tmp_path, "a1", length=3, age=3), feed="a"),
+        scheduler.submit(make_job(episode, tmp_path, "a2", length=4, age=2), feed="a"),
+        scheduler.submit(make_job(episode, tmp_path, "a3", length=1, age=1), feed="a"),
+        scheduler.submit(make_job(episode, tmp_path, "b1", length=2, age=0), feed="b"),
+    ]
+
+    assert len(scheduler) == 4
+    assert executor.submit.call_count == 1
+    assert run_scheduler(scheduler, executor) == expected
+    assert all(future.result().result == DownloadResult.COMPLETED_SUCCESSFULLY for future in futures)
+    assert len(scheduler) == 0
+
+
+def test_scheduler_weights(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=1, weights={"a": 2})
+    for name in ("a1", "a2", "a3", "a4"):
+        scheduler.submit(make_job(episode, tmp_path, name), feed="a")
+    for name in ("b1", "b2"):
+        scheduler.submit(make_job(episode, tmp_path, name), feed="b")
+
+    assert run_scheduler(scheduler, executor) == ["a1", "a2", "b1", "a3", "a4", "b2"]
+
+
+def test_scheduler_cancel(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=2)
+    futures = [scheduler.submit(make_job(episode, tmp_path, name), feed="a") for name in ("a1", "a2", "a3")]
+
+    scheduler.cancel()
+
+    assert executor.submit.call_count == 2
+    assert run_scheduler(scheduler, executor) == []
+    assert all(future.cancelled() for future in futures)
+
+
+def test_scheduler_source_lookahead(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=1, lookahead=2)
+    pulled: list[str] = []
+    submitted: list[Future[EpisodeResult]] = []
+
+    def _source() -> Iterator[DownloadJob]:
+        for name in ("a1", "a2", "a3", "a4", "a5"):
+            pulled.append(name)
+            yield make_job(episode, tmp_path, name)
+
+    scheduler.add_source(_source(), feed="a", on_submit=lambda job, future: submitted.append(future))
+
+    assert pulled == ["a1", "a2"]
+    assert len(scheduler) == 2
+    assert run_scheduler(scheduler, executor) == ["a1", "a2", "a3", "a4", "a5"]
+    assert len(submitted) == 5
+    assert all(future.done() for future in submitted)
+    assert len(scheduler) == 0
+
+
+def test_scheduler_worker_limit(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    controller = ConcurrencyController(4, initial=1)
+    scheduler = DownloadScheduler(executor, max_workers=4, controller=controller)
+    for name in ("a1", "a2", "a3"):
+        scheduler.submit(make_job(episode, tmp_path, name), feed="a")
+
+    assert scheduler.worker_limit == 1
+    assert executor.submit.call_count == 1
+
+    # Two rounds of completed downloads without signs of congestion raise the limit by one each
+    for _ in range(3):
+        controller.record("nowhere.invalid", latency=0.1, failed=False, throttled=False)
+    scheduler.submit(make_job(episode, tmp_path, "a4"), feed="a")
+
+    assert scheduler.worker_limit == 3
+
+    assert executor.submit.call_count == 3
+
+
+def test_scheduler_refill_while_draining(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=1, lookahead=1)
+    names = ["a1", "a2", "a3"]
+    downloaded: list[str] = []
+    pull = DownloadScheduler._pull
+
+    def _download(job: DownloadJob) -> EpisodeResult:
+        downloaded.append(job.episode.guid)
+        return EpisodeResult(job.episode, DownloadResult.COMPLETED_SUCCESSFULLY)
+
+    def _pull_and_drain(self: DownloadScheduler, queue: Any, source: Iterator[DownloadJob]) -> bool:
+        exhausted = pull(self, queue, source)
+        # Workers empty the window before the running refill has finished, so their own refills are skipped.
+        while len(downloaded) < executor.submit.call_count:
+            executor.submit.call_args_list[len(downloaded)].args[0]()
+        return exhausted
+
+    with (
+        mock.patch.object(DownloadJob, "__call__", autospec=True, side_effect=_download),
+        mock.patch.object(DownloadScheduler, "_pull", autospec=True, side_effect=_pull_and_drain),
+    ):
+        scheduler.add_source(
+            (make_job(episode, tmp_path, name) for name in names), feed="a", on_submit=lambda job, future: None
+        )
+
+    assert downloaded == names
+    assert len(scheduler) == 0
+
+
+def test_scheduler_feed_order_sources(tmp_path: Path, episode: Episode) -> None:
+    executor = mock.Mock()
+    scheduler = DownloadScheduler(executor, max_workers=1, order=DownloadOrder.FEED, lookahead=2)
+    for feed in ("a", "b"):
+        jobs = [make_job(episode, tmp_path, f"{feed}{idx}") for idx in range(4)]
+        scheduler.add_source(jobs, feed=feed, on_submit=lambda job, future: None)
+
+    assert run_scheduler(scheduler, executor) == ["a0", "a1", "a2", "a3", "b0", "b1", "b2", "b3"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import mock
+
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.enums import Stage
+from podcast_archiver.timing import StageTimer, stage_timer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_aggregate_by_stage_and_feed() -> None:
+    timer = StageTimer()
+    with timer.feed("https://example.com/slow.xml"):
+        timer.add(Stage.FETCH, 2.0)
+        timer.add(Stage.FETCH, 4.0)
+        with timer.feed("https://example.com/fast.xml"):
+            timer.add(Stage.FETCH, 1.0)
+        timer.add(Stage.PARSE, 0.5)
+    timer.add(Stage.DATABASE, 0.25)
+
+    stages = timer.by_stage()
+    assert list(stages) == [Stage.FETCH, Stage.PARSE, Stage.DATABASE]
+    assert (stages[Stage.FETCH].count, stages[Stage.FETCH].total, stages[Stage.FETCH].longest) == (3, 7.0, 4.0)
+
+    feeds = timer.by_feed()
+    assert list(feeds) == ["https://example.com/slow.xml", "https://example.com/fast.xml"]
+    assert feeds["https://example.com/slow.xml"][Stage.FETCH].mean == 3.0
+    assert timer.current_feed is None
+
+    timer.reset()
+    assert not timer.by_stage()
+
+
+def test_labels() -> None:
+    timer = StageTimer()
+    feeds = [
+        "https://example.com/feed.xml?token=a",
+        "https://example.com/feed.xml?token=b",
+        "https://example.com/other.xml?token=c",
+        "https://example.com/untitled.xml?token=d",
+    ]
+    timer.set_title(feeds[0], "First")
+    timer.set_title(feeds[1], "Second")
+    timer.set_title(feeds[2], "First")
+
+    assert timer.labels(feeds) == {
+        feeds[0]: "First (https://example.com/feed.xml)",
+        feeds[1]: "Second",
+        feeds[2]: "First (https://example.com/other.xml)",
+        feeds[3]: "https://example.com/untitled.xml",
+    }
+
+
+def test_measure() -> None:
+    timer = StageTimer()
+    with (
+        mock.patch("podcast_archiver.timing.perf_counter", side_effect=[1.0, 1.5]),
+        timer.feed("feed"),
+        timer.measure(Stage.DOWNLOAD),
+    ):
+        pass
+
+    assert timer.by_feed()["feed"][Stage.DOWNLOAD].total == 0.5
+
+
+def test_run_summary(
+    tmp_path_cd: Path,
+    feed_lautsprecher: str,
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    settings = Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher], timings=True)
+    PodcastArchiver(settings).run()
+
+    stages = stage_timer.by_stage()
+    assert {Stage.RESOLVE, Stage.FETCH, Stage.PARSE, Stage.DATABASE, Stage.DOWNLOAD, Stage.FINALIZE} <= set(stages)
+    assert stages[Stage.DOWNLOAD].count == 5
+    assert set(stage_timer.by_feed()[feed_lautsprecher]) >= {Stage.FETCH, Stage.DOWNLOAD, Stage.FINALIZE}
+
+    # Printed or logged, depending on whether the output is interactive
+    out = capsys.readouterr().out + caplog.text
+    assert "Time spent per stage" in out
+    assert "Der Lautsprecher" in out
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import shutil
+import socket
+import ssl
+import subprocess
+from threading import Thread
+from typing import TYPE_CHECKING, Iterable
+from unittest import mock
+
+import pytest
+from requests import ConnectionError, HTTPError
+from requests.adapters import HTTPAdapter
+
+from podcast_archiver import transport
+from podcast_archiver.exceptions import InvalidSettings
+from podcast_archiver.session import ArchiverSession
+from podcast_archiver.transport import HTTP2Adapter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_http2_requires_httpx() -> None:
+    with mock.patch.object(transport, "httpx", None), pytest.raises(InvalidSettings, match="http2"):
+        HTTP2Adapter()
+
+
+def test_session_configure_default() -> None:
+    session = ArchiverSession()
+    session.configure(http2=False)
+
+    assert isinstance(session.get_adapter("https://example.com"), HTTPAdapter)
+
+
+def test_http2_adapter_clients() -> None:
+    adapter = HTTP2Adapter(max_connections=2)
+
+    client = adapter.get_client(True, None, None)
+    assert adapter.get_client(True, None, None) is client
+    assert adapter.get_client(True, None, "http://proxy.invalid:3128") is not client
+    assert client._transport._pool._max_connections == 2  # type: ignore[attr-defined]
+    adapter.close()
+    assert not adapter.clients
+
+
+@pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+def test_http2_adapter_http1_fallback(local_server: str) -> None:
+    pytest.importorskip("h2")
+    session = ArchiverSession()
+    session.mount("http://", HTTP2Adapter(max_connections=2))
+
+    response = session.get_and_raise(f"{local_server}/redirect", stream=True)
+
+    assert response.url == f"{local_server}/file.mp3"
+    assert response.raw.http_version != "HTTP/2"  # type: ignore[union-attr]
+    assert response.headers["etag"] == '"blob"'
+    assert response.elapsed.total_seconds() > 0
+    assert b"".join(response.iter_content(chunk_size=3)) == b"BLOB"
+    with pytest.raises(HTTPError):
+        session.get_and_raise(f"{local_server}/missing")
+
+
+def _serve_h2(context: ssl.SSLContext, sock: socket.socket) -> None:
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    try:
+        conn = context.wrap_socket(sock, server_side=True)
+    except ssl.SSLError:
+        return
+    h2_conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+    h2_conn.initiate_connection()
+    conn.sendall(h2_conn.data_to_send())
+    with conn:
+        while data := conn.recv(65535):
+            for event in h2_conn.receive_data(data):
+                if not isinstance(event, h2.events.RequestReceived):
+                    continue
+                found = dict(event.headers)[b":path"] == b"/file.mp3"
+                h2_conn.send_headers(
+                    event.stream_id,
+                    [(":status", "200" if found else "404"), ("content-length", "4"), ("etag", '"blob"')],
+                )
+                h2_conn.send_data(event.stream_id, b"BLOB" if found else b"GONE", end_stream=True)
+            conn.sendall(h2_conn.data_to_send())
+
+
+@pytest.fixture
+def h2_server(tmp_path: Path) -> Iterable[tuple[str, Path]]:
+    pytest.importorskip("h2")
+    if not (openssl := shutil.which("openssl")):
+        pytest.skip("openssl is required to create a certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        [
+            *(openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1"),
+            *("-addext", "subjectAltName=IP:127.0.0.1", "-keyout", str(key), "-out", str(cert)),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(["h2"])
+
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def accept() -> None:
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            Thread(target=_serve_h2, args=(context, sock), daemon=True).start()
+
+    Thread(target=accept, daemon=True).start()
+    yield f"https://127.0.0.1:{listener.getsockname()[1]}", cert
+    listener.close()
+
+
+@pytest.mark.block_network(allowed_hosts=["127.0.0.1"])
+def test_http2_adapter_negotiates_http2(h2_server: tuple[str, Path]) -> None:
+    url, cert = h2_server
+    session = ArchiverSession()
+    session.mount("https://", HTTP2Adapter(max_connections=2))
+
+    # The self-signed certificate is only trusted when `verify` is passed on to httpx.
+    response = session.get_and_raise(f"{url}/file.mp3", stream=True, verify=str(cert))
+
+    assert response.raw.http_version == "HTTP/2"  # type: ignore[union-attr]
+    assert response.headers["etag"] == '"blob"'
+    assert b"".join(response.iter_content(chunk_size=3)) == b"BLOB"
+    with pytest.raises(HTTPError):
+        session.get_and_raise(f"{url}/missing", verify=str(cert))
+    with pytest.raises(ConnectionError):
+        session.get_and_raise(f"{url}/file.mp3")
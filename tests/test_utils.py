@@ -1,6 +1,11 @@
+import os
+from pathlib import Path
+from unittest import mock
+
 import pytest
 
 from podcast_archiver.utils import sanitize_url, truncate
+from podcast_archiver.utils.listing import DirectoryListing
 
 
 @pytest.mark.parametrize(
@@ -25,3 +30,35 @@ def test_truncate(input_str: str, expected_output: str) -> None:
 )
 def test_sanitize_url(url: str, expected_sanitized: str) -> None:
     assert sanitize_url(url) == expected_sanitized
+
+
+def test_directory_listing(tmp_path: Path) -> None:
+    (tmp_path / "show").mkdir()
+    (tmp_path / "show" / "existing.mp3").touch()
+    (tmp_path / "show" / "dangling.mp3").symlink_to(tmp_path / "nowhere.mp3")
+    listing = DirectoryListing()
+
+    with mock.patch("podcast_archiver.utils.listing.os.scandir", wraps=os.scandir) as scandir:
+        assert listing.exists(tmp_path / "show" / "existing.mp3")
+        assert not listing.exists(tmp_path / "show" / "missing.mp3")
+        assert not listing.exists(tmp_path / "show" / "dangling.mp3")
+        assert not listing.exists(tmp_path / "other" / "missing.mp3")
+        assert scandir.call_count == 2
+
+    (tmp_path / "show" / "new.mp3").touch()
+    assert not listing.exists(tmp_path / "show" / "new.mp3")
+    listing.add(tmp_path / "show" / "new.mp3")
+    assert listing.exists(tmp_path / "show" / "new.mp3")
+
+    listing.clear()
+    (tmp_path / "show" / "existing.mp3").unlink()
+    assert not listing.exists(tmp_path / "show" / "existing.mp3")
+
+
+def test_directory_listing_case_insensitive(tmp_path: Path) -> None:
+    (tmp_path / "Existing.mp3").touch()
+    listing = DirectoryListing()
+
+    with mock.patch.object(Path, "exists", return_value=True) as exists:
+        assert listing.exists(tmp_path / "existing.mp3")
+    exists.assert_called_once_with()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from podcast_archiver.base import PodcastArchiver
+from podcast_archiver.config import Settings
+from podcast_archiver.database import Database
+from podcast_archiver.enums import VerificationResult
+from podcast_archiver.verify import ArchiveVerifier
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def archived(tmp_path_cd: Path, feed_lautsprecher: str) -> tuple[Settings, Database]:
+    settings = Settings(archive_directory=tmp_path_cd, feeds=[feed_lautsprecher], database=tmp_path_cd / "db.db")
+    pa = PodcastArchiver(settings)
+    pa.run()
+    assert isinstance(pa.processor.database, Database)
+    return settings, pa.processor.database
+
+
+def test_verify_intact(archived: tuple[Settings, Database]) -> None:
+    settings, database = archived
+    verifier = ArchiveVerifier(settings, database=database, checksums=True)
+
+    assert verifier.verify() == []
+
+
+def test_verify_problems(archived: tuple[Settings, Database], tmp_path_cd: Path) -> None:
+    settings, database = archived
+    missing, truncated, altered, *_ = sorted(tmp_path_cd.glob("**/*.m4a"))
+    missing.unlink()
+    truncated.write_bytes(b"BL")
+    altered.write_bytes(b"BLUB")
+    orphaned = tmp_path_cd / "orphaned.mp3"
+    orphaned.touch()
+
+    results = {verification.path: verification.result for verification in ArchiveVerifier(settings, database).verify()}
+
+    assert results == {
+        missing: VerificationResult.MISSING,
+        truncated: VerificationResult.TRUNCATED,
+        orphaned: VerificationResult.ORPHANED,
+    }
+
+    results = {
+        verification.path: verification.result
+        for verification in ArchiveVerifier(settings, database, checksums=True).verify()
+    }
+    assert results[altered] == VerificationResult.CORRUPTED
+
+
+def test_verify_repair(archived: tuple[Settings, Database], tmp_path_cd: Path) -> None:
+    settings, database = archived
+    truncated, *_ = sorted(tmp_path_cd.glob("**/*.m4a"))
+    truncated.write_bytes(b"BL")
+    verifier = ArchiveVerifier(settings, database)
+
+    problems = verifier.verify()
+
+    assert verifier.repair(problems, feeds={"https://example.com/other.xml"}) == []
+    assert truncated.exists()
+
+    forgotten = verifier.repair(problems, feeds=set(settings.feeds))
+    assert [verification.path for verification in forgotten] == [truncated]
+    assert not truncated.exists()
+    assert len(list(database.iter_archived())) == 4
+    assert verifier.count_restored(forgotten) == 0
+
+
+def test_verify_repair_unconfigured_feed(archived: tuple[Settings, Database], tmp_path_cd: Path) -> None:
+    settings, database = archived
+    truncated, *_ = sorted(tmp_path_cd.glob("**/*.m4a"))
+    truncated.write_bytes(b"BL")
+    pa = PodcastArchiver(settings.model_copy(update={"feeds": ["https://example.com/other.xml"]}), database=database)
+
+    with patch.object(PodcastArchiver, "run", return_value=0) as run:
+        assert pa.verify(repair=True) == 1
+
+    run.assert_not_called()
+    assert truncated.read_bytes() == b"BL"
+    assert len(list(database.iter_archived())) == 5